@@ -14,26 +14,51 @@ __version__ = "2.1.0"
 __author__ = "Jay"
 __description__ = "LLM-enhanced code lifecycle analysis and documentation generator"
 
-from .doc_generator import CodeWikiDocGenerator, run_doc_generation
-from .lifecycle_classifier import (
-    FileLifecycleRecommendation,
-    LifecycleClassifier,
-    LifecycleResult,
-    run_lifecycle_classification,
-)
-
-# Public API exports (use relative imports)
-from .repo_scanner import FileEntry, RepoIndex, repo_index_to_dict, scan_repository
+# Public API exports, imported lazily on first attribute access (PEP 562) so
+# that `import codewiki` (and the CLI's --help) doesn't pull in requests, LLM
+# clients and the rest of the pipeline up front
+_LAZY_EXPORTS = {
+    "CodeWikiDocGenerator": ".doc_generator",
+    "run_doc_generation": ".doc_generator",
+    "FileLifecycleRecommendation": ".lifecycle_classifier",
+    "LifecycleClassifier": ".lifecycle_classifier",
+    "LifecycleResult": ".lifecycle_classifier",
+    "run_lifecycle_classification": ".lifecycle_classifier",
+    "FileEntry": ".repo_scanner",
+    "RepoIndex": ".repo_scanner",
+    "repo_index_to_dict": ".repo_scanner",
+    "scan_repository": ".repo_scanner",
+}
 
 # LLM client is optional (requires requests library)
-try:
-    from .llm_client import LocalLLMClient, ProviderConfig
-
-    HAS_LLM = True
-except ImportError:
-    LocalLLMClient = None
-    ProviderConfig = None
-    HAS_LLM = False
+_LLM_EXPORTS = ("LocalLLMClient", "ProviderConfig")
+
+
+def __getattr__(name: str):
+    from importlib import import_module
+
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    elif name in _LLM_EXPORTS or name == "HAS_LLM":
+        try:
+            llm_client = import_module(".llm_client", __name__)
+            exports = {n: getattr(llm_client, n) for n in _LLM_EXPORTS}
+            exports["HAS_LLM"] = True
+        except ImportError:
+            exports = dict.fromkeys(_LLM_EXPORTS)
+            exports["HAS_LLM"] = False
+        globals().update(exports)
+        return exports[name]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | {"HAS_LLM"})
+
 
 __all__ = [
     "__version__",
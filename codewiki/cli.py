@@ -16,9 +16,6 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-# Import orchestrator functions
-from .orchestrator import main as orchestrator_main
-
 
 def main() -> int:
     """Main CLI entry point."""
@@ -95,6 +92,9 @@ def main() -> int:
             f"   Please modify config/code_wiki_config.yaml: llm_max_files: {args.limit}"
         )
 
+    # Imported here so --help and argument errors don't load the whole pipeline
+    from .orchestrator import main as orchestrator_main
+
     # Call orchestrator with mapped arguments
     sys.argv = ["codewiki"] + orch_args
     return orchestrator_main()
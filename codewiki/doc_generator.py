@@ -13,15 +13,185 @@ Future: Can integrate LLM via digital_me/core/llm/factory.py for enhanced analys
 
 from __future__ import annotations
 
+import io
 import json
+import os
+import re
 import textwrap
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .lifecycle_io import read_lifecycle_file
+
+# orjson is optional: SIMD-accelerated parsing for large index/lifecycle files
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+# ijson is optional: incremental parsing keeps repo_index.json off the heap
+try:
+    import ijson
+
+    HAS_IJSON = True
+except ImportError:
+    ijson = None
+    HAS_IJSON = False
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, preferring orjson when installed."""
+    if HAS_ORJSON:
+        return orjson.loads(path.read_bytes())
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_utf8(path: Path, content: str) -> None:
+    """Write content as UTF-8 with one encode and a raw fd write (no TextIOWrapper)."""
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            # os.write may write fewer bytes than requested
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+# Static document sections, dedented once at import
+_OVERVIEW_HEADER = textwrap.dedent(
+    """\
+    <!--
+    AUTO-GENERATED by Code Wiki System
+    Generated: {generated}
+    Source: {source}
+    Commit: {commit}
+    DO NOT EDIT MANUALLY
+    Regenerate using: make code-wiki-docgen
+    -->
+
+    # Code Wiki – Architecture Overview
+
+    This document is auto-generated by the Code Wiki system to provide an overview
+    of the current codebase structure and statistics.
+    """
+)
+
+_ARCHITECTURE_SECTION = textwrap.dedent(
+    """\
+    ## System Architecture
+
+    The Code Wiki system consists of three main phases:
+
+    ```mermaid
+    graph LR
+      A[Codebase] --> B[Repo Scanner]
+      B --> C[repo_index.json]
+      C --> D[Lifecycle Classifier]
+      D --> E[lifecycle_recommendations.json]
+      C --> F[Doc Generator]
+      E --> F
+      F --> G[*.generated.md]
+      F --> H[README.md blocks]
+    ```
+
+    ### Components
+
+    1. **Repo Scanner**: Traverses file system, classifies files, extracts metadata
+    2. **Lifecycle Classifier**: Analyzes file age and patterns, recommends actions
+    3. **Doc Generator**: Converts structured data to human-readable documentation
+    """
+)
+
+_CATALOG_HEADER = textwrap.dedent(
+    """\
+    <!--
+    AUTO-GENERATED by Code Wiki System
+    Generated: {generated}
+    Source: {source}
+    DO NOT EDIT MANUALLY
+    Regenerate using: make code-wiki-docgen
+    -->
+
+    # Code Wiki – Service & Script Catalog
+
+    This catalog lists all Python files and scripts discovered in the repository,
+    along with their lifecycle status and basic metadata.
+    """
+)
+
+_LIFECYCLE_LEGEND = textwrap.dedent(
+    """
+    ## Lifecycle Legend
+
+    - ✅ **keep**: Active file, in regular use
+    - ⚠️ **review**: Potentially deprecated, needs human review
+    - 📦 **archive**: Should be moved to archive directory
+    - 🗑️ **delete**: Backup/temporary file, safe to remove
+    """
+)
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with a Z suffix."""
+    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+
+# File kinds listed in the service catalog
+_SERVICE_KINDS = frozenset({"python", "script"})
+
 
+def _path_stem(path: str) -> str:
+    """Path(path).stem for index paths (POSIX-style), without building a Path."""
+    name = path.rpartition("/")[2]
+    dot = name.rfind(".")
+    # Same rules as PurePath.suffix: leading dot or trailing dot is not a suffix
+    if 0 < dot < len(name) - 1:
+        return name[:dot]
+    return name
 
-@dataclass
+
+# Emoji indicators for lifecycle
+_LIFECYCLE_EMOJI = {
+    "keep": "✅",
+    "archive": "📦",
+    "delete": "🗑️",
+    "review": "⚠️",
+}
+# Rendered "<emoji> <lifecycle>" cells, looked up per row instead of formatted
+_LIFECYCLE_DISPLAY = {k: f"{e} {k}" for k, e in _LIFECYCLE_EMOJI.items()}
+
+# <!-- CODE_WIKI_START:name --> ... <!-- CODE_WIKI_END:name --> controlled README blocks
+_README_BLOCK_RE = re.compile(
+    r"(<!-- CODE_WIKI_START:([\w.-]+) -->)(.*?)(<!-- CODE_WIKI_END:\2 -->)",
+    re.DOTALL,
+)
+_CATALOG_TABLE_HEADER = (
+    "| Name | Path | Kind | Lifecycle | Size |\n"
+    "|------|------|------|-----------|------|"
+)
+_CATALOG_ROW = "| `{}` | `{}` | {} | {} | {} |".format
+_SIZE_KB = "{:.1f} KB".format
+
+
+def _format_catalog_row(s: ServiceEntry) -> str:
+    """Render one service as a Markdown table row."""
+    size_kb = s.size_bytes / 1024
+    size_str = _SIZE_KB(size_kb) if size_kb >= 1 else f"{s.size_bytes} B"
+    lifecycle = _LIFECYCLE_DISPLAY.get(s.lifecycle) or f"❓ {s.lifecycle}"
+    return _CATALOG_ROW(s.name, s.path, s.kind, lifecycle, size_str)
+
+
+@dataclass(slots=True)
 class RepoStats:
     """Repository statistics extracted from scan metadata."""
 
@@ -31,7 +201,7 @@ class RepoStats:
     generated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceEntry:
     """Represents a service or script in the catalog."""
 
@@ -72,50 +242,156 @@ class CodeWikiDocGenerator:
         self.readme_path = readme_path
 
         self._index: Dict[str, Any] = {}
+        # Lifecycle header (scan_metadata/summary) and path -> non-"keep"
+        # recommendation, built while streaming the records
         self._lifecycle: Dict[str, Any] = {}
+        self._lifecycle_by_path: Dict[str, str] = {}
+        self._made_dirs: Set[Path] = set()
 
-    def load_inputs(self) -> None:
-        """Load repository index and lifecycle recommendations from JSON files."""
-        if not self.index_path.exists():
-            raise FileNotFoundError(f"Repository index not found: {self.index_path}")
-
-        with self.index_path.open("r", encoding="utf-8") as f:
-            self._index = json.load(f)
+    def load_inputs(self, stream_index: bool = False) -> None:
+        """
+        Load repository index and lifecycle recommendations from disk.
 
-        if self.lifecycle_path and self.lifecycle_path.exists():
-            with self.lifecycle_path.open("r", encoding="utf-8") as f:
-                self._lifecycle = json.load(f)
-        else:
-            self._lifecycle = {"recommendations": []}
+        Lifecycle recommendations may be JSON or NDJSON (see
+        lifecycle_io.read_lifecycle_file).
 
-    def build_repo_stats(self) -> RepoStats:
+        Args:
+            stream_index: If True, don't materialize repo_index.json; scan_index()
+                will read it incrementally instead.
         """
-        Extract repository statistics from loaded index.
+        # Open directly instead of exists() + open() (one stat per file)
+        try:
+            if stream_index:
+                self.index_path.stat()
+                self._index = {}
+            else:
+                self._index = _read_json(self.index_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Repository index not found: {self.index_path}"
+            ) from None
+
+        self._lifecycle = {}
+        self._lifecycle_by_path = {}
+        if self.lifecycle_path:
+            try:
+                header, recommendations = read_lifecycle_file(self.lifecycle_path)
+            except FileNotFoundError:
+                pass
+            else:
+                # NDJSON records are merged one at a time, never held as a list
+                self._lifecycle = header
+                self._lifecycle_by_path = self._non_keep_map(recommendations)
+
+    def scan_index(self) -> Tuple[RepoStats, List[ServiceEntry]]:
+        """
+        Build repository stats and service catalog in a single pass over files.
+
+        Uses the loaded index if present; otherwise streams repo_index.json
+        (via ijson when installed) so the file list is never held in memory.
 
         Returns:
-            RepoStats with file counts, classifications, and metadata
+            (RepoStats, services) equivalent to build_repo_stats() + build_services()
         """
-        files = self._index.get("files", [])
-        by_kind: Dict[str, int] = {}
+        if self._index:
+            scan_meta = self._index.get("scan_metadata", {})
+            files: Iterator[Dict[str, Any]] = iter(self._index.get("files", []))
+        else:
+            scan_meta, files = self._stream_index()
+
+        lifecycle_map = self._lifecycle_map()
+        by_kind: Counter[str] = Counter()
+        services: List[ServiceEntry] = []
+        total_files = 0
 
         for entry in files:
+            total_files += 1
             kind = entry.get("kind", "other")
-            by_kind[kind] = by_kind.get(kind, 0) + 1
+            by_kind[kind] += 1
 
-        scan_meta = self._index.get("scan_metadata", {})
+            if kind not in _SERVICE_KINDS:
+                continue
+
+            path = entry["path"]
+            services.append(
+                ServiceEntry(
+                    name=_path_stem(path),
+                    path=path,
+                    kind=kind,
+                    lifecycle=lifecycle_map.get(path, "keep"),
+                    size_bytes=entry.get("size_bytes", 0),
+                )
+            )
+
+        return self._make_repo_stats(scan_meta, total_files, by_kind), services
+
+    def _stream_index(self) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """(scan_metadata, file iterator), parsing the index only once without ijson."""
+        if HAS_IJSON:
+            return self._stream_scan_metadata(), self._stream_index_files()
+        index = _read_json(self.index_path)
+        return index.get("scan_metadata", {}), iter(index.get("files", []))
+
+    def _stream_scan_metadata(self) -> Dict[str, Any]:
+        """Read only scan_metadata from repo_index.json (requires ijson)."""
+        with self.index_path.open("rb") as f:
+            # Scanner writes scan_metadata first, so this stops early
+            return next(ijson.items(f, "scan_metadata"), {})
+
+    def _stream_index_files(self) -> Iterator[Dict[str, Any]]:
+        """Yield file entries from repo_index.json one at a time (requires ijson)."""
+        with self.index_path.open("rb") as f:
+            # use_float keeps numbers as int/float rather than Decimal
+            yield from ijson.items(f, "files.item", use_float=True)
+
+    def _lifecycle_map(self) -> Dict[str, str]:
+        """Map file path -> lifecycle recommendation, omitting "keep"."""
+        return self._lifecycle_by_path
+
+    @staticmethod
+    def _non_keep_map(recommendations: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Map path -> recommendation for the records that aren't "keep".
+
+        Callers look up with .get(path, "keep"), so keep entries (usually the
+        majority) don't need to be stored.
+        """
+        return {
+            rec["path"]: decision
+            for rec in recommendations
+            if (decision := rec["recommendation"]) != "keep"
+        }
 
+    @staticmethod
+    def _make_repo_stats(
+        scan_meta: Dict[str, Any], total_files: int, by_kind: Dict[str, int]
+    ) -> RepoStats:
+        """Assemble RepoStats from scan metadata and per-kind counts."""
         # Use actual scan timestamp from index, fallback to current time if not present
         scan_timestamp = scan_meta.get("timestamp")
         if not scan_timestamp:
-            scan_timestamp = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+            scan_timestamp = _utc_now_iso()
 
         return RepoStats(
-            total_files=len(files),
+            total_files=total_files,
             by_kind=by_kind,
             latest_commit=scan_meta.get("git_commit"),
             generated_at=scan_timestamp,
         )
 
+    def build_repo_stats(self) -> RepoStats:
+        """
+        Extract repository statistics from loaded index.
+
+        Returns:
+            RepoStats with file counts, classifications, and metadata
+        """
+        files = self._index.get("files", [])
+        by_kind = Counter(entry.get("kind", "other") for entry in files)
+
+        scan_meta = self._index.get("scan_metadata", {})
+        return self._make_repo_stats(scan_meta, len(files), by_kind)
+
     def build_services(self) -> List[ServiceEntry]:
         """
         Build service catalog from index and lifecycle data.
@@ -126,25 +402,22 @@ class CodeWikiDocGenerator:
         files = self._index.get("files", [])
 
         # Build lifecycle lookup map
-        lifecycle_map = {
-            rec["path"]: rec["recommendation"]
-            for rec in self._lifecycle.get("recommendations", [])
-        }
+        lifecycle_map = self._lifecycle_map()
 
         services: List[ServiceEntry] = []
 
         for entry in files:
-            path = entry["path"]
-            kind = entry.get("kind", "other")
+            kind = entry.get("kind")
 
             # V1: Only include Python files and scripts in service catalog
             # Future: Can expand to include APIs, agents, services based on annotations
-            if kind not in {"python", "script"}:
+            if kind not in _SERVICE_KINDS:
                 continue
 
+            path = entry["path"]
             services.append(
                 ServiceEntry(
-                    name=Path(path).stem,
+                    name=_path_stem(path),
                     path=path,
                     kind=kind,
                     lifecycle=lifecycle_map.get(path, "keep"),
@@ -170,150 +443,122 @@ class CodeWikiDocGenerator:
         Returns:
             Markdown document as string
         """
-        header = textwrap.dedent(
-            f"""\
-            <!--
-            AUTO-GENERATED by Code Wiki System
-            Generated: {stats.generated_at}
-            Source: {self.index_path}
-            Commit: {stats.latest_commit or 'unknown'}
-            DO NOT EDIT MANUALLY
-            Regenerate using: make code-wiki-docgen
-            -->
-
-            # Code Wiki – Architecture Overview
-
-            This document is auto-generated by the Code Wiki system to provide an overview
-            of the current codebase structure and statistics.
-            """
+        header = _OVERVIEW_HEADER.format(
+            generated=stats.generated_at,
+            source=self.index_path,
+            commit=stats.latest_commit or "unknown",
         )
 
+        buf = io.StringIO()
+        buf.write(header)
+        buf.write("\n")
+
         # Statistics section
-        stats_block = "## Repository Statistics\n\n"
-        stats_block += f"- **Total files**: {stats.total_files}\n"
-        stats_block += f"- **Last scan**: {stats.generated_at}\n"
-        stats_block += f"- **Git commit**: `{stats.latest_commit or 'unknown'}`\n\n"
-
-        stats_block += "### File Breakdown\n\n"
-        for kind in sorted(stats.by_kind.keys()):
-            count = stats.by_kind[kind]
-            percentage = (
-                (count / stats.total_files * 100) if stats.total_files > 0 else 0
-            )
-            stats_block += f"- **{kind}**: {count} files ({percentage:.1f}%)\n"
+        buf.write("## Repository Statistics\n\n")
+        buf.write(f"- **Total files**: {stats.total_files}\n")
+        buf.write(f"- **Last scan**: {stats.generated_at}\n")
+        buf.write(f"- **Git commit**: `{stats.latest_commit or 'unknown'}`\n\n")
+
+        buf.write("### File Breakdown\n\n")
+        # One division for the whole table instead of one per kind
+        scale = 100.0 / stats.total_files if stats.total_files > 0 else 0.0
+        for kind, count in sorted(stats.by_kind.items()):
+            buf.write(f"- **{kind}**: {count} files ({count * scale:.1f}%)\n")
 
         # High-level architecture diagram
-        mermaid_section = textwrap.dedent(
-            """\
-            ## System Architecture
-
-            The Code Wiki system consists of three main phases:
-
-            ```mermaid
-            graph LR
-              A[Codebase] --> B[Repo Scanner]
-              B --> C[repo_index.json]
-              C --> D[Lifecycle Classifier]
-              D --> E[lifecycle_recommendations.json]
-              C --> F[Doc Generator]
-              E --> F
-              F --> G[*.generated.md]
-              F --> H[README.md blocks]
-            ```
-
-            ### Components
-
-            1. **Repo Scanner**: Traverses file system, classifies files, extracts metadata
-            2. **Lifecycle Classifier**: Analyzes file age and patterns, recommends actions
-            3. **Doc Generator**: Converts structured data to human-readable documentation
-            """
-        )
+        buf.write("\n")
+        buf.write(_ARCHITECTURE_SECTION)
+        buf.write("\n")
 
         # Service summary
-        service_summary = f"\n## Service Catalog Summary\n\n"
-        service_summary += f"Total services/scripts indexed: **{len(services)}**\n\n"
+        buf.write("\n## Service Catalog Summary\n\n")
+        buf.write(f"Total services/scripts indexed: **{len(services)}**\n\n")
 
         if services:
-            by_lifecycle = {}
-            for s in services:
-                by_lifecycle[s.lifecycle] = by_lifecycle.get(s.lifecycle, 0) + 1
+            by_lifecycle = Counter(s.lifecycle for s in services)
 
-            service_summary += "Lifecycle distribution:\n"
+            buf.write("Lifecycle distribution:\n")
             for lifecycle in sorted(by_lifecycle.keys()):
                 count = by_lifecycle[lifecycle]
-                service_summary += f"- **{lifecycle}**: {count} files\n"
+                buf.write(f"- **{lifecycle}**: {count} files\n")
 
-            service_summary += f"\nFor detailed service catalog, see [SERVICE_CATALOG.generated.md](SERVICE_CATALOG.generated.md)\n"
+            buf.write(
+                "\nFor detailed service catalog, see "
+                "[SERVICE_CATALOG.generated.md](SERVICE_CATALOG.generated.md)\n"
+            )
 
-        return "\n".join([header, stats_block, mermaid_section, service_summary])
+        return buf.getvalue()
 
-    def generate_service_catalog_markdown(self, services: List[ServiceEntry]) -> str:
+    def generate_service_catalog_markdown(
+        self, services: List[ServiceEntry], generated_at: Optional[str] = None
+    ) -> str:
         """
         Generate service catalog document with table of all services.
 
         Args:
             services: List of services to include
+            generated_at: Timestamp for the header (defaults to now)
 
         Returns:
             Markdown document as string
         """
-        now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-
-        header = textwrap.dedent(
-            f"""\
-            <!--
-            AUTO-GENERATED by Code Wiki System
-            Generated: {now}
-            Source: {self.index_path}
-            DO NOT EDIT MANUALLY
-            Regenerate using: make code-wiki-docgen
-            -->
-
-            # Code Wiki – Service & Script Catalog
-
-            This catalog lists all Python files and scripts discovered in the repository,
-            along with their lifecycle status and basic metadata.
-            """
-        )
+        now = generated_at or _utc_now_iso()
+        header = _CATALOG_HEADER.format(generated=now, source=self.index_path)
 
         if not services:
             return header + "\n\n*No services or scripts found.*\n"
 
         # Build table
-        table_lines = [
-            "| Name | Path | Kind | Lifecycle | Size |",
-            "|------|------|------|-----------|------|",
-        ]
+        table_lines = [_CATALOG_TABLE_HEADER]
+        table_lines.extend(
+            map(_format_catalog_row, sorted(services, key=attrgetter("path")))
+        )
 
-        for s in sorted(services, key=lambda x: x.path):
-            size_kb = s.size_bytes / 1024
-            size_str = f"{size_kb:.1f} KB" if size_kb >= 1 else f"{s.size_bytes} B"
-
-            # Emoji indicators for lifecycle
-            lifecycle_emoji = {
-                "keep": "✅",
-                "archive": "📦",
-                "delete": "🗑️",
-                "review": "⚠️",
-            }
-            lifecycle_display = f"{lifecycle_emoji.get(s.lifecycle, '❓')} {s.lifecycle}"
-
-            table_lines.append(
-                f"| `{s.name}` | `{s.path}` | {s.kind} | {lifecycle_display} | {size_str} |"
-            )
+        return "\n\n".join([header, "\n".join(table_lines), _LIFECYCLE_LEGEND])
+
+    def estimate_service_catalog_size(
+        self, services: List[ServiceEntry]
+    ) -> Tuple[int, int]:
+        """
+        Estimate (lines, characters) of the service catalog without rendering it.
 
-        legend = textwrap.dedent(
-            """
-            ## Lifecycle Legend
+        Used by preview mode, where building the full table would be wasted
+        work. The line count is exact; characters are exact except for the size
+        column, which is approximated.
 
-            - ✅ **keep**: Active file, in regular use
-            - ⚠️ **review**: Potentially deprecated, needs human review
-            - 📦 **archive**: Should be moved to archive directory
-            - 🗑️ **delete**: Backup/temporary file, safe to remove
-            """
-        )
+        Args:
+            services: List of services the catalog would include
 
-        return "\n\n".join([header, "\n".join(table_lines), legend])
+        Returns:
+            (line_count, char_count)
+        """
+        header = _CATALOG_HEADER.format(
+            generated=_utc_now_iso(), source=self.index_path
+        )
+        if not services:
+            content = header + "\n\n*No services or scripts found.*\n"
+            return content.count("\n") + 1, len(content)
+
+        # Inline formatting overhead of one row, plus ~7 chars for "12.3 KB"
+        row_overhead = len(_CATALOG_ROW("", "", "", "", "")) + 7
+        rows_chars = sum(
+            len(s.name)
+            + len(s.path)
+            + len(s.kind)
+            + len(_LIFECYCLE_DISPLAY.get(s.lifecycle) or f"❓ {s.lifecycle}")
+            for s in services
+        ) + row_overhead * len(services)
+
+        table_head = len(_CATALOG_TABLE_HEADER)
+        newlines = (
+            header.count("\n") + 2 + len(services) + 1 + 2
+            + _LIFECYCLE_LEGEND.count("\n")
+        )
+        chars = (
+            len(header) + 2 + table_head + rows_chars + len(services) + 2
+            + len(_LIFECYCLE_LEGEND)
+        )
+        return newlines + 1, chars
 
     def update_readme_sections(self, stats: RepoStats, preview: bool = False) -> None:
         """
@@ -333,19 +578,17 @@ class CodeWikiDocGenerator:
 
         def replace_block(content: str, block_name: str, new_content: str) -> str:
             """Replace content between CODE_WIKI_START/END markers."""
-            start_marker = f"<!-- CODE_WIKI_START:{block_name} -->"
-            end_marker = f"<!-- CODE_WIKI_END:{block_name} -->"
+            replaced = False
 
-            if start_marker not in content or end_marker not in content:
-                # Block not found, skip
-                return content
+            def _sub(m: re.Match) -> str:
+                nonlocal replaced
+                if replaced or m[2] != block_name:
+                    return m[0]
+                replaced = True
+                return m[1] + "\n" + new_content + "\n" + m[4]
 
-            before, rest = content.split(start_marker, 1)
-            _, after = rest.split(end_marker, 1)
-
-            return (
-                before + start_marker + "\n" + new_content + "\n" + end_marker + after
-            )
+            # Block not found -> content returned unchanged
+            return _README_BLOCK_RE.sub(_sub, content)
 
         # Generate quick stats summary for README
         summary_lines = [
@@ -355,9 +598,7 @@ class CodeWikiDocGenerator:
         ]
 
         # Top 3 file types
-        sorted_kinds = sorted(stats.by_kind.items(), key=lambda x: x[1], reverse=True)[
-            :3
-        ]
+        sorted_kinds = Counter(stats.by_kind).most_common(3)
         if sorted_kinds:
             summary_lines.append(
                 "- Top file types: " + ", ".join(f"{k} ({c})" for k, c in sorted_kinds)
@@ -375,13 +616,17 @@ class CodeWikiDocGenerator:
             return
 
         if updated != raw:
-            self.readme_path.write_text(updated, encoding="utf-8")
+            _write_utf8(self.readme_path, updated)
             print(f"✅ Updated README.md controlled section: quick_stats")
         else:
             print(f"ℹ️  README.md block 'quick_stats' not found (markers not present)")
 
     def write_file(
-        self, relative_path: str, content: str, preview: bool = False
+        self,
+        relative_path: str,
+        content: str,
+        preview: bool = False,
+        estimated_size: Optional[Tuple[int, int]] = None,
     ) -> None:
         """
         Write generated documentation to file.
@@ -390,23 +635,38 @@ class CodeWikiDocGenerator:
             relative_path: Path relative to output_dir
             content: Markdown content to write
             preview: If True, only print summary (no writes)
+            estimated_size: (lines, chars) to report in preview instead of
+                measuring content (for documents that weren't rendered)
         """
         target = self.output_dir / relative_path
 
         if preview:
-            line_count = len(content.split("\n"))
-            char_count = len(content)
+            if estimated_size is not None:
+                line_count, char_count = estimated_size
+                approx = "~"
+            else:
+                line_count = content.count("\n") + 1
+                char_count = len(content)
+                approx = ""
             print(
                 f"\n[Preview] Would write to {target}:\n"
-                f"  - Lines: {line_count}\n"
-                f"  - Characters: {char_count}\n"
+                f"  - Lines: {approx}{line_count}\n"
+                f"  - Characters: {approx}{char_count}\n"
             )
             return
 
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(content, encoding="utf-8")
+        self._write_output(relative_path, content)
         print(f"✅ Generated: {target}")
 
+    def _write_output(self, relative_path: str, content: str) -> Path:
+        """Write content under output_dir without reporting; returns the target."""
+        target = self.output_dir / relative_path
+        if target.parent not in self._made_dirs:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(target.parent)
+        _write_utf8(target, content)
+        return target
+
 
 def run_doc_generation(
     index_path: Path,
@@ -434,20 +694,41 @@ def run_doc_generation(
         readme_path=readme_path,
     )
 
-    # Load input data
-    generator.load_inputs()
+    # Load lifecycle data; the index is streamed by scan_index()
+    generator.load_inputs(stream_index=True)
 
-    # Build data structures
-    stats = generator.build_repo_stats()
-    services = generator.build_services()
+    # Build data structures in one pass over the index
+    stats, services = generator.scan_index()
 
     # Generate documentation
     overview = generator.generate_overview_markdown(stats, services)
-    catalog = generator.generate_service_catalog_markdown(services)
 
-    # Write output files
-    generator.write_file("CODE_WIKI_OVERVIEW.generated.md", overview, preview=preview)
-    generator.write_file("SERVICE_CATALOG.generated.md", catalog, preview=preview)
+    if preview:
+        # Dry run: skip rendering the N-row catalog, only report its size
+        generator.write_file("CODE_WIKI_OVERVIEW.generated.md", overview, preview=True)
+        generator.write_file(
+            "SERVICE_CATALOG.generated.md",
+            "",
+            preview=True,
+            estimated_size=generator.estimate_service_catalog_size(services),
+        )
+    else:
+        catalog = generator.generate_service_catalog_markdown(
+            services, generated_at=_utc_now_iso()
+        )
+        outputs = [
+            ("CODE_WIKI_OVERVIEW.generated.md", overview),
+            ("SERVICE_CATALOG.generated.md", catalog),
+        ]
+        # Independent files: overlap their write latency. Workers only write;
+        # results are reported here, in outputs order, once all have finished
+        with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+            futures = [
+                pool.submit(generator._write_output, relative_path, content)
+                for relative_path, content in outputs
+            ]
+        for future in futures:
+            print(f"✅ Generated: {future.result()}")  # re-raises write errors
 
     # Update README if enabled
     if readme_path:
@@ -16,43 +16,72 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+try:
+    from .lifecycle_io import read_lifecycle_file
+except ImportError:  # run as a script: python3 codewiki/inspect_lifecycle_result.py
+    from lifecycle_io import read_lifecycle_file
+
+_DECISIONS = ("keep", "review", "archive", "delete")
+
+# Recommendation summary rows, formatted in one call per run
+_SUMMARY_TMPL = "\n".join(f"   {d:8s}: {{{d}:3d}}" for d in _DECISIONS)
+_SUMMARY_PCT_TMPL = "\n".join(
+    f"   {d:8s}: {{{d}:3d}} ({{{d}_pct:5.1f}}%)" for d in _DECISIONS
+)
 
 
 def load_results(path: Path) -> Dict[str, Any]:
-    """Load lifecycle recommendations JSON."""
+    """
+    Load lifecycle recommendations (JSON or NDJSON).
+
+    For NDJSON results, "recommendations" is a lazy iterator so that
+    print_metrics can stream large files in a single pass; records are only
+    parsed there, so main() also handles decode errors raised while printing.
+    """
     if not path.exists():
         print(f"❌ Results file not found: {path}", file=sys.stderr)
         print("   Run 'make code-wiki-lifecycle' first.", file=sys.stderr)
         sys.exit(1)
 
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as e:
-        print(f"❌ Invalid JSON in {path}: {e}", file=sys.stderr)
-        sys.exit(1)
+        header, recommendations = read_lifecycle_file(path)
+        return {**header, "recommendations": recommendations}
+    except json.JSONDecodeError as e:  # orjson's decode error subclasses it
+        _exit_invalid_json(path, e)
+
+
+def _exit_invalid_json(path: Path, error: json.JSONDecodeError) -> None:
+    """Report an unparseable results file and exit with status 1."""
+    print(f"❌ Invalid JSON in {path}: {error}", file=sys.stderr)
+    sys.exit(1)
 
 
 def print_metrics(data: Dict[str, Any], verbose: bool = False) -> None:
     """Print key metrics from lifecycle results."""
+    # Collect lines and write once at the end instead of one print() per line
+    lines: List[str] = []
+    out = lines.append
+
     meta = data.get("scan_metadata", {})
     summary = data.get("summary", {})
 
-    print("=" * 70)
-    print("CODE WIKI LIFECYCLE CLASSIFICATION - RESULTS")
-    print("=" * 70)
-    print()
+    out("=" * 70)
+    out("CODE WIKI LIFECYCLE CLASSIFICATION - RESULTS")
+    out("=" * 70)
+    out("")
 
     # Classification method
     method = meta.get("classification_method", "unknown")
-    print(f"📋 Classification Method: {method}")
+    out(f"📋 Classification Method: {method}")
 
     if method == "llm-enhanced":
-        print(f"   LLM Mode: {meta.get('llm_mode', 'N/A')}")
-        print(
+        out(f"   LLM Mode: {meta.get('llm_mode', 'N/A')}")
+        out(
             f"   LLM Calls: {meta.get('llm_calls', 0)} / {meta.get('llm_max_files', 'unlimited')} max"
         )
-        print()
+        out("")
 
         # LLM Parse Stats
         parse = meta.get("llm_parse", {})
@@ -62,11 +91,11 @@ def print_metrics(data: Dict[str, Any], verbose: bool = False) -> None:
             failed = parse.get("parse_failed", 0)
             if attempts > 0:
                 rate = success / attempts
-                print(f"🔍 LLM Parse Statistics:")
-                print(f"   Attempts: {attempts}")
-                print(f"   Success:  {success} ({rate:.1%})")
-                print(f"   Failed:   {failed} ({failed/attempts:.1%})")
-                print()
+                out(f"🔍 LLM Parse Statistics:")
+                out(f"   Attempts: {attempts}")
+                out(f"   Success:  {success} ({rate:.1%})")
+                out(f"   Failed:   {failed} ({failed/attempts:.1%})")
+                out("")
 
         # LLM Stats
         stats = meta.get("llm_stats", {})
@@ -74,89 +103,99 @@ def print_metrics(data: Dict[str, Any], verbose: bool = False) -> None:
             attempts = stats.get("attempts", 0)
             successes = stats.get("successes", 0)
             fallbacks = stats.get("fallbacks", 0)
-            print(f"🤖 LLM Performance:")
-            print(f"   Attempts:  {attempts}")
-            print(f"   Successes: {successes}")
-            print(f"   Fallbacks: {fallbacks} (graceful degradation)")
-            print()
+            out(f"🤖 LLM Performance:")
+            out(f"   Attempts:  {attempts}")
+            out(f"   Successes: {successes}")
+            out(f"   Fallbacks: {fallbacks} (graceful degradation)")
+            out("")
 
         # Provider info
         usage = meta.get("llm_usage", {})
         if usage:
-            print(f"⚙️  Provider:")
-            print(f"   Provider: {usage.get('provider', 'N/A')}")
-            print(f"   Model:    {usage.get('model', 'N/A')}")
-            print(f"   Requests: {usage.get('total_requests', 0)}")
-            print(f"   Tokens:   ~{usage.get('estimated_total_tokens', 0):,}")
-            print(f"   Cost:     ${usage.get('cost', 0):.2f}")
-            print()
+            out(f"⚙️  Provider:")
+            out(f"   Provider: {usage.get('provider', 'N/A')}")
+            out(f"   Model:    {usage.get('model', 'N/A')}")
+            out(f"   Requests: {usage.get('total_requests', 0)}")
+            out(f"   Tokens:   ~{usage.get('estimated_total_tokens', 0):,}")
+            out(f"   Cost:     ${usage.get('cost', 0):.2f}")
+            out("")
     else:
-        print()
+        out("")
 
     # Recommendations summary
     by_decision = summary.get("by_decision", {})
     total = summary.get("total_files", 0)
 
-    print(f"📊 Recommendations ({total} files):")
-    for decision in ["keep", "review", "archive", "delete"]:
-        count = by_decision.get(decision, 0)
-        if total > 0:
-            pct = count / total * 100
-            print(f"   {decision:8s}: {count:3d} ({pct:5.1f}%)")
-        else:
-            print(f"   {decision:8s}: {count:3d}")
-    print()
+    out(f"📊 Recommendations ({total} files):")
+    counts = {d: by_decision.get(d, 0) for d in _DECISIONS}
+    if total > 0:
+        scale = 100.0 / total
+        pcts = {f"{d}_pct": c * scale for d, c in counts.items()}
+        out(_SUMMARY_PCT_TMPL.format(**counts, **pcts))
+    else:
+        out(_SUMMARY_TMPL.format(**counts))
+    out("")
 
     # Confidence distribution
     conf_dist = summary.get("confidence_distribution", {})
     if conf_dist:
-        print("📈 Confidence Distribution:")
+        out("📈 Confidence Distribution:")
         for level, count in conf_dist.items():
-            print(f"   {level:20s}: {count}")
-        print()
+            out(f"   {level:20s}: {count}")
+        out("")
+
+    # Single pass over recommendations: only the buckets we print are kept,
+    # so "keep" records (the bulk of a healthy repo) are never accumulated
+    shown = ("review", "archive", "delete") if verbose else ("review",)
+    buckets: Dict[str, List[Dict[str, Any]]] = {d: [] for d in shown}
+    for r in data.get("recommendations", []):
+        bucket = buckets.get(r.get("recommendation"))
+        if bucket is not None:
+            bucket.append(r)
 
     # Review files (always show)
-    recs = data.get("recommendations", [])
-    review_files = [r for r in recs if r.get("recommendation") == "review"]
+    review_files = buckets["review"]
 
     if review_files:
-        print(f"🔎 FILES REQUIRING REVIEW ({len(review_files)}):")
-        print("=" * 70)
+        out(f"🔎 FILES REQUIRING REVIEW ({len(review_files)}):")
+        out("=" * 70)
         for r in review_files:
-            print(f"\n📄 {r.get('path', 'N/A')}")
-            print(f"   Confidence: {r.get('confidence', 0):.2f}")
+            out(f"\n📄 {r.get('path', 'N/A')}")
+            out(f"   Confidence: {r.get('confidence', 0):.2f}")
             reasons = r.get("reasons", [])
             if reasons:
-                print(f"   Reasons:")
+                out(f"   Reasons:")
                 for reason in reasons:
-                    print(f"      • {reason}")
+                    out(f"      • {reason}")
             action = r.get("suggested_action")
             if action:
-                print(f"   Action: {action}")
+                out(f"   Action: {action}")
     else:
-        print("✅ No files require review!")
+        out("✅ No files require review!")
 
-    print()
-    print("=" * 70)
+    out("")
+    out("=" * 70)
 
     # Verbose mode: show archive/delete too
     if verbose:
         for decision in ["archive", "delete"]:
-            decision_files = [r for r in recs if r.get("recommendation") == decision]
+            decision_files = buckets[decision]
             if decision_files:
-                print()
-                print(f"📁 FILES MARKED FOR {decision.upper()} ({len(decision_files)}):")
-                print("=" * 70)
+                out("")
+                out(f"📁 FILES MARKED FOR {decision.upper()} ({len(decision_files)}):")
+                out("=" * 70)
                 for r in decision_files:
-                    print(f"\n📄 {r.get('path', 'N/A')}")
-                    print(f"   Confidence: {r.get('confidence', 0):.2f}")
+                    out(f"\n📄 {r.get('path', 'N/A')}")
+                    out(f"   Confidence: {r.get('confidence', 0):.2f}")
                     reasons = r.get("reasons", [])
                     if reasons:
-                        print(f"   Reasons:")
+                        out(f"   Reasons:")
                         for reason in reasons:
-                            print(f"      • {reason}")
-                print()
-                print("=" * 70)
+                            out(f"      • {reason}")
+                out("")
+                out("=" * 70)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> int:
@@ -181,7 +220,10 @@ def main() -> int:
     args = parser.parse_args()
 
     data = load_results(args.file)
-    print_metrics(data, verbose=args.verbose)
+    try:
+        print_metrics(data, verbose=args.verbose)
+    except json.JSONDecodeError as e:  # a bad NDJSON record, parsed lazily
+        _exit_invalid_json(args.file, e)
 
     return 0
 
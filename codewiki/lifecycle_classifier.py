@@ -22,15 +22,64 @@ V1.2 Hybrid Mode:
 
 from __future__ import annotations
 
+import ast
+import copy
+import functools
 import json
 import logging
+import os
+import re
 import time
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+# Result reader lives in a dependency-free module; re-exported here
+from .lifecycle_io import read_lifecycle_file  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: faster parsing/serialization of index and result files
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _json_dumps_line(obj: Any) -> bytes:
+    """Serialize one NDJSON line (UTF-8, newline-terminated)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _json_dumps_pretty(obj: Any, level: int = 0) -> bytes:
+    """Serialize with indent=2 (UTF-8), nested as if `level` objects deep."""
+    if HAS_ORJSON:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    # Strings never contain a raw newline, so every one is a line break
+    return data.replace(b"\n", b"\n" + b"  " * level) if level else data
+
+
+# ijson is optional: stream repo_index.json instead of loading it whole
+try:
+    import ijson
+
+    HAS_IJSON = True
+except ImportError:
+    ijson = None
+    HAS_IJSON = False
+
 # Import LLM client (V1.1+)
 # V2.0: Prefer LIR client for better performance
 try:
@@ -50,8 +99,175 @@ if not HAS_LIR_CLIENT and not HAS_LLM_CLIENT:
 
 LifecycleDecision = Literal["keep", "archive", "delete", "review"]
 
+# JSON repair (V1.2 parser): double-quoted strings are matched first and kept
+# verbatim, so fixes below only touch text outside string literals
+_JSON_REPAIR_RE = re.compile(
+    r'(?P<str>"(?:\\.|[^"\\])*")'
+    r"|(?P<comma>,\s*(?=[}\]]))"
+    r"|(?P<lit>\b(?:True|False|None)\b)"
+    r"|(?P<key>(?<=[{,])\s*[A-Za-z_][\w-]*\s*(?=:))"
+)
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+# Markdown code fences around LLM replies (inner content in group 1)
+_JSON_FENCE_RE = re.compile(r"```json(.*?)```", re.DOTALL)
+_FENCE_RE = re.compile(r"```(.*?)```", re.DOTALL)
+
+# Brace-depth scan tokens: whole double-quoted strings (braces inside them
+# don't count) or a single brace. Alternatives are disjoint, so no backtracking.
+_JSON_SPAN_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|[{}]')
+
+
+def _find_json_span(text: str, start: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of the balanced {...} opening at text[start]; None if unclosed."""
+    depth = 0
+    for m in _JSON_SPAN_TOKEN_RE.finditer(text, start):
+        if m[0] == "{":
+            depth += 1
+        elif m[0] == "}":
+            depth -= 1
+            if depth == 0:
+                return start, m.end()
+    return None
+
+# Rule-based path patterns, compiled once: each substring set is a single regex
+# alternation (one scan per path), backup suffixes use str.endswith(tuple)
+_ARCHIVE_DIRS_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "/archive/",
+                "/archived/",
+                "/archives/",
+                "/legacy/",
+                "/deprecated/",
+                "/old/",
+            ),
+        )
+    )
+)
+_LEGACY_NAMES_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "_legacy.",
+                "-legacy.",
+                "_old.",
+                "-old.",
+                "_deprecated.",
+                "-deprecated.",
+                "_backup.",
+                "-backup.",
+            ),
+        )
+    )
+)
+_BACKUP_SUFFIXES = (".bak", ".backup", "~", ".swp", ".swo", ".orig", ".copy")
+
+# Hybrid-mode clear cases: core prefixes use str.startswith(tuple), the
+# temp/backup/log markers a single alternation over the lowercased path
+_CORE_PREFIXES = (
+    "digital_me/core",
+    "digital_me/api",
+    "digital_me/orchestration",
+    "digital_me_platform",
+    "scripts/",
+    "tests/",
+)
+_CLEAR_ARCHIVE_RE = re.compile(
+    "|".join(map(re.escape, (".log", ".tmp", ".bak", "~", ".swp")))
+)
+
+# System prompt shared by every single-file request. Kept byte-identical across
+# calls so the server can reuse its KV cache for this prefix (see preload()).
+SYSTEM_PROMPT = (
+    "You are a senior software engineer specializing in repository hygiene "
+    "and lifecycle management. Your task is to classify files in a large codebase.\n\n"
+    "STRICT OUTPUT RULES:\n"
+    "1. You MUST output EXACTLY ONE JSON object.\n"
+    "2. Do NOT include markdown, explanations, comments, or multiple JSON blocks.\n"
+    "3. The JSON keys MUST be exactly: "
+    '"recommendation", "confidence", "reasons", "suggested_action".\n'
+    '4. \'recommendation\' MUST be one of: "keep", "review", "archive", "delete".\n'
+    "5. 'confidence' MUST be a float between 0.0 and 1.0.\n"
+    "6. 'reasons' MUST be a short list of human-readable strings.\n"
+    "7. If you are uncertain, prefer 'review' with a medium confidence.\n"
+    "8. If you need to think, use <think> tags but keep thinking BRIEF (under 200 words).\n"
+    "9. ALWAYS output the JSON object AFTER </think> tag.\n"
+)
+
+# System prompt for llm_batch_size > 1: one JSON array covering every file
+_BATCH_SYSTEM_PROMPT = (
+    "You are a senior software engineer specializing in repository hygiene "
+    "and lifecycle management. Your task is to classify files in a large codebase.\n\n"
+    "STRICT OUTPUT RULES:\n"
+    "1. You MUST output EXACTLY ONE JSON array with one object per numbered file.\n"
+    "2. Do NOT include markdown, explanations, comments, or multiple JSON blocks.\n"
+    "3. Each object's keys MUST be exactly: "
+    '"index", "recommendation", "confidence", "reasons", "suggested_action".\n'
+    "4. 'index' MUST be the file's number from the list.\n"
+    '5. \'recommendation\' MUST be one of: "keep", "review", "archive", "delete".\n'
+    "6. 'confidence' MUST be a float between 0.0 and 1.0.\n"
+    "7. 'reasons' MUST be a short list of human-readable strings.\n"
+    "8. If you are uncertain, prefer 'review' with a medium confidence.\n"
+    "9. If you need to think, use <think> tags but keep thinking BRIEF.\n"
+    "10. ALWAYS output the JSON array AFTER </think> tag.\n"
+)
+
+# JSON schemas for constrained decoding (Ollama format / OpenAI response_format).
+# The prompt rules above stay: clients without schema support (LIR, older
+# servers) still rely on them, and _parse_llm_json remains the safety net.
+LIFECYCLE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "recommendation": {
+            "type": "string",
+            "enum": ["keep", "review", "archive", "delete"],
+        },
+        "confidence": {"type": "number"},
+        "reasons": {"type": "array", "items": {"type": "string"}},
+        "suggested_action": {"type": ["string", "null"]},
+    },
+    "required": ["recommendation", "confidence", "reasons"],
+}
+_BATCH_LIFECYCLE_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        **LIFECYCLE_SCHEMA,
+        "properties": {"index": {"type": "integer"}, **LIFECYCLE_SCHEMA["properties"]},
+        "required": ["index", *LIFECYCLE_SCHEMA["required"]],
+    },
+}
+
+# Single-file user prompt: only the five file fields vary, so the constant
+# instructions are shared and the bytes stay identical across calls
+_USER_PROMPT = """\
+Analyze the following file and decide its lifecycle status in the repository.
+
+File information:
+- Path: {path}
+- Kind: {kind}
+- Size: {size} bytes
+- Age: {age} days since last modification
+- Deprecation threshold: {deprecation} days
+
+Decision labels:
+1. "keep"   - Active and should remain in place.
+2. "review" - Potentially deprecated or unclear; needs human review.
+3. "archive"- Historical or rarely used; move to archive but do not delete.
+4. "delete" - Temporary, backup, or clearly obsolete; safe to remove.
+
+Important considerations:
+- Be conservative. When in doubt between 'delete' and 'review', choose 'review'.
+- For very old files beyond the deprecation threshold, 'review' or 'archive' are preferred.
+- For recently modified core code files, 'keep' is usually correct.
+
+Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.""".format
+
 
-@dataclass
+@dataclass(slots=True)
 class FileLifecycleRecommendation:
     """Single file lifecycle recommendation."""
 
@@ -62,7 +278,7 @@ class FileLifecycleRecommendation:
     suggested_action: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LifecycleResult:
     """Complete lifecycle classification result."""
 
@@ -70,6 +286,24 @@ class LifecycleResult:
     recommendations: List[FileLifecycleRecommendation]
 
 
+# Serialized field order of one recommendation record
+_RECORD_FIELDS = ("path", "recommendation", "confidence", "reasons", "suggested_action")
+_record_values = attrgetter(*_RECORD_FIELDS)
+
+# Same variable llm_client sizes its request pool with
+_DEFAULT_LLM_CONCURRENCY = 8
+
+
+def _env_llm_concurrency() -> int:
+    """$CODEWIKI_LLM_CONCURRENCY as a positive int, else the default."""
+    try:
+        value = int(os.environ.get("CODEWIKI_LLM_CONCURRENCY", _DEFAULT_LLM_CONCURRENCY))
+    except ValueError:
+        logger.warning("Ignoring non-numeric CODEWIKI_LLM_CONCURRENCY")
+        return _DEFAULT_LLM_CONCURRENCY
+    return value if value >= 1 else _DEFAULT_LLM_CONCURRENCY
+
+
 class LifecycleClassifier:
     """
     Classifies files by lifecycle stage.
@@ -91,6 +325,13 @@ class LifecycleClassifier:
         confidence_threshold: float = 0.7,
         llm_mode: str = "full",  # NEW V1.2: "full" | "hybrid"
         llm_max_files: Optional[int] = None,  # NEW V1.2: max LLM calls in hybrid
+        output_format: str = "json",  # "json" | "ndjson" (streamable)
+        llm_concurrency: Optional[int] = None,  # parallel LLM requests
+        llm_batch_size: int = 1,  # files per LLM prompt (1 = no batching)
+        llm_model: Optional[str] = None,  # None = provider's configured model
+        llm_options: Optional[Dict[str, Any]] = None,  # e.g. num_ctx, num_predict
+        llm_structured_output: bool = False,  # send LIFECYCLE_SCHEMA as format
+        llm_cache_similar: bool = False,  # one LLM call per (kind, age, top dir)
     ) -> None:
         """
         Initialize lifecycle classifier.
@@ -102,6 +343,22 @@ class LifecycleClassifier:
             confidence_threshold: Minimum confidence for recommendations
             llm_mode: "full" (try LLM for all files) or "hybrid" (selective)
             llm_max_files: Maximum LLM calls in hybrid mode (None = no limit)
+            output_format: "json" (single document) or "ndjson" (header line
+                followed by one recommendation per line)
+            llm_concurrency: Max in-flight LLM requests (None =
+                $CODEWIKI_LLM_CONCURRENCY, default 8; 1 = sequential)
+            llm_batch_size: Files packed into one LLM prompt; responses are a
+                JSON array mapped back by index (1 = one prompt per file)
+            llm_model: Model override sent with every request (e.g. a Q4_K_M
+                quantized instruct model); None keeps the provider's model
+            llm_options: Ollama-style options sent with every request, e.g.
+                {"num_ctx": 1024, "num_predict": 128, "temperature": 0}
+            llm_structured_output: Pass LIFECYCLE_SCHEMA (batch: an array of
+                it) as generate(format=...) so the server constrains decoding
+                to valid JSON; requires a client that accepts format
+            llm_cache_similar: Memoize LLM results by (kind, 30-day age
+                bucket, top-level directory) so files in the same class share
+                one request; trades per-file nuance for far fewer calls
         """
         self.index_path = index_path
         self.output_path = output_path
@@ -109,6 +366,32 @@ class LifecycleClassifier:
         self.confidence_threshold = confidence_threshold
         self.llm_mode = llm_mode
         self.llm_max_files = llm_max_files
+        self.output_format = output_format
+        if llm_concurrency is None:
+            llm_concurrency = _env_llm_concurrency()
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.llm_batch_size = max(1, int(llm_batch_size))
+        self.llm_model = llm_model
+        self.llm_options = llm_options
+        self.llm_structured_output = llm_structured_output
+        self.llm_cache_similar = llm_cache_similar
+        self._llm_cache: Dict[Tuple[str, int, str], Optional[FileLifecycleRecommendation]] = {}
+
+        # Extra generate() kwargs, only when set, so clients implementing the
+        # minimal generate(prompt, system_prompt) interface keep working
+        self._generate_kwargs: Dict[str, Any] = {}
+        if llm_model:
+            self._generate_kwargs["model"] = llm_model
+        if llm_options:
+            self._generate_kwargs["options"] = dict(llm_options)
+        self._batch_generate_kwargs = dict(self._generate_kwargs)
+        if llm_structured_output:
+            self._generate_kwargs["format"] = LIFECYCLE_SCHEMA
+            self._batch_generate_kwargs["format"] = _BATCH_LIFECYCLE_SCHEMA
+
+        # Reference time for the current classify() run: one clock read per
+        # run instead of one (or two) per file
+        self._now: Optional[float] = None
 
         # V1.2: LLM statistics tracking
         self._llm_stats = {
@@ -126,8 +409,40 @@ class LifecycleClassifier:
         """Load repository index from scanner output."""
         if not self.index_path.exists():
             raise FileNotFoundError(f"Repo index not found: {self.index_path}")
-        with self.index_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _json_loads(self.index_path.read_bytes())
+
+    def load_scan_metadata(self) -> Dict[str, Any]:
+        """Read only scan_metadata from the index (stops early with ijson)."""
+        if not HAS_IJSON:
+            return self.load_repo_index().get("scan_metadata", {})
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"Repo index not found: {self.index_path}")
+        with self.index_path.open("rb") as f:
+            return next(ijson.items(f, "scan_metadata"), {})
+
+    def iter_files(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield file entries from the index one at a time.
+
+        With ijson installed the index is parsed incrementally, so
+        classification starts before the whole file is read and the full file
+        list is never held in memory.
+        """
+        if not HAS_IJSON:
+            yield from self.load_repo_index().get("files", [])
+            return
+        if not self.index_path.exists():
+            raise FileNotFoundError(f"Repo index not found: {self.index_path}")
+        with self.index_path.open("rb") as f:
+            # use_float keeps mtimes as float rather than Decimal
+            yield from ijson.items(f, "files.item", use_float=True)
+
+    def _read_index(self) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """(scan_metadata, file iterator), parsing the index only once without ijson."""
+        if HAS_IJSON:
+            return self.load_scan_metadata(), self.iter_files()
+        index = self.load_repo_index()
+        return index.get("scan_metadata", {}), iter(index.get("files", []))
 
     # ==================== V1.2: JSON Parser Enhancement ====================
 
@@ -135,26 +450,122 @@ class LifecycleClassifier:
     def _strip_code_fences(text: str) -> str:
         """Remove ```json ... ``` or ``` wrappers, return inner content."""
         text = text.strip()
-        if "```" in text:
-            if "```json" in text:
-                parts = text.split("```json", 1)
-                if len(parts) > 1 and "```" in parts[1]:
-                    return parts[1].split("```", 1)[0].strip()
-            parts = text.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
+        # A ```json fence wins over an earlier plain one
+        match = _JSON_FENCE_RE.search(text) or _FENCE_RE.search(text)
+        return match.group(1).strip() if match else text
+
+    @staticmethod
+    def _repair_json(text: str) -> Optional[Any]:
+        """
+        Parse near-JSON commonly produced by LLMs.
+
+        Repairs (outside string literals): trailing commas, Python
+        True/False/None, unquoted keys. Falls back to ast.literal_eval for
+        Python-style dicts with single-quoted strings.
+
+        Returns:
+            Parsed value or None if still unparseable
+        """
+
+        def _fix(m: re.Match) -> str:
+            if m.group("str") is not None:
+                return m.group("str")
+            if m.group("comma") is not None:
+                return ""
+            if m.group("lit") is not None:
+                return _PY_LITERALS[m.group("lit")]
+            return json.dumps(m.group("key").strip())
+
+        try:
+            return json.loads(_JSON_REPAIR_RE.sub(_fix, text))
+        except Exception:
+            pass
+        try:
+            return ast.literal_eval(text)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _strip_think_tags(text: str) -> str:
+        """Drop <think>...</think> reasoning, keeping the answer that follows."""
+        if "<think>" in text or "</think>" in text:
+            # Find content after </think> tag
+            think_end = text.rfind("</think>")
+            if think_end != -1:
+                text = text[think_end + 8:].strip()  # 8 = len("</think>")
+            else:
+                # If only opening <think> tag, keep content AFTER it
+                # (JSON usually comes after <think> in truncated responses)
+                think_start = text.find("<think>")
+                if think_start != -1:
+                    text = text[think_start + 7:].strip()  # +7 = len("<think>")
+                    logger.debug("Unclosed <think> tag found, keeping content after tag")
         return text
 
+    @classmethod
+    def _parse_llm_json_list(cls, raw_text: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract a JSON array of objects from a batched LLM response.
+
+        Same strategy chain as _parse_llm_json, but looks for [...] and also
+        accepts an object wrapping the array (e.g. {"results": [...]}).
+
+        Returns:
+            List of dicts or None on failure
+        """
+        text = cls._strip_think_tags(raw_text.strip())
+        if not text:
+            return None
+
+        stripped = cls._strip_code_fences(text)
+        candidates = [text, stripped]
+        first = stripped.find("[")
+        last = stripped.rfind("]")
+        if first != -1 and last > first:
+            candidates.append(stripped[first : last + 1])
+
+        for n, candidate in enumerate(candidates):
+            try:
+                data = json.loads(candidate)
+            except Exception:
+                # Innermost candidate gets one repair attempt
+                if n != len(candidates) - 1:
+                    continue
+                data = cls._repair_json(candidate)
+            if isinstance(data, dict):
+                data = next((v for v in data.values() if isinstance(v, list)), None)
+            if isinstance(data, list):
+                return [item for item in data if isinstance(item, dict)]
+
+        logger.debug("Batched JSON parse failed")
+        return None
+
     @classmethod
     def _parse_llm_json(cls, raw_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse an LLM reply (see _extract_llm_json), memoized per reply text.
+
+        Retries, similar-file caching and deterministic runs resubmit identical
+        replies; repeats skip the strategy chain. Each call gets its own
+        shallow copy of the cached result.
+        """
+        parsed = _parse_llm_json_cached(raw_text)
+        return copy.copy(parsed)
+
+    @classmethod
+    def _extract_llm_json(cls, raw_text: str) -> Optional[Dict[str, Any]]:
         """
         Attempt to extract JSON from LLM output with multiple strategies.
 
         Strategy chain:
+        0. Fast path: the whole response is JSON (schema-constrained output)
         1. Strip <think>...</think> tags (for reasoning models like qwen3-thinking)
         2. Direct json.loads
         3. Strip code fences, then loads
-        4. Find first '{' and last '}', extract and parse
+        4. Find first '{' and last '}', extract and parse; if that fails,
+           parse the balanced object opening at the first '{' (trailing prose
+           with braces, or several objects in a row)
+        5. Repair common near-JSON mistakes in the first/last block (_repair_json)
 
         Returns:
             Parsed JSON dict or None on failure (triggers rule-based fallback)
@@ -163,19 +574,18 @@ class LifecycleClassifier:
         if not cls_text:
             return None
 
-        # 0) Strip <think> tags for reasoning models (qwen3-4b-thinking, etc.)
-        if "<think>" in cls_text or "</think>" in cls_text:
-            # Find content after </think> tag
-            think_end = cls_text.rfind("</think>")
-            if think_end != -1:
-                cls_text = cls_text[think_end + 8:].strip()  # 8 = len("</think>")
+        # Constrained decoding returns bare JSON: skip the repair chain
+        if cls_text[0] == "{":
+            try:
+                parsed = _json_loads(cls_text)
+            except ValueError:
+                pass
             else:
-                # If only opening <think> tag, keep content AFTER it
-                # (JSON usually comes after <think> in truncated responses)
-                think_start = cls_text.find("<think>")
-                if think_start != -1:
-                    cls_text = cls_text[think_start + 7:].strip()  # +7 = len("<think>")
-                    logger.debug("Unclosed <think> tag found, keeping content after tag")
+                if isinstance(parsed, dict):
+                    return parsed
+
+        # 0) Strip <think> tags for reasoning models (qwen3-4b-thinking, etc.)
+        cls_text = cls._strip_think_tags(cls_text)
 
         # 1) Direct attempt
         try:
@@ -198,7 +608,24 @@ class LifecycleClassifier:
             try:
                 return json.loads(candidate)
             except Exception:
-                logger.debug("Final JSON parse attempt failed")
+                pass
+
+            # 3b) Only the first balanced object (one linear scan)
+            span = _find_json_span(stripped, first)
+            if span is not None and span[1] != last + 1:
+                try:
+                    parsed = json.loads(stripped[span[0] : span[1]])
+                except Exception:
+                    pass
+                else:
+                    if isinstance(parsed, dict):
+                        return parsed
+
+            # 4) Repair trailing commas / Python literals / unquoted keys
+            repaired = cls._repair_json(candidate)
+            if isinstance(repaired, dict):
+                return repaired
+            logger.debug("Final JSON parse attempt failed")
 
         return None
 
@@ -206,12 +633,27 @@ class LifecycleClassifier:
 
     def _compute_age_days(self, mtime: float) -> float:
         """Calculate file age in days from modification timestamp."""
-        now = time.time()
+        now = self._now if self._now is not None else time.time()
         return (now - mtime) / 86400.0
 
+    def _entry_age_days(self, entry: Dict[str, Any]) -> float:
+        """
+        Age of an index entry in days (a missing mtime counts as age 0).
+
+        Does not touch the entry; the classify loop computes it once per entry
+        and passes it to the rule checks.
+        """
+        mtime = entry.get("mtime")
+        return self._compute_age_days(float(mtime)) if mtime is not None else 0.0
+
     # ==================== V1.2: Clear-Case Detection ====================
 
-    def _is_clear_case(self, entry: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    def _is_clear_case(
+        self,
+        entry: Dict[str, Any],
+        age_days: Optional[float] = None,
+        lower_path: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str]]:
         """
         Determine if file is an obvious case that doesn't need LLM (V1.2 hybrid mode).
 
@@ -220,6 +662,11 @@ class LifecycleClassifier:
         - Temp/backup/log files → archive
         - Very old docs → review
 
+        Args:
+            entry: Index entry
+            age_days: The entry's age if the caller already computed it
+            lower_path: path.lower() if the caller already has it
+
         Returns:
             (is_clear, forced_decision or None)
             - is_clear=True, forced_decision!=None → use this decision
@@ -227,24 +674,17 @@ class LifecycleClassifier:
         """
         path = entry.get("path", "")
         kind = entry.get("kind", "other")
-        mtime = entry.get("mtime", 0)
-        age_days = self._compute_age_days(mtime)
+        if age_days is None:
+            age_days = self._entry_age_days(entry)
 
         # 1) Obvious keep: recently modified core files
-        core_dirs = (
-            "digital_me/core",
-            "digital_me/api",
-            "digital_me/orchestration",
-            "digital_me_platform",
-            "scripts/",
-            "tests/",
-        )
-        if age_days < 30 and any(path.startswith(d) for d in core_dirs):
+        if age_days < 30 and path.startswith(_CORE_PREFIXES):
             return True, "keep"
 
         # 2) Obvious archive: temp/backup/log files
-        lower = path.lower()
-        if any(s in lower for s in (".log", ".tmp", ".bak", "~", ".swp")):
+        if lower_path is None:
+            lower_path = path.lower()
+        if _CLEAR_ARCHIVE_RE.search(lower_path):
             return True, "archive"
 
         # 3) Old docs: review (not auto-delete)
@@ -256,6 +696,47 @@ class LifecycleClassifier:
 
     # ==================== V1.2: LLM Classification ====================
 
+    def _build_llm_prompts(self, entry: Dict[str, Any]) -> Tuple[str, str]:
+        """Build (system_prompt, user_prompt) for classifying one file entry."""
+        path = entry.get("path", "")
+        kind = entry.get("kind", "other")
+        size = entry.get("size_bytes", 0)
+        age_days = self._entry_age_days(entry)
+
+        user_prompt = _USER_PROMPT(
+            path=path,
+            kind=kind,
+            size=size,
+            age=int(age_days),
+            deprecation=self.deprecation_days,
+        )
+        return SYSTEM_PROMPT, user_prompt
+
+    def _request_llm(
+        self,
+        entry: Dict[str, Any],
+        llm_client: "LocalLLMClient",
+    ) -> Tuple[Optional[str], Optional[Exception]]:
+        """
+        Send one classification request to the LLM.
+
+        Pure I/O with no shared classifier state, so it is safe to run from
+        worker threads; parsing and statistics stay on the calling thread.
+
+        Returns:
+            (response_text, error) - error is set if the client raised
+        """
+        system_prompt, user_prompt = self._build_llm_prompts(entry)
+        try:
+            return (
+                llm_client.generate(
+                    prompt=user_prompt, system_prompt=system_prompt, **self._generate_kwargs
+                ),
+                None,
+            )
+        except Exception as e:
+            return None, e
+
     def _classify_with_llm(
         self,
         entry: Dict[str, Any],
@@ -276,61 +757,213 @@ class LifecycleClassifier:
         Returns:
             FileLifecycleRecommendation if LLM succeeds, None to fallback to rules
         """
-        path = entry.get("path", "")
-        kind = entry.get("kind", "other")
-        size = entry.get("size_bytes", 0)
-        mtime = entry.get("mtime", 0)
-        age_days = self._compute_age_days(mtime)
-
-        # Build enhanced prompts (V1.2 + reasoning model support)
-        system_prompt = (
-            "You are a senior software engineer specializing in repository hygiene "
-            "and lifecycle management. Your task is to classify files in a large codebase.\n\n"
-            "STRICT OUTPUT RULES:\n"
-            "1. You MUST output EXACTLY ONE JSON object.\n"
-            "2. Do NOT include markdown, explanations, comments, or multiple JSON blocks.\n"
-            "3. The JSON keys MUST be exactly: "
-            '"recommendation", "confidence", "reasons", "suggested_action".\n'
-            '4. \'recommendation\' MUST be one of: "keep", "review", "archive", "delete".\n'
-            "5. 'confidence' MUST be a float between 0.0 and 1.0.\n"
-            "6. 'reasons' MUST be a short list of human-readable strings.\n"
-            "7. If you are uncertain, prefer 'review' with a medium confidence.\n"
-            "8. If you need to think, use <think> tags but keep thinking BRIEF (under 200 words).\n"
-            "9. ALWAYS output the JSON object AFTER </think> tag.\n"
+        response_text, error = self._request_llm(entry, llm_client)
+        return self._recommendation_from_llm(entry, response_text, error)
+
+    def _classify_many_with_llm(
+        self,
+        entries: List[Dict[str, Any]],
+        llm_client: "LocalLLMClient",
+    ) -> List[Optional[FileLifecycleRecommendation]]:
+        """
+        Classify entries with up to llm_concurrency requests in flight.
+
+        Requests overlap on a thread pool (the clients are blocking HTTP);
+        responses are parsed in input order on the calling thread. With
+        llm_batch_size > 1, entries are first packed into batched prompts and
+        only files the batch didn't resolve are retried one per prompt. With
+        llm_cache_similar, only one entry per _llm_cache_key is requested.
+
+        Returns:
+            One recommendation (or None → rule fallback) per entry, in order
+        """
+        if not entries:
+            return []
+        if self.llm_cache_similar:
+            return self._classify_similar_with_llm(entries, llm_client)
+        return self._classify_each_with_llm(entries, llm_client)
+
+    def _classify_each_with_llm(
+        self,
+        entries: List[Dict[str, Any]],
+        llm_client: "LocalLLMClient",
+    ) -> List[Optional[FileLifecycleRecommendation]]:
+        """Request every entry (batched prompts first when enabled)."""
+        results: List[Optional[FileLifecycleRecommendation]] = [None] * len(entries)
+        pending = list(range(len(entries)))
+
+        if self.llm_batch_size > 1 and len(entries) > 1:
+            chunks = [
+                pending[i : i + self.llm_batch_size]
+                for i in range(0, len(pending), self.llm_batch_size)
+            ]
+            responses = self._map_llm_requests(
+                lambda chunk: self._request_llm_batch(
+                    [entries[i] for i in chunk], llm_client
+                ),
+                chunks,
+            )
+            pending = []
+            for chunk, (text, error) in zip(chunks, responses):
+                parsed = self._parse_llm_batch_response(len(chunk), text, error)
+                for i, item in zip(chunk, parsed):
+                    if item is None:
+                        pending.append(i)  # retry this file on its own
+                    else:
+                        self._llm_stats["successes"] += 1
+                        results[i] = self._recommendation_from_parsed(entries[i], item)
+
+        responses = self._map_llm_requests(
+            lambda i: self._request_llm(entries[i], llm_client), pending
         )
+        for i, (text, error) in zip(pending, responses):
+            results[i] = self._recommendation_from_llm(entries[i], text, error)
 
-        user_prompt = f"""
-Analyze the following file and decide its lifecycle status in the repository.
+        return results
 
-File information:
-- Path: {path}
-- Kind: {kind}
-- Size: {size} bytes
-- Age: {int(age_days)} days since last modification
-- Deprecation threshold: {self.deprecation_days} days
+    def _llm_cache_key(self, entry: Dict[str, Any]) -> Tuple[str, int, str]:
+        """Class of files that share one LLM answer: (kind, age bucket, top dir)."""
+        return (
+            entry.get("kind", "other"),
+            int(self._entry_age_days(entry) // 30),
+            entry.get("path", "").split("/", 1)[0],
+        )
 
-Decision labels:
-1. "keep"   - Active and should remain in place.
-2. "review" - Potentially deprecated or unclear; needs human review.
-3. "archive"- Historical or rarely used; move to archive but do not delete.
-4. "delete" - Temporary, backup, or clearly obsolete; safe to remove.
+    def _classify_similar_with_llm(
+        self,
+        entries: List[Dict[str, Any]],
+        llm_client: "LocalLLMClient",
+    ) -> List[Optional[FileLifecycleRecommendation]]:
+        """
+        Classify one representative per cache key and reuse it for the rest.
 
-Important considerations:
-- Be conservative. When in doubt between 'delete' and 'review', choose 'review'.
-- For very old files beyond the deprecation threshold, 'review' or 'archive' are preferred.
-- For recently modified core code files, 'keep' is usually correct.
+        Cache hits mirror the representative in successes/fallbacks (so the
+        attempts check in classify() still balances) and are counted in
+        _llm_stats["cache_hits"].
+        """
+        keys = [self._llm_cache_key(entry) for entry in entries]
+        misses: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+        for key, entry in zip(keys, entries):
+            if key not in self._llm_cache and key not in misses:
+                misses[key] = entry
+
+        fresh = self._classify_each_with_llm(list(misses.values()), llm_client)
+        self._llm_cache.update(zip(misses, fresh))
+
+        results: List[Optional[FileLifecycleRecommendation]] = []
+        hits = 0
+        for key, entry in zip(keys, entries):
+            rec = self._llm_cache[key]
+            if misses.get(key) is entry:
+                results.append(rec)
+                continue
+            hits += 1
+            self._llm_stats["successes" if rec is not None else "fallbacks"] += 1
+            results.append(
+                None
+                if rec is None
+                else replace(rec, path=entry.get("path", ""), reasons=list(rec.reasons))
+            )
 
-Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
-"""
+        self._llm_stats["cache_hits"] = self._llm_stats.get("cache_hits", 0) + hits
+        return results
+
+    def _map_llm_requests(self, fn, items: List[Any]) -> List[Any]:
+        """Apply an LLM request function to items, llm_concurrency at a time."""
+        workers = min(self.llm_concurrency, len(items))
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="codewiki-llm"
+        ) as pool:
+            return list(pool.map(fn, items))
+
+    def _request_llm_batch(
+        self,
+        entries: List[Dict[str, Any]],
+        llm_client: "LocalLLMClient",
+    ) -> Tuple[Optional[str], Optional[Exception]]:
+        """
+        Send one prompt classifying several files (worker-thread safe).
+
+        The shared instructions are sent once; each file contributes only its
+        descriptor line, so fixed prompt cost is amortized over the batch.
+        """
+        lines = []
+        for n, entry in enumerate(entries):
+            age_days = self._entry_age_days(entry)
+            lines.append(
+                f"{n}. Path: {entry.get('path', '')} | Kind: {entry.get('kind', 'other')}"
+                f" | Size: {entry.get('size_bytes', 0)} bytes"
+                f" | Age: {int(age_days)} days"
+            )
+
+        user_prompt = (
+            f"Classify the lifecycle status of each of these {len(entries)} files "
+            f"(deprecation threshold: {self.deprecation_days} days).\n\n"
+            + "\n".join(lines)
+            + "\n\nDecision labels: \"keep\", \"review\", \"archive\", \"delete\". "
+            "Be conservative: when in doubt between 'delete' and 'review', choose 'review'.\n"
+            "Respond with EXACTLY ONE JSON array."
+        )
 
-        # Call LLM
         try:
-            response_text = llm_client.generate(
-                prompt=user_prompt.strip(),
-                system_prompt=system_prompt,
+            return (
+                llm_client.generate(
+                    prompt=user_prompt,
+                    system_prompt=_BATCH_SYSTEM_PROMPT,
+                    **self._batch_generate_kwargs,
+                ),
+                None,
             )
         except Exception as e:
-            logger.warning("LLM call failed for %s: %s", path, e)
+            return None, e
+
+    def _parse_llm_batch_response(
+        self, count: int, response_text: Optional[str], error: Optional[Exception]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Map a batched response back to its files by "index".
+
+        Returns:
+            One parsed object (or None if missing/unusable) per file in the batch
+        """
+        parsed: List[Optional[Dict[str, Any]]] = [None] * count
+        if error is not None:
+            logger.warning("Batched LLM call failed: %s", error)
+            return parsed
+        if not response_text:
+            return parsed
+
+        self._llm_parse_stats["attempts"] += 1
+        items = self._parse_llm_json_list(response_text)
+        if items is None:
+            self._llm_parse_stats["parse_failed"] += 1
+            return parsed
+
+        self._llm_parse_stats["parse_success"] += 1
+        for position, item in enumerate(items):
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < count and parsed[index] is None:
+                parsed[index] = item
+        return parsed
+
+    def _recommendation_from_llm(
+        self,
+        entry: Dict[str, Any],
+        response_text: Optional[str],
+        error: Optional[Exception] = None,
+    ) -> Optional[FileLifecycleRecommendation]:
+        """
+        Turn an LLM response into a recommendation and update LLM statistics.
+
+        Returns:
+            FileLifecycleRecommendation, or None to fallback to rules
+        """
+        path = entry.get("path", "")
+
+        if error is not None:
+            logger.warning("LLM call failed for %s: %s", path, error)
             self._llm_stats["fallbacks"] += 1
             return None
 
@@ -351,6 +984,14 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
 
         self._llm_parse_stats["parse_success"] += 1
         self._llm_stats["successes"] += 1
+        return self._recommendation_from_parsed(entry, parsed)
+
+    @staticmethod
+    def _recommendation_from_parsed(
+        entry: Dict[str, Any], parsed: Dict[str, Any]
+    ) -> FileLifecycleRecommendation:
+        """Validate parsed LLM fields and build the recommendation."""
+        path = entry.get("path", "")
 
         # Extract and validate fields
         rec_label = (parsed.get("recommendation") or "review").lower()
@@ -364,8 +1005,8 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
         confidence = max(0.0, min(1.0, confidence))
 
         reasons = parsed.get("reasons") or []
-        if not isinstance(reasons, list):
-            reasons = [str(reasons)]
+        # Own list: parsed may come from the shared parse cache
+        reasons = list(reasons) if isinstance(reasons, list) else [str(reasons)]
 
         suggested_action = parsed.get("suggested_action") or None
         if suggested_action:
@@ -402,23 +1043,13 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
         Returns:
             LifecycleResult with recommendations for each file
         """
-        index = self.load_repo_index()
-        files = index.get("files", [])
-        scan_metadata = index.get("scan_metadata", {})
+        scan_metadata, files = self._read_index()
+        self._now = time.time()
 
         # No LLM: pure rule-based (V1 compatibility)
         if not use_llm or llm_client is None or not llm_client.is_available():
             logger.info("LLM disabled or unavailable, using rule-based only")
-            recommendations = []
-            for entry in files:
-                path = entry.get("path", "")
-                mtime = float(entry.get("mtime", time.time()))
-                age_days = (time.time() - mtime) / 86400
-                kind = entry.get("kind", "other")
-                rec = self._classify_file(
-                    path=path, age_days=age_days, kind=kind, entry=entry
-                )
-                recommendations.append(rec)
+            recommendations = [self._classify_by_rules(entry) for entry in files]
             scan_metadata["classification_method"] = "rule-based-v1"
             return LifecycleResult(
                 scan_metadata={
@@ -435,14 +1066,22 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
         logger.info(f"LLM mode: {self.llm_mode}, max_files={self.llm_max_files}")
         llm_calls = 0
 
-        # Use dict to maintain order stability (architect recommendation)
+        # Use dict to maintain order stability (architect recommendation);
+        # paths records input order while the index is streamed
         by_path: Dict[str, FileLifecycleRecommendation] = {}
+        paths: List[str] = []
+        llm_entries: List[Dict[str, Any]] = []
 
         if self.llm_mode == "hybrid":
-            # Phase 1: Filter clear cases
-            uncertain_entries = []
+            # Phase 1: Filter clear cases; rule-classify uncertain files over
+            # the LLM limit right away so only LLM-bound entries are kept
+            limit = self.llm_max_files
             for entry in files:
-                is_clear, forced_decision = self._is_clear_case(entry)
+                paths.append(entry["path"])
+                # Shared by the clear-case check and the rule fallback
+                age_days = self._entry_age_days(entry)
+                lower_path = entry["path"].lower()
+                is_clear, forced_decision = self._is_clear_case(entry, age_days, lower_path)
                 if is_clear and forced_decision:
                     rec = FileLifecycleRecommendation(
                         path=entry["path"],
@@ -451,53 +1090,30 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
                         reasons=[f"Rule-based clear case: {forced_decision}"],
                     )
                     by_path[entry["path"]] = rec
+                elif limit is None or len(llm_entries) < limit:
+                    llm_entries.append(entry)
                 else:
-                    uncertain_entries.append(entry)
-
-            # Phase 2: LLM for uncertain (up to limit)
-            for entry in uncertain_entries:
-                use_llm_for_this = (
-                    self.llm_max_files is None or llm_calls < self.llm_max_files
-                )
-
-                rec = None
-                if use_llm_for_this:
-                    self._llm_stats["attempts"] += 1  # CRITICAL: count attempts
-                    llm_calls += 1
-                    rec = self._classify_with_llm(entry, llm_client)
-
-                if rec is None:
-                    # Rule fallback with proper parameters
-                    path = entry.get("path", "")
-                    mtime = float(entry.get("mtime", time.time()))
-                    age_days = (time.time() - mtime) / 86400
-                    kind = entry.get("kind", "other")
-                    rec = self._classify_file(
-                        path=path, age_days=age_days, kind=kind, entry=entry
+                    by_path[entry["path"]] = self._classify_by_rules(
+                        entry, age_days, lower_path
                     )
 
-                by_path[entry["path"]] = rec
-
         else:  # "full" mode
             for entry in files:
-                self._llm_stats["attempts"] += 1  # CRITICAL: count attempts
-                llm_calls += 1
-                rec = self._classify_with_llm(entry, llm_client)
-
-                if rec is None:
-                    # Rule fallback with proper parameters
-                    path = entry.get("path", "")
-                    mtime = float(entry.get("mtime", time.time()))
-                    age_days = (time.time() - mtime) / 86400
-                    kind = entry.get("kind", "other")
-                    rec = self._classify_file(
-                        path=path, age_days=age_days, kind=kind, entry=entry
-                    )
+                paths.append(entry["path"])
+                llm_entries.append(entry)
 
-                by_path[entry["path"]] = rec
+        # Phase 2: LLM for selected entries, requests in parallel
+        self._llm_stats["attempts"] += len(llm_entries)  # CRITICAL: count attempts
+        llm_calls += len(llm_entries)
+        llm_recs = self._classify_many_with_llm(llm_entries, llm_client)
+
+        for entry, rec in zip(llm_entries, llm_recs):
+            if rec is None:
+                rec = self._classify_by_rules(entry)
+            by_path[entry["path"]] = rec
 
         # Ensure output order matches input order (for easy diffing V1 vs V1.2)
-        recommendations = [by_path[entry["path"]] for entry in files]
+        recommendations = [by_path[path] for path in paths]
 
         # Statistics consistency check (architect recommendation - helps catch bugs)
         attempts = self._llm_stats.get("attempts", 0)
@@ -532,8 +1148,28 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
             recommendations=recommendations,
         )
 
+    def _classify_by_rules(
+        self,
+        entry: Dict[str, Any],
+        age_days: Optional[float] = None,
+        lower_path: Optional[str] = None,
+    ) -> FileLifecycleRecommendation:
+        """Rule-based classification for an index entry (LLM fallback)."""
+        path = entry.get("path", "")
+        if age_days is None:
+            age_days = self._entry_age_days(entry)
+        kind = entry.get("kind", "other")
+        return self._classify_file(
+            path=path, age_days=age_days, kind=kind, entry=entry, lower_path=lower_path
+        )
+
     def _classify_file(
-        self, path: str, age_days: float, kind: str, entry: Dict[str, Any]
+        self,
+        path: str,
+        age_days: float,
+        kind: str,
+        entry: Dict[str, Any],
+        lower_path: Optional[str] = None,
     ) -> FileLifecycleRecommendation:
         """
         Classify a single file using rule-based logic.
@@ -541,7 +1177,8 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
         Future: Replace with LLM-based classification for smarter decisions.
         """
         # Pattern-based rules (highest priority)
-        if self._is_archive_pattern(path):
+        pattern = self._match_patterns(path, lower_path)
+        if pattern == "archive":
             return FileLifecycleRecommendation(
                 path=path,
                 recommendation="archive",
@@ -550,7 +1187,7 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
                 suggested_action=None,  # Already archived
             )
 
-        if self._is_legacy_pattern(path):
+        if pattern == "legacy":
             return FileLifecycleRecommendation(
                 path=path,
                 recommendation="archive",
@@ -559,7 +1196,7 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
                 suggested_action=f"Move to docs/archive/{Path(path).parent}/",
             )
 
-        if self._is_backup_pattern(path):
+        if pattern == "backup":
             return FileLifecycleRecommendation(
                 path=path,
                 recommendation="delete",
@@ -619,77 +1256,100 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
             suggested_action=None,
         )
 
+    @staticmethod
+    def _match_patterns(path: str, lower_path: Optional[str] = None) -> Optional[str]:
+        """
+        Match a path against all rule patterns in priority order.
+
+        Args:
+            path: Path as stored in the index (backup suffixes are case-sensitive)
+            lower_path: path.lower() if the caller already has it
+
+        Returns:
+            "archive", "legacy", "backup", or None
+        """
+        if lower_path is None:
+            lower_path = path.lower()
+        if _ARCHIVE_DIRS_RE.search(lower_path):
+            return "archive"
+        if _LEGACY_NAMES_RE.search(lower_path):
+            return "legacy"
+        if path.endswith(_BACKUP_SUFFIXES):
+            return "backup"
+        return None
+
     @staticmethod
     def _is_archive_pattern(path: str) -> bool:
         """Check if file is already in archive directories."""
-        archive_patterns = [
-            "/archive/",
-            "/archived/",
-            "/archives/",
-            "/legacy/",
-            "/deprecated/",
-            "/old/",
-        ]
-        return any(pattern in path.lower() for pattern in archive_patterns)
+        return _ARCHIVE_DIRS_RE.search(path.lower()) is not None
 
     @staticmethod
     def _is_legacy_pattern(path: str) -> bool:
         """Check if file matches legacy patterns."""
-        legacy_patterns = [
-            "_legacy.",
-            "-legacy.",
-            "_old.",
-            "-old.",
-            "_deprecated.",
-            "-deprecated.",
-            "_backup.",
-            "-backup.",
-        ]
-        lower_path = path.lower()
-        return any(pattern in lower_path for pattern in legacy_patterns)
+        return _LEGACY_NAMES_RE.search(path.lower()) is not None
 
     @staticmethod
     def _is_backup_pattern(path: str) -> bool:
         """Check if file is a backup copy."""
-        backup_patterns = [".bak", ".backup", "~", ".swp", ".swo", ".orig", ".copy"]
-        return any(path.endswith(pattern) for pattern in backup_patterns)
+        return path.endswith(_BACKUP_SUFFIXES)
 
     def save_result(self, result: LifecycleResult) -> None:
-        """Save classification results to JSON file."""
-        payload = {
-            "scan_metadata": result.scan_metadata,
-            "recommendations": [
-                {
-                    "path": r.path,
-                    "recommendation": r.recommendation,
-                    "confidence": r.confidence,
-                    "reasons": r.reasons,
-                    "suggested_action": r.suggested_action,
-                }
-                for r in result.recommendations
-            ],
-            "summary": self._summarize(result),
-        }
+        """
+        Save classification results to disk.
+
+        Layout depends on output_format:
+        - "json": one document with scan_metadata, recommendations, summary
+        - "ndjson": header line with scan_metadata + summary, then one
+          recommendation per line (readers can stream it record-by-record)
+
+        Both are written record by record, so memory stays bounded by one
+        serialized recommendation rather than the whole document.
+        """
+        if HAS_ORJSON:
+            # orjson encodes dataclasses natively (fields in declaration order),
+            # so no intermediate dict is built per recommendation
+            records: Iterator[Any] = iter(result.recommendations)
+        else:
+            records = (
+                dict(zip(_RECORD_FIELDS, values))
+                for values in map(_record_values, result.recommendations)
+            )
+        summary = self._summarize(result)
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.output_path.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+        if self.output_format == "ndjson":
+            header = {"scan_metadata": result.scan_metadata, "summary": summary}
+            with self.output_path.open("wb") as f:
+                f.write(_json_dumps_line(header))
+                f.writelines(map(_json_dumps_line, records))
+            return
+
+        # Same bytes as dumping {"scan_metadata", "recommendations", "summary"}
+        # with indent=2, but the recommendations array is streamed
+        with self.output_path.open("wb") as f:
+            f.write(b'{\n  "scan_metadata": ')
+            f.write(_json_dumps_pretty(result.scan_metadata, 1))
+            f.write(b',\n  "recommendations": [')
+            separator = b"\n    "
+            for record in records:
+                f.write(separator)
+                f.write(_json_dumps_pretty(record, 2))
+                separator = b",\n    "
+            f.write(b"]" if separator == b"\n    " else b"\n  ]")
+            f.write(b',\n  "summary": ')
+            f.write(_json_dumps_pretty(summary, 1))
+            f.write(b"\n}")
 
     @staticmethod
     def _summarize(result: LifecycleResult) -> Dict[str, Any]:
         """Generate summary statistics."""
-        counts: Dict[str, int] = {}
-        high_confidence = 0
-        medium_confidence = 0
-        low_confidence = 0
-
-        for r in result.recommendations:
-            counts[r.recommendation] = counts.get(r.recommendation, 0) + 1
-            if r.confidence >= 0.8:
-                high_confidence += 1
-            elif r.confidence >= 0.6:
-                medium_confidence += 1
-            else:
-                low_confidence += 1
+        recs = result.recommendations
+        # C-level counting passes instead of a per-item Python loop
+        counts = dict(Counter(map(attrgetter("recommendation"), recs)))
+        confidences = list(map(attrgetter("confidence"), recs))
+        high_confidence = sum(map((0.8).__le__, confidences))
+        medium_confidence = sum(map((0.6).__le__, confidences)) - high_confidence
+        low_confidence = len(confidences) - high_confidence - medium_confidence
 
         return {
             "total_files": len(result.recommendations),
@@ -702,6 +1362,12 @@ Think BRIEFLY (max 3-4 sentences), then respond with EXACTLY ONE JSON object.
         }
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_llm_json_cached(raw_text: str) -> Optional[Dict[str, Any]]:
+    """Shared cache behind LifecycleClassifier._parse_llm_json (do not mutate)."""
+    return LifecycleClassifier._extract_llm_json(raw_text)
+
+
 def run_lifecycle_classification(
     index_path: Path,
     output_path: Path,
@@ -711,6 +1377,13 @@ def run_lifecycle_classification(
     use_llm: bool = False,  # V1.1+ parameter
     llm_mode: str = "full",  # V1.2 parameter
     llm_max_files: Optional[int] = None,  # V1.2 parameter
+    output_format: str = "json",
+    llm_concurrency: Optional[int] = None,
+    llm_batch_size: int = 1,
+    llm_model: Optional[str] = None,
+    llm_options: Optional[Dict[str, Any]] = None,
+    llm_structured_output: bool = True,
+    llm_cache_similar: bool = False,
 ) -> None:
     """
     Run lifecycle classification workflow (V1.2 hybrid-aware).
@@ -724,6 +1397,20 @@ def run_lifecycle_classification(
         use_llm: Enable LLM-enhanced classification (V1.1+)
         llm_mode: "full" or "hybrid" mode (V1.2)
         llm_max_files: Max LLM calls in hybrid mode (V1.2)
+        output_format: "json" or "ndjson" layout for the written results
+        llm_concurrency: Max parallel LLM requests (None = $CODEWIKI_LLM_CONCURRENCY or 8)
+        llm_batch_size: Files per LLM prompt (1 = one prompt per file)
+        llm_model: Model override for LLM requests (None = provider's model).
+            Classification is a short-context pick among four labels, so a
+            4-bit quant (e.g. "llama3.2:3b-instruct-q4_K_M") decodes ~2-3x
+            faster than FP16/Q8 with little accuracy loss on this task; check
+            results against a larger model before switching a whole repo.
+        llm_options: Ollama-style options for LLM requests. Small num_ctx and
+            num_predict (e.g. 1024 / 128) bound KV-cache size and decode
+            length; note reasoning models need a larger num_predict.
+        llm_structured_output: Constrain LLM output to LIFECYCLE_SCHEMA via the
+            provider's JSON schema mode (ignored by clients without it)
+        llm_cache_similar: Share one LLM answer per (kind, age bucket, top dir)
     """
     # Initialize LLM client if requested (V1.1+)
     # V2.0: Prefer LIR client for batching, concurrency, and thermal management
@@ -766,6 +1453,10 @@ def run_lifecycle_classification(
         if llm_client is None:
             logger.warning("No LLM client available, fallback to rules")
             use_llm = False
+        else:
+            # Load the model once and keep the shared system prompt cached
+            system_prompt = SYSTEM_PROMPT if llm_batch_size <= 1 else _BATCH_SYSTEM_PROMPT
+            llm_client.preload(system_prompt=system_prompt, keep_alive="30m", model=llm_model)
 
     classifier = LifecycleClassifier(
         index_path=index_path,
@@ -774,6 +1465,13 @@ def run_lifecycle_classification(
         confidence_threshold=confidence_threshold,
         llm_mode=llm_mode,
         llm_max_files=llm_max_files,
+        output_format=output_format,
+        llm_concurrency=llm_concurrency,
+        llm_batch_size=llm_batch_size,
+        llm_model=llm_model,
+        llm_options=llm_options,
+        llm_structured_output=llm_structured_output,
+        llm_cache_similar=llm_cache_similar,
     )
 
     print(f"📋 [code-wiki] Loading repo index from {index_path}...")
@@ -0,0 +1,65 @@
+"""
+Reader for lifecycle classification results (JSON or NDJSON).
+
+Kept free of the classifier/LLM stack (stdlib only, orjson when installed)
+so small tools like inspect_lifecycle_result can load results quickly, and
+can run as plain scripts.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# orjson is optional: faster parsing of large result files
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def read_lifecycle_file(
+    path: Path,
+) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Read lifecycle recommendations written in either JSON or NDJSON layout.
+
+    NDJSON is detected by a first line that parses on its own and carries no
+    "recommendations" key; its records are then yielded lazily, one per line,
+    so callers can aggregate large results without holding them all.
+
+    Args:
+        path: Path to lifecycle_recommendations.json
+
+    Returns:
+        (header, recommendations) where header holds scan_metadata/summary
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON or NDJSON
+    """
+    with path.open("rb") as f:
+        first_line = f.readline()
+
+    try:
+        header = _json_loads(first_line)
+    except ValueError:
+        header = None
+
+    if isinstance(header, dict) and "recommendations" not in header:
+        return header, _iter_ndjson_records(path)
+
+    data = header if isinstance(header, dict) else _json_loads(path.read_bytes())
+    records = data.pop("recommendations", [])
+    return data, iter(records)
+
+
+def _iter_ndjson_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield recommendation records from an NDJSON file, skipping the header."""
+    with path.open("rb") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield _json_loads(line)
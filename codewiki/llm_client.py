@@ -13,17 +13,172 @@ Design (following architect guidance):
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
-from dataclasses import dataclass
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: faster parsing of provider responses and config
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# httpx is optional: HTTP/2 multiplexing for cloud providers (CODEWIKI_HTTP2=1)
+try:
+    import httpx
+
+    HAS_HTTPX = True
+except ImportError:
+    httpx = None
+    HAS_HTTPX = False
+
+# Healthy probe results are reused for this long, in-process and across runs
+_HEALTH_TTL_SECONDS = 300
+
+# generate() results memoized per client (LRU); only low-temperature requests
+_RESULT_CACHE_SIZE = 1024
+_RESULT_CACHE_MAX_TEMPERATURE = 0.1
+
+
+def _cache_dir() -> Path:
+    """Per-user cache directory: $CODEWIKI_CACHE_DIR or $XDG_CACHE_HOME/codewiki."""
+    override = os.environ.get("CODEWIKI_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "codewiki"
+
+
+class _Http2Response:
+    """The requests.Response subset this client reads, over an httpx response."""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self.status_code = response.status_code
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    def iter_lines(self):
+        return self._response.iter_lines()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class _Http2Session:
+    """
+    requests.Session-like facade over httpx.Client(http2=True).
+
+    Concurrent generate_many() requests to an HTTPS provider share one
+    multiplexed connection (one TLS handshake, HPACK headers) instead of
+    one socket each. Plain-HTTP local servers negotiate HTTP/1.1 as usual.
+    Rate-limit and gateway-error retries are not applied on this transport.
+    """
+
+    def __init__(self):
+        self._client = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        )
+
+    def get(self, url: str, timeout: Optional[float] = None, headers=None) -> _Http2Response:
+        return _Http2Response(self._client.get(url, timeout=timeout, headers=headers))
+
+    def post(
+        self, url: str, json=None, headers=None, timeout: Optional[float] = None, stream=False
+    ) -> _Http2Response:
+        request = self._client.build_request(
+            "POST", url, json=json, headers=headers, timeout=timeout
+        )
+        return _Http2Response(self._client.send(request, stream=stream))
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def _make_session():
+    """
+    Pooled HTTP session shared by health checks and generate calls.
+
+    With CODEWIKI_HTTP2=1 and httpx[http2] installed this is an HTTP/2
+    client (_Http2Session); otherwise a requests.Session as described below.
+
+    Keep-alive reuses sockets (and TLS sessions for cloud providers) across
+    requests; rate limits (429) and transient gateway errors are retried on
+    the pooled connection, waiting for Retry-After when the server sends it
+    and a short backoff otherwise. The last response is returned as-is so
+    callers still see its status.
+    Refused connections and read timeouts are not retried: health checks of
+    a stopped provider must fail fast, and a re-sent generate would queue
+    the same work twice.
+    """
+    if os.environ.get("CODEWIKI_HTTP2") == "1":
+        if HAS_HTTPX:
+            try:
+                return _Http2Session()
+            except ImportError as e:  # httpx without the h2 package
+                logger.warning("HTTP/2 unavailable (%s), using requests", e)
+        else:
+            logger.warning("CODEWIKI_HTTP2=1 but httpx is not installed, using requests")
+
+    retry = Retry(
+        total=3,
+        connect=0,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Item markers in packed generate_batch() replies: "[1] ...", "[2] ..."
+_BATCH_ITEM_RE = re.compile(r"^\[(\d+)\]\s*", re.MULTILINE)
+
+# Provider-name hints for OpenAI-compatible APIs (one alternation scan)
+_OPENAI_NAME_RE = re.compile("studio|openai|anthropic|groq|together|replicate")
+
+# Detected API type -> generate implementation (anything else speaks OpenAI)
+_GENERATE_METHODS = {"ollama": "_generate_ollama", "openai": "_generate_openai"}
+
+# Ollama-style generate() options that OpenAI-compatible APIs accept as-is
+_OPENAI_OPTION_KEYS = frozenset({"temperature", "top_p", "seed", "stop"})
+
 
 @dataclass
 class ProviderConfig:
@@ -36,6 +191,14 @@ class ProviderConfig:
     model: Optional[str] = None
     api_type: Optional[str] = None  # 'ollama', 'openai', or None (auto-detect)
     api_key: Optional[str] = None  # API key or ${ENV_VAR} for expansion
+    supports_array_prompt: bool = False  # /v1/completions takes a list of prompts (vLLM)
+
+    # Derived once by LocalLLMClient._prepare_provider(), not configuration
+    detected_api_type: Optional[str] = field(default=None, repr=False, compare=False)
+    generate_url: Optional[str] = field(default=None, repr=False, compare=False)
+    health_url: Optional[str] = field(default=None, repr=False, compare=False)
+    completions_url: Optional[str] = field(default=None, repr=False, compare=False)
+    auth_headers: Optional[Dict[str, str]] = field(default=None, repr=False, compare=False)
 
 
 class LocalLLMClient:
@@ -52,6 +215,10 @@ class LocalLLMClient:
     - is_available() -> bool
     - generate(prompt, system_prompt) -> Optional[str]
     - get_usage_stats() -> Dict[str, Any]
+    - preload(system_prompt, keep_alive) -> bool (optional warm-up)
+    - generate_batch(prompts, system_prompt) -> List[Optional[str]] (optional)
+    - generate_many(prompts, system_prompt) -> List[Optional[str]] (optional)
+    - agenerate(...) / agenerate_many(...) (optional, for asyncio callers)
     """
 
     def __init__(self, config_path: Optional[Path] = None):
@@ -67,6 +234,21 @@ class LocalLLMClient:
         self.active: Optional[ProviderConfig] = None
         self._total_tokens = 0
         self._request_count = 0
+        # generate() may run on generate_many() worker threads
+        self._usage_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session = _make_session()
+        # "provider|base_url" -> time of last healthy probe (see health.json)
+        self._health_cache: Optional[Dict[str, float]] = None
+        self._health_cache_dirty = False
+        # Health probes run on pool threads and may outlive _first_healthy()
+        self._health_lock = threading.Lock()
+        # Request digest -> generated text, most recently used last
+        self._result_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+        # Set by preload(): keep the model resident and pin the system prompt prefix
+        self._keep_alive: Optional[str] = None
+        self._num_keep: Optional[int] = None
 
         self._load_providers()
         self._select_active_provider()
@@ -78,7 +260,14 @@ class LocalLLMClient:
         return self.active is not None
 
     def generate(
-        self, prompt: str, system_prompt: Optional[str] = None
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        *,
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
+        stop_substring: Optional[str] = None,
     ) -> Optional[str]:
         """
         Generate text using the active provider.
@@ -90,21 +279,329 @@ class LocalLLMClient:
         Args:
             prompt: User prompt
             system_prompt: Optional system context
+            model: Override the provider's configured model for this request
+            options: Sampling/runtime options merged over the defaults, in
+                Ollama naming (temperature, num_predict, num_ctx, ...)
+            format: Constrained output: "json" or a JSON schema dict (Ollama
+                format / OpenAI response_format); None = free text
+            stop_substring: Ollama only: stop reading the stream once this
+                appears; the text up to and including it is returned
+
+        Identical low-temperature requests (<= 0.1, the default) are answered
+        from an in-process LRU of the last 1024 results without a new call.
 
         Returns:
             Generated text or None if generation fails
         """
+        text, fresh = self._generate(
+            prompt,
+            system_prompt,
+            model=model,
+            options=options,
+            format=format,
+            stop_substring=stop_substring,
+        )
+        if fresh:
+            self._update_usage_bulk([prompt], [text])
+        return text
+
+    def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        *,
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
+        stop_substring: Optional[str] = None,
+    ) -> Tuple[Optional[str], bool]:
+        """generate() without usage accounting: (text, True if a request was made)."""
         if not self.active:
+            return None, False
+
+        self._prepare_provider(self.active)
+        key = self._result_key(prompt, system_prompt, model, options, format, stop_substring)
+        if key is not None:
+            with self._usage_lock:
+                text = self._result_cache.get(key)
+                if text is not None:
+                    self._result_cache.move_to_end(key)
+                    return text, False
+
+        # Resolved by name so per-instance overrides (tests, subclasses) apply
+        backend = getattr(
+            self, _GENERATE_METHODS.get(self.active.detected_api_type, "_generate_openai")
+        )
+        text = backend(
+            prompt,
+            system_prompt,
+            model=model,
+            options=options,
+            format=format,
+            stop_substring=stop_substring,
+        )
+
+        if key is not None and text is not None:
+            with self._usage_lock:
+                self._result_cache[key] = text
+                if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        return text, text is not None
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        batch_size: int = 8,
+        per_item_tokens: int = 500,
+    ) -> List[Optional[str]]:
+        """
+        Answer several independent prompts with one request per batch_size.
+
+        Prompts are packed as "[1] ...", "[2] ..." into a single user prompt
+        and the reply is split on the same markers, so N prompts cost N/b
+        round-trips and system-prompt prefills instead of N. Usage accounting
+        is per HTTP request; token estimates cover the packed prompt.
+
+        Args:
+            prompts: Independent user prompts
+            system_prompt: Optional system context shared by every prompt
+            batch_size: Prompts per request (1 = plain generate() per prompt)
+            per_item_tokens: Output budget per prompt (num_predict/max_tokens
+                is set to batch size × this)
+
+        Returns:
+            One answer per prompt, in order (None if missing from the reply
+            or the request failed)
+        """
+        batch_size = max(1, batch_size)
+        if batch_size == 1:
+            return [self.generate(p, system_prompt) for p in prompts]
+
+        answers: List[Optional[str]] = []
+        for start in range(0, len(prompts), batch_size):
+            batch = prompts[start : start + batch_size]
+            if len(batch) == 1:
+                answers.append(self.generate(batch[0], system_prompt))
+                continue
+            packed = "Answer each item independently. Start each answer with its [number].\n" + (
+                "\n".join(f"[{n}] {p}" for n, p in enumerate(batch, 1))
+            )
+            text = self.generate(
+                packed,
+                system_prompt,
+                options={"num_predict": len(batch) * per_item_tokens},
+            )
+            answers.extend(self._split_batch_reply(text, len(batch)))
+        return answers
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        *,
+        system_prompts: Optional[List[Optional[str]]] = None,
+    ) -> List[Optional[str]]:
+        """
+        Run independent generate() calls concurrently.
+
+        All requests are submitted before any result is awaited, so for M
+        prompts and W workers wall time is ~M/W request latencies. Workers
+        come from $CODEWIKI_LLM_CONCURRENCY (default 8); the pool is created
+        on first use and shut down by close().
+
+        Providers configured with supports_array_prompt (vLLM-style OpenAI
+        servers) get all prompts in one /v1/completions request instead, so
+        the server batches them on the GPU; if that request fails, the
+        concurrent path below is used.
+
+        With per-prompt system_prompts, requests are submitted grouped by
+        system prompt, so the server sees each prefix back-to-back and can
+        reuse its prefill KV-cache. On Ollama the model is also kept resident
+        (keep_alive 30m, unless preload() already chose a value).
+
+        Args:
+            prompts: Independent user prompts
+            system_prompt: System context shared by every prompt
+            system_prompts: One system prompt per prompt (overrides system_prompt)
+
+        Returns:
+            One answer per prompt, in order (None where generation failed)
+        """
+        if system_prompts is None:
+            system_prompts = [system_prompt] * len(prompts)
+        elif len(system_prompts) != len(prompts):
+            raise ValueError("system_prompts must have one entry per prompt")
+
+        if len(prompts) <= 1:
+            return [self.generate(p, s) for p, s in zip(prompts, system_prompts)]
+        if self.active and self.active.supports_array_prompt:
+            self._prepare_provider(self.active)
+            if self.active.completions_url:
+                texts = self._generate_openai_array(prompts, system_prompts)
+                if texts is not None:
+                    return texts
+        if self.active and self._keep_alive is None:
+            self._prepare_provider(self.active)
+            if self.active.detected_api_type == "ollama":
+                self._keep_alive = "30m"
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, int(os.getenv("CODEWIKI_LLM_CONCURRENCY", "8"))),
+                thread_name_prefix="codewiki-llm",
+            )
+        # Stable sort: identical system prompts are dequeued contiguously
+        order = sorted(range(len(prompts)), key=lambda i: hash(system_prompts[i]))
+        futures: List[Any] = [None] * len(prompts)
+        for i in order:
+            futures[i] = self._executor.submit(self._generate, prompts[i], system_prompts[i])
+        results = [f.result() for f in futures]
+
+        # One usage update for the whole fan-out instead of one per worker
+        fresh = [i for i, (_, made_request) in enumerate(results) if made_request]
+        self._update_usage_bulk([prompts[i] for i in fresh], [results[i][0] for i in fresh])
+        return [text for text, _ in results]
+
+    async def agenerate(
+        self, prompt: str, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> Optional[str]:
+        """
+        Awaitable generate() for callers already running an event loop.
+
+        The blocking request runs in the default executor thread, so the loop
+        stays responsive; keyword arguments are passed through to generate().
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt, **kwargs)
+
+    async def agenerate_many(
+        self, prompts: List[str], system_prompt: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """
+        Awaitable generate_many(): up to $CODEWIKI_LLM_CONCURRENCY (default 8)
+        requests in flight, results in input order.
+        """
+        limit = asyncio.Semaphore(max(1, int(os.getenv("CODEWIKI_LLM_CONCURRENCY", "8"))))
+
+        async def one(prompt: str) -> Optional[str]:
+            async with limit:
+                return await self.agenerate(prompt, system_prompt)
+
+        return list(await asyncio.gather(*(one(p) for p in prompts)))
+
+    def close(self) -> None:
+        """Shut down the generate_many() worker pool and pooled connections."""
+        self._save_health_cache()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._session.close()
+
+    def __enter__(self) -> "LocalLLMClient":
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit"""
+        self.close()
+
+    def _result_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: Optional[str],
+        options: Optional[Dict[str, Any]],
+        format: Optional[Any],
+        stop_substring: Optional[str],
+    ) -> Optional[bytes]:
+        """Digest identifying a generate() request, or None if it is not cacheable."""
+        temperature = options.get("temperature", 0) if options else 0
+        # Non-numeric (e.g. None from an empty YAML key) leaves sampling to the
+        # server default, so the reply may vary: don't cache it
+        if (
+            not isinstance(temperature, (int, float))
+            or temperature > _RESULT_CACHE_MAX_TEMPERATURE
+        ):
             return None
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (
+            self.active.provider,
+            self.active.base_url,
+            model or self.active.model or "",
+            json.dumps(options, sort_keys=True, default=str) if options else "",
+            json.dumps(format, sort_keys=True, default=str) if format else "",
+            stop_substring or "",
+            system_prompt or "",
+            prompt,
+        ):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.digest()
+
+    @staticmethod
+    def _split_batch_reply(text: Optional[str], count: int) -> List[Optional[str]]:
+        """Split an "[n] answer" reply into count answers (None where missing)."""
+        answers: List[Optional[str]] = [None] * count
+        if not text:
+            return answers
+        parts = _BATCH_ITEM_RE.split(text)
+        # parts = [preamble, n1, answer1, n2, answer2, ...]
+        for number, answer in zip(parts[1::2], parts[2::2]):
+            index = int(number) - 1
+            if 0 <= index < count and answers[index] is None:
+                answers[index] = answer.strip()
+        return answers
+
+    def preload(
+        self,
+        system_prompt: Optional[str] = None,
+        keep_alive: str = "30m",
+        model: Optional[str] = None,
+    ) -> bool:
+        """
+        Warm the active provider for a run that reuses one system prompt.
+
+        Ollama: loads the model and keeps it resident for keep_alive; later
+        generate() calls send the same keep_alive plus num_keep sized to the
+        system prompt, so its KV-cache prefix is retained across requests.
+        OpenAI-compatible servers have no equivalent API (no-op).
+
+        Args:
+            system_prompt: System prompt that subsequent requests will share
+            keep_alive: How long Ollama keeps the model loaded (e.g. "30m")
+            model: Model to load (None = provider's configured model)
+
+        Returns:
+            True if the provider was warmed
+        """
+        if not self.active:
+            return False
+
+        self._prepare_provider(self.active)
+        if self.active.detected_api_type != "ollama":
+            return False
 
-        # Detect and cache API type for this provider
-        if not hasattr(self.active, '_detected_api_type'):
-            self.active._detected_api_type = self._detect_api_type(self.active)
+        self._keep_alive = keep_alive
+        # Rough token estimate (~4 chars/token), same as usage accounting
+        self._num_keep = len(system_prompt) // 4 if system_prompt else None
 
-        if self.active._detected_api_type == "ollama":
-            return self._generate_ollama(prompt, system_prompt)
-        else:  # openai format
-            return self._generate_openai(prompt, system_prompt)
+        try:
+            # Empty prompt: Ollama loads the model without generating
+            payload: Dict[str, Any] = {
+                "model": model or self.active.model or "qwen3:8b",
+                "prompt": "",
+                "stream": False,
+                "keep_alive": keep_alive,
+            }
+            resp = self._session.post(
+                self.active.generate_url,
+                json=payload,
+                headers=self.active.auth_headers,
+                timeout=60,
+            )
+            return resp.status_code == 200
+        except Exception as e:
+            logger.debug(f"Ollama preload failed: {e}")
+            return False
 
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get usage statistics across all requests"""
@@ -128,7 +625,7 @@ class LocalLLMClient:
         2. Dict: {"providers": [{"provider": "ollama", ...}, ...]}
         """
         try:
-            data = json.loads(self.config_path.read_text(encoding="utf-8"))
+            data = _json_loads(self.config_path.read_bytes())
 
             # Handle both formats
             if isinstance(data, dict) and "providers" in data:
@@ -143,7 +640,7 @@ class LocalLLMClient:
 
                 # Load all enabled providers (no filtering by type)
                 self.providers.append(
-                    ProviderConfig(
+                    self._prepare_provider(ProviderConfig(
                         provider=item["provider"],
                         base_url=item["base_url"],
                         priority=int(item.get("priority", 1)),
@@ -156,7 +653,8 @@ class LocalLLMClient:
                         ),
                         api_type=item.get("api_type"),
                         api_key=item.get("api_key"),
-                    )
+                        supports_array_prompt=bool(item.get("supports_array_prompt", False)),
+                    ))
                 )
 
         except Exception as e:
@@ -169,8 +667,8 @@ class LocalLLMClient:
 
         Strategy:
         1. Sort by priority (lower number = higher priority)
-        2. Try each enabled provider
-        3. First healthy provider becomes active
+        2. Probe all enabled providers in parallel
+        3. First healthy provider (by priority) becomes active
         4. If none available, active remains None
         """
         # Sort by priority, lowest number first
@@ -179,18 +677,79 @@ class LocalLLMClient:
             key=lambda p: p.priority,
         )
 
-        for provider in candidates:
-            if self._check_provider_health(provider):
-                self.active = provider
-                logger.info(
-                    f"[LocalLLM] Active provider: {provider.provider} "
-                    f"({provider.base_url}, model={provider.model})"
-                )
-                return
+        provider = self._first_healthy(candidates)
+        self._save_health_cache()
+        if provider is not None:
+            self.active = provider
+            logger.info(
+                f"[LocalLLM] Active provider: {provider.provider} "
+                f"({provider.base_url}, model={provider.model})"
+            )
+            return
 
         logger.warning("[LocalLLM] No available LLM providers found")
         self.active = None
 
+    def _first_healthy(self, candidates: List[ProviderConfig]) -> Optional[ProviderConfig]:
+        """
+        Probe candidates in parallel; return the first healthy one by priority.
+
+        Results are consumed in priority order, so selection finishes as soon
+        as every higher-priority probe has failed and one has succeeded; a
+        slow or unreachable lower-priority provider is not waited for.
+        """
+        if len(candidates) <= 1:
+            return next((p for p in candidates if self._check_provider_health(p)), None)
+
+        # Load before any probe thread starts so they all share one dict
+        self._load_health_cache()
+        pool = ThreadPoolExecutor(
+            max_workers=len(candidates), thread_name_prefix="codewiki-health"
+        )
+        try:
+            futures = [pool.submit(self._check_provider_health, p) for p in candidates]
+            for provider, future in zip(candidates, futures):
+                if future.result():
+                    return provider
+            return None
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _prepare_provider(self, provider: ProviderConfig) -> ProviderConfig:
+        """
+        Fill a provider's derived fields (API type, URLs, auth headers) once.
+
+        Runs at load time; providers assigned directly (e.g. tests setting
+        client.active) are prepared on first use.
+        """
+        if provider.generate_url is not None:
+            return provider
+
+        api_type = self._detect_api_type(provider)
+        base_url = provider.base_url.rstrip("/")
+        completions_url = None
+        if api_type == "ollama":
+            generate_url = f"{base_url}/api/generate"
+            health_url = f"{base_url}/api/tags"
+        else:
+            # Handle base_url that may or may not include /v1
+            api_root = base_url if base_url.endswith("/v1") else f"{base_url}/v1"
+            generate_url = f"{api_root}/chat/completions"
+            health_url = f"{api_root}/models"
+            completions_url = f"{api_root}/completions"
+
+        headers: Dict[str, str] = {}
+        api_key = self._resolve_api_key(provider)
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        provider.detected_api_type = api_type
+        provider.health_url = health_url
+        provider.completions_url = completions_url
+        provider.auth_headers = headers
+        provider.generate_url = generate_url  # set last: marks provider prepared
+        return provider
+
     def _resolve_api_key(self, provider: ProviderConfig) -> Optional[str]:
         """
         Resolve API key from config or environment variable.
@@ -248,7 +807,7 @@ class LocalLLMClient:
             return "ollama"
         
         # Known OpenAI-compatible providers
-        if any(name in provider_lower for name in ["studio", "openai", "anthropic", "groq", "together", "replicate"]):
+        if _OPENAI_NAME_RE.search(provider_lower):
             return "openai"
         
         # Default to OpenAI format (more common for cloud/custom endpoints)
@@ -264,59 +823,109 @@ class LocalLLMClient:
         Args:
             provider: Provider configuration
 
+        A healthy result is cached for _HEALTH_TTL_SECONDS (persisted to
+        health.json in the cache directory), so repeated CLI runs skip the
+        probe; failures are never cached, a provider that just came up is
+        picked on the next run.
+
         Returns:
             True if provider responds to health check
         """
+        key = f"{provider.provider}|{provider.base_url}"
+        cache = self._load_health_cache()
+        checked_at = cache.get(key)
+        if checked_at is not None and time.time() - checked_at < _HEALTH_TTL_SECONDS:
+            return True
+
         try:
-            base_url = provider.base_url.rstrip("/")
-            api_type = self._detect_api_type(provider)
-            
-            # Prepare headers for authentication
-            headers = {}
-            api_key = self._resolve_api_key(provider)
-            if api_key:
-                headers["Authorization"] = f"Bearer {api_key}"
-
-            if api_type == "ollama":
-                # Ollama health check: GET /api/tags
-                resp = requests.get(f"{base_url}/api/tags", timeout=3, headers=headers)
-                return resp.status_code == 200
-            else:
-                # OpenAI-compatible health check: GET /v1/models
-                # Handle base_url that may or may not include /v1
-                if base_url.endswith("/v1"):
-                    health_url = f"{base_url}/models"
-                else:
-                    health_url = f"{base_url}/v1/models"
-                resp = requests.get(health_url, timeout=3, headers=headers)
-                return resp.status_code == 200
+            # Ollama: GET /api/tags, OpenAI-compatible: GET /v1/models
+            self._prepare_provider(provider)
+            resp = self._session.get(
+                provider.health_url, timeout=3, headers=provider.auth_headers
+            )
+            ok = resp.status_code == 200
 
         except Exception as e:
             logger.debug(f"Health check failed for {provider.provider}: {e}")
             return False
 
+        with self._health_lock:
+            if ok:
+                cache[key] = time.time()
+                self._health_cache_dirty = True
+            else:
+                cache.pop(key, None)
+        return ok
+
+    def _load_health_cache(self) -> Dict[str, float]:
+        """Load persisted health results once per client (empty if unreadable)."""
+        with self._health_lock:
+            if self._health_cache is None:
+                try:
+                    data = _json_loads((_cache_dir() / "health.json").read_bytes())
+                    self._health_cache = {
+                        str(k): float(v)
+                        for k, v in data.items()
+                        if isinstance(v, (int, float))
+                    }
+                except (OSError, ValueError, AttributeError):
+                    self._health_cache = {}
+            return self._health_cache
+
+    def _save_health_cache(self) -> None:
+        """Persist health results if they changed (atomic replace, best effort)."""
+        # Snapshot under the lock: late probes from _first_healthy() may
+        # still be writing to the cache
+        with self._health_lock:
+            if not self._health_cache_dirty or self._health_cache is None:
+                return
+            snapshot = list(self._health_cache.items())
+            self._health_cache_dirty = False
+        now = time.time()
+        live = {k: ts for k, ts in snapshot if now - ts < _HEALTH_TTL_SECONDS}
+        try:
+            cache_dir = _cache_dir()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_dir / f"health.json.{os.getpid()}.tmp"
+            tmp_path.write_text(json.dumps(live, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, cache_dir / "health.json")
+        except OSError as e:
+            self._health_cache_dirty = True  # retry on the next save
+            logger.debug(f"Could not persist LLM health cache: {e}")
+
     # --------- Provider-specific generate implementations ---------
 
     def _generate_ollama(
-        self, prompt: str, system_prompt: Optional[str]
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
+        stop_substring: Optional[str] = None,
     ) -> Optional[str]:
         """
         Generate text using Ollama API.
 
+        The response is streamed (NDJSON chunks) so reading overlaps with
+        generation, and stops early at "done" or at stop_substring.
+
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
+            model: Optional model override
+            options: Optional Ollama options merged over the defaults
+            format: Optional "json" or JSON schema constraining the output
+            stop_substring: Optional text after which reading stops
 
         Returns:
             Generated text or None if error
         """
         try:
-            base_url = self.active.base_url.rstrip("/")
-
             payload: Dict[str, Any] = {
-                "model": self.active.model or "qwen3:8b",
+                "model": model or self.active.model or "qwen3:8b",
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": 0.1,  # Temperature controlled in code, not config (source of truth)
                     "num_predict": 500,  # Max tokens for JSON response
@@ -325,28 +934,68 @@ class LocalLLMClient:
 
             if system_prompt:
                 payload["system"] = system_prompt
-
-            resp = requests.post(
-                f"{base_url}/api/generate",
+            if self._keep_alive:
+                payload["keep_alive"] = self._keep_alive
+            if self._num_keep:
+                payload["options"]["num_keep"] = self._num_keep
+            if options:
+                payload["options"].update(options)
+            if format:
+                payload["format"] = format
+
+            resp = self._session.post(
+                self.active.generate_url,
                 json=payload,
+                headers=self.active.auth_headers,
                 timeout=60,
+                stream=True,
             )
+            try:
+                if resp.status_code != 200:
+                    logger.error(f"Ollama error {resp.status_code}: {resp.text}")
+                    return None
+                text = self._read_ollama_stream(resp, stop_substring)
+            finally:
+                # Releases the connection, also when stopping mid-stream
+                resp.close()
 
-            if resp.status_code != 200:
-                logger.error(f"Ollama error {resp.status_code}: {resp.text}")
-                return None
-
-            data = resp.json()
-            text = data.get("response", "")
-            self._update_usage(prompt, text)
             return text
 
         except Exception as e:
             logger.error(f"Ollama generate error: {e}")
             return None
 
+    @staticmethod
+    def _read_ollama_stream(resp: requests.Response, stop_substring: Optional[str]) -> str:
+        """Concatenate streamed "response" chunks until done or stop_substring."""
+        parts: List[str] = []
+        tail = ""  # last len(stop_substring) - 1 chars, for matches across chunks
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            chunk = _json_loads(line)
+            piece = chunk.get("response", "")
+            if piece:
+                if stop_substring:
+                    window = tail + piece
+                    found = window.find(stop_substring)
+                    if found != -1:
+                        parts.append(window[len(tail) : found + len(stop_substring)])
+                        break
+                    tail = window[-(len(stop_substring) - 1) :] if len(stop_substring) > 1 else ""
+                parts.append(piece)
+            if chunk.get("done"):
+                break
+        return "".join(parts)
+
     def _generate_openai(
-        self, prompt: str, system_prompt: Optional[str]
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
+        stop_substring: Optional[str] = None,
     ) -> Optional[str]:
         """
         Generate text using OpenAI-compatible API.
@@ -356,37 +1005,52 @@ class LocalLLMClient:
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
+            model: Optional model override
+            options: Optional Ollama-style options; temperature, top_p, seed
+                and stop pass through, num_predict maps to max_tokens, the
+                rest (e.g. num_ctx) have no OpenAI equivalent and are ignored
+            format: Optional "json" (json_object) or JSON schema (json_schema)
+                sent as response_format
+            stop_substring: Accepted for a uniform signature; ignored (the
+                response is not streamed)
 
         Returns:
             Generated text or None if error
         """
         try:
-            base_url = self.active.base_url.rstrip("/")
-            # Handle base_url that may or may not include /v1
-            if base_url.endswith("/v1"):
-                url = f"{base_url}/chat/completions"
-            else:
-                url = f"{base_url}/v1/chat/completions"
-
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
+            user_message = {"role": "user", "content": prompt}
+            messages = (
+                [{"role": "system", "content": system_prompt}, user_message]
+                if system_prompt
+                else [user_message]
+            )
 
             payload: Dict[str, Any] = {
-                "model": self.active.model or "gpt-3.5-turbo",
+                "model": model or self.active.model or "gpt-3.5-turbo",
                 "messages": messages,
                 "temperature": 0.1,  # Temperature controlled in code, not config (source of truth)
                 "max_tokens": 1000,  # Sufficient for instruct models; use 2500+ for reasoning models
             }
-
-            # Add authentication header if API key is configured
-            headers = {}
-            api_key = self._resolve_api_key(self.active)
-            if api_key:
-                headers["Authorization"] = f"Bearer {api_key}"
-
-            resp = requests.post(url, json=payload, headers=headers, timeout=60)
+            if options:
+                for key in _OPENAI_OPTION_KEYS.intersection(options):
+                    payload[key] = options[key]
+                if "num_predict" in options:
+                    payload["max_tokens"] = options["num_predict"]
+            if isinstance(format, dict):
+                payload["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {"name": "response", "schema": format},
+                }
+            elif format == "json":
+                payload["response_format"] = {"type": "json_object"}
+
+            # Authorization header (if an API key is configured) is precomputed
+            resp = self._session.post(
+                self.active.generate_url,
+                json=payload,
+                headers=self.active.auth_headers,
+                timeout=60,
+            )
 
             if resp.status_code != 200:
                 logger.error(
@@ -394,19 +1058,67 @@ class LocalLLMClient:
                 )
                 return None
 
-            data = resp.json()
+            data = _json_loads(resp.content)
             choice = data.get("choices", [{}])[0]
             text = choice.get("message", {}).get("content", "")
-            self._update_usage(prompt, text)
             return text
 
         except Exception as e:
             logger.error(f"{self.active.provider} generate error: {e}")
             return None
 
-    def _update_usage(self, prompt: str, text: str) -> None:
-        """Update usage statistics after successful generation"""
-        self._request_count += 1
+    def _generate_openai_array(
+        self, prompts: List[str], system_prompts: List[Optional[str]]
+    ) -> Optional[List[Optional[str]]]:
+        """
+        Answer all prompts with one /v1/completions request ("prompt": [...]).
+
+        The completions API has no system role, so each system prompt is
+        prepended to its prompt. Usage counts one request.
+
+        Returns:
+            One answer per prompt, in order, or None if the request failed
+        """
+        texts: List[Optional[str]] = [None] * len(prompts)
+        try:
+            payload = {
+                "model": self.active.model or "gpt-3.5-turbo",
+                "prompt": [
+                    f"{system}\n\n{prompt}" if system else prompt
+                    for prompt, system in zip(prompts, system_prompts)
+                ],
+                "temperature": 0.1,
+                "max_tokens": 1000,
+            }
+            resp = self._session.post(
+                self.active.completions_url,
+                json=payload,
+                headers=self.active.auth_headers,
+                timeout=60 + 10 * len(prompts),
+            )
+            if resp.status_code != 200:
+                logger.warning(
+                    f"{self.active.provider} batch completions error {resp.status_code}, "
+                    "falling back to concurrent requests"
+                )
+                return None
+
+            for n, choice in enumerate(_json_loads(resp.content).get("choices", [])):
+                index = choice.get("index", n)
+                if 0 <= index < len(texts):
+                    texts[index] = choice.get("text")
+        except Exception as e:
+            logger.warning(f"{self.active.provider} batch completions failed: {e}")
+            return None
+
+        answered = [t for t in texts if t is not None]
+        self._update_usage_bulk(["".join(payload["prompt"])], ["".join(answered)])
+        return texts
+
+    def _update_usage_bulk(self, prompts: List[str], texts: List[str]) -> None:
+        """Update usage statistics after successful generations, under one lock"""
         # Estimate tokens: ~1 token per 4 characters (rough approximation)
-        tokens = (len(prompt) + len(text)) // 4
-        self._total_tokens += tokens
+        tokens = (sum(map(len, prompts)) + sum(map(len, texts))) // 4
+        with self._usage_lock:
+            self._request_count += len(prompts)
+            self._total_tokens += tokens
@@ -14,9 +14,17 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +37,80 @@ except ImportError as e:
     logger.warning("LIR not available: %s. Install with: pip install -e ../lir", e)
 
 
+# tiktoken is optional: real token counts in usage stats (~4 chars/token otherwise)
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    tiktoken = None
+    HAS_TIKTOKEN = False
+
+# Usage texts buffered before one batched tokenizer call
+_USAGE_FLUSH_THRESHOLD = 256
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding():
+    """cl100k_base encoding, loaded once (None if unavailable, e.g. offline)."""
+    if not HAS_TIKTOKEN:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.debug("tiktoken encoding unavailable, estimating tokens: %s", e)
+        return None
+
+
+# Responses to near-deterministic requests are persisted across runs; entries
+# expire after a week and the newest _CACHE_MAX_ROWS are kept (pruned on open)
+_CACHE_MAX_TEMPERATURE = 0.2
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_CACHE_MAX_ROWS = 10_000
+
+
+# One SyncLIRClient per (policy, URLs, models, config_path), shared by every
+# LIRLocalLLMClient built with the same settings so its HTTP connections and
+# batching queue are reused; closed when the last holder releases it.
+_shared_clients: Dict[Tuple[Any, ...], List[Any]] = {}  # key -> [client, holders]
+_shared_lock = threading.Lock()
+
+
+def _acquire_lir_client(key: Tuple[Any, ...]) -> "SyncLIRClient":
+    """Return the shared SyncLIRClient for key, creating it on first use."""
+    with _shared_lock:
+        slot = _shared_clients.get(key)
+        if slot is None:
+            policy, config_path, ollama_url, lmstudio_url, ollama_model, lmstudio_model = key
+            client = SyncLIRClient(
+                policy=policy,
+                config_path=config_path,
+                ollama_url=ollama_url,
+                lmstudio_url=lmstudio_url,
+                ollama_model=ollama_model,
+                lmstudio_model=lmstudio_model,
+            )
+            slot = _shared_clients[key] = [client, 0]
+        slot[1] += 1
+        return slot[0]
+
+
+def _release_lir_client(key: Tuple[Any, ...]) -> None:
+    """Drop one holder of the shared client for key; close it after the last."""
+    with _shared_lock:
+        slot = _shared_clients.get(key)
+        if slot is None:
+            return
+        slot[1] -= 1
+        if slot[1] > 0:
+            return
+        del _shared_clients[key]
+    try:
+        slot[0].close()
+    except Exception as e:
+        logger.warning("Error closing LIR client: %s", e)
+
+
 class LIRLocalLLMClient:
     """
     LIR-based LLM client compatible with existing LocalLLMClient interface.
@@ -37,6 +119,7 @@ class LIRLocalLLMClient:
     - is_available() -> bool
     - generate(prompt, system_prompt) -> Optional[str]
     - get_usage_stats() -> Dict[str, Any]
+    - generate_many(prompts, system_prompt) / agenerate(...) / agenerate_many(...)
     
     But uses LIR for:
     - Automatic batching
@@ -67,6 +150,7 @@ class LIRLocalLLMClient:
         """
         self.policy = policy
         self._client: Optional[SyncLIRClient] = None
+        self._client_key_held: Optional[Tuple[Any, ...]] = None
         
         # Load provider config if not explicitly provided
         if not all([ollama_url, lmstudio_url, ollama_model, lmstudio_model]):
@@ -88,9 +172,17 @@ class LIRLocalLLMClient:
             "config_path": config_path,
         }
         
-        # Track usage stats
+        # Track usage stats (generate() may run on generate_many() worker threads).
+        # Prompt/response texts are tokenized in batches, see _flush_usage().
         self._request_count = 0
         self._total_tokens = 0
+        self._pending_usage: List[str] = []
+        self._usage_lock = threading.Lock()
+
+        # Persistent response cache (llm_cache.db), opened on first use
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
+        self._cache_enabled = os.environ.get("CODEWIKI_LLM_NOCACHE") != "1"
         
         # Initialize client
         self._init_client()
@@ -153,26 +245,32 @@ class LIRLocalLLMClient:
             logger.error("Failed to load provider config: %s", e)
             return {}
     
+    def _client_key(self) -> Tuple[Any, ...]:
+        """Settings identifying the shared SyncLIRClient this instance uses."""
+        return (
+            self.policy,
+            self._config.get("config_path"),
+            self._config["ollama_url"],
+            self._config["lmstudio_url"],
+            self._config["ollama_model"],
+            self._config["lmstudio_model"],
+        )
+
     def _init_client(self) -> None:
-        """Initialize LIR client"""
+        """Initialize LIR client (shared with instances using the same settings)"""
         if not HAS_LIR:
             logger.warning("LIR not available, client will not work")
             return
         
         try:
-            self._client = SyncLIRClient(
-                policy=self.policy,
-                config_path=self._config.get("config_path"),
-                ollama_url=self._config["ollama_url"],
-                lmstudio_url=self._config["lmstudio_url"],
-                ollama_model=self._config["ollama_model"],
-                lmstudio_model=self._config["lmstudio_model"],
-            )
+            self._client_key_held = self._client_key()
+            self._client = _acquire_lir_client(self._client_key_held)
             logger.info("LIR client initialized (policy=%s, lmstudio=%s, ollama=%s)", 
                        self.policy, self._config["lmstudio_url"], self._config["ollama_url"])
         except Exception as e:
             logger.error("Failed to initialize LIR client: %s", e)
             self._client = None
+            self._client_key_held = None
     
     def is_available(self) -> bool:
         """
@@ -196,6 +294,10 @@ class LIRLocalLLMClient:
         system_prompt: Optional[str] = None,
         temperature: float = 0.1,
         max_tokens: int = 1000,
+        *,
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
     ) -> Optional[str]:
         """
         Generate text using LIR.
@@ -207,6 +309,17 @@ class LIRLocalLLMClient:
             system_prompt: Optional system context
             temperature: Sampling temperature (default: 0.1)
             max_tokens: Maximum tokens to generate (default: 1000, sufficient for instruct models; use 2500+ for reasoning models)
+            model: Accepted for interface compatibility; LIR routes models itself
+            options: Ollama-style options; temperature and num_predict
+                override the arguments above, others are ignored
+            format: Accepted for interface compatibility; LIR does not
+                constrain output, callers still parse free text
+            
+        Requests with temperature <= 0.2 are answered from a persistent
+        cache (llm_cache.db in the codewiki cache directory) when the same
+        models, sampling settings and prompts were seen within the last
+        week, on this or an earlier run. Set CODEWIKI_LLM_NOCACHE=1 to
+        bypass it.
             
         Returns:
             Generated text or None if failed
@@ -215,6 +328,23 @@ class LIRLocalLLMClient:
             logger.warning("LIR not available, returning None")
             return None
         
+        if options:
+            temperature = options.get("temperature", temperature)
+            max_tokens = options.get("num_predict", max_tokens)
+
+        key = None
+        # Non-numeric (e.g. None from an empty YAML key) leaves sampling to the
+        # backend default, so the reply may vary: don't cache it
+        if (
+            self._cache_enabled
+            and isinstance(temperature, (int, float))
+            and temperature <= _CACHE_MAX_TEMPERATURE
+        ):
+            key = self._cache_key(prompt, system_prompt, temperature, max_tokens)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
         try:
             result = self._client.generate(
                 prompt=prompt,
@@ -224,9 +354,14 @@ class LIRLocalLLMClient:
             )
             
             if result:
-                self._request_count += 1
-                # Estimate tokens (rough approximation)
-                self._total_tokens += (len(prompt) + len(result)) // 4
+                with self._usage_lock:
+                    self._request_count += 1
+                    self._pending_usage += (prompt, result)
+                    flush = len(self._pending_usage) >= _USAGE_FLUSH_THRESHOLD
+                if flush:
+                    self._flush_usage()
+                if key is not None:
+                    self._cache_put(key, result)
             
             return result
             
@@ -234,6 +369,194 @@ class LIRLocalLLMClient:
             logger.error("LIR generation failed: %s", e)
             return None
     
+    @staticmethod
+    def count_tokens(texts: List[str]) -> List[int]:
+        """
+        Token count per text: one batched tiktoken call (cl100k_base) when
+        tiktoken is installed, else the ~4 characters/token estimate.
+        """
+        encoding = _token_encoding()
+        if encoding is None:
+            return [len(text) // 4 for text in texts]
+        return [len(ids) for ids in encoding.encode_ordinary_batch(texts)]
+
+    def _flush_usage(self) -> None:
+        """Tokenize buffered prompt/response texts into the token total."""
+        with self._usage_lock:
+            texts, self._pending_usage = self._pending_usage, []
+        if texts:
+            tokens = sum(self.count_tokens(texts))
+            with self._usage_lock:
+                self._total_tokens += tokens
+
+    def _cache_key(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> bytes:
+        """BLAKE2b digest of everything that determines a response."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (
+            self._config["ollama_model"],
+            self._config["lmstudio_model"],
+            repr(temperature),
+            repr(max_tokens),
+            system_prompt or "",
+            prompt,
+        ):
+            digest.update(str(part).encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.digest()
+
+    def _cache_connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Open llm_cache.db once (None, and caching off, if it can't be opened).
+
+        Expired rows, and all but the newest _CACHE_MAX_ROWS, are deleted on
+        open so the file stays bounded across runs.
+        """
+        if self._cache_db is None and self._cache_enabled:
+            from .llm_client import _cache_dir
+
+            try:
+                cache_dir = _cache_dir()
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(cache_dir / "llm_cache.db", check_same_thread=False)
+                with db:
+                    # Pre-TTL table without timestamps: its rows can't be aged
+                    db.execute("DROP TABLE IF EXISTS llm_cache")
+                    db.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_responses "
+                        "(k BLOB PRIMARY KEY, v TEXT, ts REAL)"
+                    )
+                    db.execute(
+                        "DELETE FROM llm_responses WHERE ts < ?",
+                        (time.time() - _CACHE_TTL_SECONDS,),
+                    )
+                    db.execute(
+                        "DELETE FROM llm_responses WHERE k IN (SELECT k FROM llm_responses "
+                        "ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                        (_CACHE_MAX_ROWS,),
+                    )
+                self._cache_db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.debug("LLM response cache unavailable: %s", e)
+                self._cache_enabled = False
+        return self._cache_db
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Cached response for key, or None."""
+        with self._cache_lock:
+            db = self._cache_connection()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT v FROM llm_responses WHERE k = ? AND ts >= ?",
+                    (key, time.time() - _CACHE_TTL_SECONDS),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug("LLM response cache read failed: %s", e)
+                return None
+        return row[0] if row else None
+
+    def _cache_put(self, key: bytes, text: str) -> None:
+        """Store a response (best effort)."""
+        with self._cache_lock:
+            db = self._cache_connection()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO llm_responses (k, v, ts) VALUES (?, ?, ?)",
+                        (key, text, time.time()),
+                    )
+            except sqlite3.Error as e:
+                logger.debug("LLM response cache write failed: %s", e)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        batch_size: int = 8,
+        per_item_tokens: int = 500,
+    ) -> List[Optional[str]]:
+        """
+        Answer several prompts, compatible with LocalLLMClient.generate_batch().
+        
+        LIR batches concurrent requests itself, so prompts are not packed but
+        sent together through generate_many(); batch_size is accepted for
+        interface compatibility.
+        
+        Returns:
+            One answer per prompt, in order (None where generation failed)
+        """
+        return self.generate_many(prompts, system_prompt, max_tokens=per_item_tokens)
+    
+    def generate_many(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[Optional[str]]:
+        """
+        Run generate() for every prompt concurrently.
+        
+        Compatible with LocalLLMClient.generate_many(): up to
+        $CODEWIKI_LLM_CONCURRENCY (default 8) requests are in flight at once,
+        so LIR's router can batch them instead of seeing one at a time.
+        Keyword arguments are passed through to generate().
+        
+        Returns:
+            One answer per prompt, in order (None where generation failed)
+        """
+        workers = min(len(prompts), max(1, int(os.getenv("CODEWIKI_LLM_CONCURRENCY", "8"))))
+        if workers <= 1:
+            return [self.generate(p, system_prompt, **kwargs) for p in prompts]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="codewiki-lir") as pool:
+            return list(pool.map(lambda p: self.generate(p, system_prompt, **kwargs), prompts))
+    
+    async def agenerate(
+        self, prompt: str, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> Optional[str]:
+        """
+        Awaitable generate(), compatible with LocalLLMClient.agenerate().
+        
+        SyncLIRClient blocks, so the call runs in the default executor thread
+        and the event loop stays responsive.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt, **kwargs)
+    
+    async def agenerate_many(
+        self, prompts: List[str], system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> List[Optional[str]]:
+        """
+        Awaitable generate_many(): up to $CODEWIKI_LLM_CONCURRENCY (default 8)
+        requests in flight, results in input order.
+        """
+        limit = asyncio.Semaphore(max(1, int(os.getenv("CODEWIKI_LLM_CONCURRENCY", "8"))))
+        
+        async def one(prompt: str) -> Optional[str]:
+            async with limit:
+                return await self.agenerate(prompt, system_prompt, **kwargs)
+        
+        return list(await asyncio.gather(*(one(p) for p in prompts)))
+    
+    def preload(
+        self,
+        system_prompt: Optional[str] = None,
+        keep_alive: str = "30m",
+        model: Optional[str] = None,
+    ) -> bool:
+        """
+        Warm-up hook, compatible with LocalLLMClient.preload().
+        
+        LIR manages model residency and batching itself, so this is a no-op.
+        
+        Returns:
+            False (nothing was preloaded)
+        """
+        return False
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """
         Get usage statistics.
@@ -243,6 +566,7 @@ class LIRLocalLLMClient:
         Returns:
             Dict with usage stats
         """
+        self._flush_usage()
         stats = {
             "total_requests": self._request_count,
             "estimated_total_tokens": self._total_tokens,
@@ -274,18 +598,23 @@ class LIRLocalLLMClient:
             policy: New policy name ("silent", "balanced", "performance")
         """
         if self._client:
-            self._client.set_policy(policy)
+            # The shared client may serve other instances: move to the one
+            # for the new policy instead of changing theirs
+            self.close()
             self.policy = policy
+            self._init_client()
             logger.info("LIR policy changed to: %s", policy)
     
     def close(self) -> None:
-        """Close LIR client and cleanup resources"""
+        """Release the shared LIR client (closed once no instance holds it)"""
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
         if self._client:
-            try:
-                self._client.close()
-            except Exception as e:
-                logger.warning("Error closing LIR client: %s", e)
+            _release_lir_client(self._client_key_held)
             self._client = None
+            self._client_key_held = None
     
     def __enter__(self) -> "LIRLocalLLMClient":
         """Context manager entry"""
@@ -22,16 +22,28 @@ Future Modes (v1.1+):
 from __future__ import annotations
 
 import argparse
-import json
 import sys
+from collections import Counter
+from operator import attrgetter
 from pathlib import Path
 
 # Add parent directory to path for imports
 REPO_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(REPO_ROOT))
 
-# Import modules
-from . import doc_generator, lifecycle_classifier, repo_scanner
+# Pipeline modules are imported by the mode that needs them, so e.g. a scan
+# doesn't load the LLM clients; module attributes resolve lazily (PEP 562)
+_LAZY_MODULES = ("doc_generator", "lifecycle_classifier", "repo_scanner")
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MODULES:
+        from importlib import import_module
+
+        module = import_module(f".{name}", __package__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -90,30 +102,34 @@ Examples:
     return parser.parse_args()
 
 
-def run_scan(write_to_disk: bool = True) -> int:
+def run_scan(write_to_disk: bool = True, config: dict | None = None) -> int:
     """
     Run repository scan.
 
     Args:
         write_to_disk: If True, write index to disk. If False, only print summary.
+        config: Code Wiki configuration (None = load config/code_wiki_config.yaml)
 
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    config_path = REPO_ROOT / "config" / "code_wiki_config.yaml"
+    from . import repo_scanner
 
-    if not config_path.exists():
-        print(f"❌ [code-wiki] Config not found: {config_path}", file=sys.stderr)
-        return 1
+    if config is None:
+        config_path = REPO_ROOT / "config" / "code_wiki_config.yaml"
+
+        if not config_path.exists():
+            print(f"❌ [code-wiki] Config not found: {config_path}", file=sys.stderr)
+            return 1
 
     try:
         # Load config
-        config = repo_scanner.load_code_wiki_config(config_path)
+        if config is None:
+            config = repo_scanner.load_code_wiki_config(config_path)
 
         # Run scan
         print(f"🔍 [code-wiki] Scanning repository from {REPO_ROOT}...")
         index = repo_scanner.scan_repository(config)
-        index_dict = repo_scanner.repo_index_to_dict(index)
 
         meta = index.scan_metadata
 
@@ -122,10 +138,7 @@ def run_scan(write_to_disk: bool = True) -> int:
             output_path = REPO_ROOT / config.get("output", {}).get(
                 "index_path", "data/code_wiki/repo_index.json"
             )
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with output_path.open("w", encoding="utf-8") as f:
-                json.dump(index_dict, f, ensure_ascii=False, indent=2)
+            repo_scanner.write_repo_index(index, output_path)
 
             print(f"✅ [code-wiki] Scan complete!")
             print(f"📊 Files scanned: {meta['files_scanned']}")
@@ -146,15 +159,11 @@ def run_scan(write_to_disk: bool = True) -> int:
             )
             print()
 
-            # Print breakdown by file kind
-            kind_counts = {}
-            for file_entry in index.files:
-                kind = file_entry.kind
-                kind_counts[kind] = kind_counts.get(kind, 0) + 1
+            # Print breakdown by file kind (counted in C)
+            kind_counts = Counter(map(attrgetter("kind"), index.files))
 
             print("  File breakdown:")
-            for kind in sorted(kind_counts.keys()):
-                count = kind_counts[kind]
+            for kind, count in sorted(kind_counts.items()):
                 print(f"    {kind:12s}: {count:5d} files")
 
         return 0
@@ -205,6 +214,13 @@ def run_lifecycle(config: dict, preview: bool = False) -> int:
     use_llm = bool(lifecycle_cfg.get("use_llm", False))  # V1.1+
     llm_mode = lifecycle_cfg.get("llm_mode", "full")  # V1.2
     llm_max_files = lifecycle_cfg.get("llm_max_files")  # V1.2
+    output_format = lifecycle_cfg.get("output_format", "json")  # json | ndjson
+    llm_concurrency = lifecycle_cfg.get("llm_concurrency")  # None = $CODEWIKI_LLM_CONCURRENCY or 8
+    llm_batch_size = int(lifecycle_cfg.get("llm_batch_size", 1))  # files per prompt
+    llm_model = lifecycle_cfg.get("llm_model")  # None = provider's model
+    llm_options = lifecycle_cfg.get("llm_options")  # Ollama-style options
+    llm_structured_output = bool(lifecycle_cfg.get("llm_structured_output", True))
+    llm_cache_similar = bool(lifecycle_cfg.get("llm_cache_similar", False))
 
     # V2.0: Environment variable overrides for validation/benchmarking
     import os
@@ -226,6 +242,8 @@ def run_lifecycle(config: dict, preview: bool = False) -> int:
         )
 
     try:
+        from . import lifecycle_classifier
+
         # Run classification
         lifecycle_classifier.run_lifecycle_classification(
             index_path=index_path,
@@ -236,6 +254,13 @@ def run_lifecycle(config: dict, preview: bool = False) -> int:
             use_llm=use_llm,  # V1.1+
             llm_mode=llm_mode,  # V1.2
             llm_max_files=llm_max_files,  # V1.2
+            output_format=output_format,
+            llm_concurrency=llm_concurrency,
+            llm_batch_size=llm_batch_size,
+            llm_model=llm_model,
+            llm_options=llm_options,
+            llm_structured_output=llm_structured_output,
+            llm_cache_similar=llm_cache_similar,
         )
         return 0
 
@@ -285,6 +310,8 @@ def run_docgen(config: dict, preview: bool = False) -> int:
     readme_path = REPO_ROOT / "README.md" if update_readme else None
 
     try:
+        from . import doc_generator
+
         # Run documentation generation
         doc_generator.run_doc_generation(
             index_path=index_path,
@@ -314,6 +341,8 @@ def main() -> int:
         return 1
 
     try:
+        from . import repo_scanner
+
         config = repo_scanner.load_code_wiki_config(config_path)
     except Exception as e:
         print(
@@ -325,7 +354,7 @@ def main() -> int:
     # Route to appropriate handler
     if args.mode in ("scan", "check"):
         write_to_disk = args.mode == "scan" and not args.preview
-        return run_scan(write_to_disk=write_to_disk)
+        return run_scan(write_to_disk=write_to_disk, config=config)
     elif args.mode == "lifecycle":
         return run_lifecycle(config=config, preview=args.preview)
     elif args.mode == "docgen":
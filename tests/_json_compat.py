@@ -0,0 +1,21 @@
+"""JSON helpers for test fixtures: orjson when installed, stdlib json otherwise.
+
+Both ``dumps`` and ``loads`` work on UTF-8 bytes so fixtures can use
+``Path.write_bytes``/``Path.read_bytes`` without an extra encode/decode.
+"""
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the "fast" extra
+    import json
+
+    def dumps(obj) -> bytes:
+        # Compact separators, matching orjson's output
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+else:
+    dumps = orjson.dumps
+    loads = orjson.loads
+
+__all__ = ["dumps", "loads"]
@@ -0,0 +1,309 @@
+"""Shared fixtures for the Code Wiki test suite.
+
+The JSON inputs are written once per session; tests that need their own
+copy (anything that might modify the file or its directory) get one via the
+function-scoped wrappers, which copy the session file into ``tmp_path``.
+"""
+
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from codewiki.doc_generator import CodeWikiDocGenerator
+from codewiki.lifecycle_classifier import LifecycleClassifier
+from tests import _json_compat as fast_json
+
+SECONDS_PER_DAY = 86400
+
+# One time base for every fixture mtime. classify() measures ages against the
+# wall clock, so this is captured at import rather than hard-coded.
+FROZEN_NOW = time.time()
+
+
+# Lifecycle classifier sample index
+_SAMPLE_INDEX = {
+    "scan_metadata": {
+        "timestamp": "2025-11-15T10:00:00Z",
+        "git_commit": "abc123",
+        "files_scanned": 6,
+    },
+    "files": [
+        # Active file (recently modified)
+        {
+            "path": "digital_me/core/new_feature.py",
+            "mtime": FROZEN_NOW - 10 * SECONDS_PER_DAY,
+            "size_bytes": 1000,
+            "kind": "python",
+        },
+        # Old file (should review)
+        {
+            "path": "scripts/old_tool.py",
+            "mtime": FROZEN_NOW - 120 * SECONDS_PER_DAY,
+            "size_bytes": 500,
+            "kind": "script",
+        },
+        # Very old file (should archive)
+        {
+            "path": "legacy_code/ancient.py",
+            "mtime": FROZEN_NOW - 300 * SECONDS_PER_DAY,
+            "size_bytes": 2000,
+            "kind": "python",
+        },
+        # File with legacy pattern
+        {
+            "path": "utils/helper_legacy.py",
+            "mtime": FROZEN_NOW - 50 * SECONDS_PER_DAY,
+            "size_bytes": 800,
+            "kind": "python",
+        },
+        # Backup file (should delete)
+        {
+            "path": "config.py.bak",
+            "mtime": FROZEN_NOW - 20 * SECONDS_PER_DAY,
+            "size_bytes": 200,
+            "kind": "other",
+        },
+        # Already archived file
+        {
+            "path": "docs/archive/old_doc.md",
+            "mtime": FROZEN_NOW - 200 * SECONDS_PER_DAY,
+            "size_bytes": 1500,
+            "kind": "doc",
+        },
+    ],
+}
+
+# Doc generator index and lifecycle recommendations
+_DOC_INDEX = {
+    "scan_metadata": {
+        "timestamp": "2025-11-15T20:00:00Z",
+        "git_commit": "abc1234567890",
+        "files_scanned": 10,
+        "duration_seconds": 0.02,
+    },
+    "files": [
+        # Python files
+        {
+            "path": "digital_me/core/main.py",
+            "kind": "python",
+            "size_bytes": 1024,
+            "mtime": FROZEN_NOW - 10 * SECONDS_PER_DAY,
+        },
+        {
+            "path": "digital_me/agents/test_agent.py",
+            "kind": "python",
+            "size_bytes": 2048,
+            "mtime": FROZEN_NOW - 20 * SECONDS_PER_DAY,
+        },
+        {
+            "path": "scripts/helper.py",
+            "kind": "script",
+            "size_bytes": 512,
+            "mtime": FROZEN_NOW - 5 * SECONDS_PER_DAY,
+        },
+        # Config files (should not appear in service catalog)
+        {
+            "path": "config/settings.yaml",
+            "kind": "config",
+            "size_bytes": 256,
+            "mtime": FROZEN_NOW - 15 * SECONDS_PER_DAY,
+        },
+        {
+            "path": "requirements.txt",
+            "kind": "config",
+            "size_bytes": 128,
+            "mtime": FROZEN_NOW - 30 * SECONDS_PER_DAY,
+        },
+        # Test files
+        {
+            "path": "tests/test_core.py",
+            "kind": "test",
+            "size_bytes": 3072,
+            "mtime": FROZEN_NOW - 7 * SECONDS_PER_DAY,
+        },
+        # Doc files
+        {
+            "path": "docs/README.md",
+            "kind": "doc",
+            "size_bytes": 2048,
+            "mtime": FROZEN_NOW - 25 * SECONDS_PER_DAY,
+        },
+        # More Python
+        {
+            "path": "digital_me/utils/helpers.py",
+            "kind": "python",
+            "size_bytes": 768,
+            "mtime": FROZEN_NOW - 12 * SECONDS_PER_DAY,
+        },
+        {
+            "path": "scripts/deploy.sh",
+            "kind": "script",
+            "size_bytes": 640,
+            "mtime": FROZEN_NOW - 8 * SECONDS_PER_DAY,
+        },
+        # Other
+        {
+            "path": "LICENSE",
+            "kind": "other",
+            "size_bytes": 1024,
+            "mtime": FROZEN_NOW - 365 * SECONDS_PER_DAY,
+        },
+    ],
+}
+
+_DOC_LIFECYCLE = {
+    "scan_metadata": {"timestamp": "2025-11-15T20:00:00Z"},
+    "recommendations": [
+        {"path": "digital_me/core/main.py", "recommendation": "keep"},
+        {"path": "digital_me/agents/test_agent.py", "recommendation": "keep"},
+        {"path": "scripts/helper.py", "recommendation": "keep"},
+        {"path": "digital_me/utils/helpers.py", "recommendation": "review"},
+        {"path": "scripts/deploy.sh", "recommendation": "archive"},
+    ],
+}
+
+_SAMPLE_INDEX_BYTES = fast_json.dumps(_SAMPLE_INDEX)
+_DOC_INDEX_BYTES = fast_json.dumps(_DOC_INDEX)
+_DOC_LIFECYCLE_BYTES = fast_json.dumps(_DOC_LIFECYCLE)
+
+
+def _copy_to(src: Path, tmp_path: Path) -> Path:
+    dst = tmp_path / src.name
+    shutil.copyfile(src, dst)
+    return dst
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle classifier inputs
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def session_sample_repo_index(tmp_path_factory) -> Path:
+    """Create a sample repo_index.json for lifecycle classification tests."""
+    index_path = tmp_path_factory.mktemp("codewiki_fixtures") / "repo_index.json"
+    index_path.write_bytes(_SAMPLE_INDEX_BYTES)
+    return index_path
+
+
+@pytest.fixture
+def sample_repo_index(session_sample_repo_index: Path, tmp_path: Path) -> Path:
+    """Per-test copy of the lifecycle sample index."""
+    return _copy_to(session_sample_repo_index, tmp_path)
+
+
+@pytest.fixture
+def make_classifier(tmp_path: Path):
+    """Factory for LifecycleClassifier with the suite's default settings.
+
+    Output goes to ``tmp_path``; keyword arguments override the defaults.
+    """
+
+    def _make(index_path: Path, **kwargs) -> LifecycleClassifier:
+        options = {
+            "output_path": tmp_path / "lifecycle_recommendations.json",
+            "deprecation_days": 90,
+            "confidence_threshold": 0.7,
+            **kwargs,
+        }
+        return LifecycleClassifier(index_path=index_path, **options)
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def classified_result(session_sample_repo_index: Path, tmp_path_factory):
+    """(classifier, result) from one rule-based classify() of the sample index.
+
+    Shared by read-only tests; anything exercising save_result builds its own.
+    """
+    classifier = LifecycleClassifier(
+        index_path=session_sample_repo_index,
+        output_path=tmp_path_factory.mktemp("lifecycle") / "lifecycle_recommendations.json",
+        deprecation_days=90,
+        confidence_threshold=0.7,
+    )
+    return classifier, classifier.classify()
+
+
+@pytest.fixture(scope="session")
+def recs_by_path(classified_result) -> dict:
+    """classified_result's recommendations keyed by path."""
+    _, result = classified_result
+    return {r.path: r for r in result.recommendations}
+
+
+# ---------------------------------------------------------------------------
+# Doc generator inputs
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def session_repo_index(tmp_path_factory) -> Path:
+    """Creates a mock repo_index.json for doc generation tests."""
+    index_path = tmp_path_factory.mktemp("codewiki_fixtures") / "repo_index.json"
+    index_path.write_bytes(_DOC_INDEX_BYTES)
+    return index_path
+
+
+@pytest.fixture(scope="session")
+def session_lifecycle_recommendations(tmp_path_factory) -> Path:
+    """Creates a mock lifecycle_recommendations.json for doc generation tests."""
+    lifecycle_path = (
+        tmp_path_factory.mktemp("codewiki_fixtures") / "lifecycle_recommendations.json"
+    )
+    lifecycle_path.write_bytes(_DOC_LIFECYCLE_BYTES)
+    return lifecycle_path
+
+
+@pytest.fixture
+def mock_repo_index(session_repo_index: Path, tmp_path: Path) -> Path:
+    """Per-test copy of the doc generator index."""
+    return _copy_to(session_repo_index, tmp_path)
+
+
+@pytest.fixture
+def mock_lifecycle_recommendations(
+    session_lifecycle_recommendations: Path, tmp_path: Path
+) -> Path:
+    """Per-test copy of the doc generator lifecycle recommendations."""
+    return _copy_to(session_lifecycle_recommendations, tmp_path)
+
+
+def _make_doc_generator(index_path: Path, lifecycle_path: Path, output_dir: Path):
+    generator = CodeWikiDocGenerator(
+        index_path=index_path,
+        lifecycle_path=lifecycle_path,
+        output_dir=output_dir,
+        readme_path=None,
+    )
+    generator.load_inputs()
+    return generator
+
+
+@pytest.fixture(scope="session")
+def doc_generator(
+    session_repo_index: Path,
+    session_lifecycle_recommendations: Path,
+    tmp_path_factory,
+) -> CodeWikiDocGenerator:
+    """Shared, loaded CodeWikiDocGenerator for tests that only read from it."""
+    return _make_doc_generator(
+        session_repo_index,
+        session_lifecycle_recommendations,
+        tmp_path_factory.mktemp("codewiki_output"),
+    )
+
+
+@pytest.fixture
+def mutable_doc_generator(
+    mock_repo_index: Path,
+    mock_lifecycle_recommendations: Path,
+    tmp_path: Path,
+) -> CodeWikiDocGenerator:
+    """Per-test CodeWikiDocGenerator for tests that change readme_path/output_dir."""
+    return _make_doc_generator(
+        mock_repo_index, mock_lifecycle_recommendations, tmp_path / "output"
+    )
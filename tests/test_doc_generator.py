@@ -1,7 +1,7 @@
 # tests/documentation/test_doc_generator.py
 
-import json
-import time
+import re
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -12,128 +12,25 @@ from codewiki.doc_generator import (
     ServiceEntry,
     run_doc_generation,
 )
+from tests import _json_compat as fast_json
+
+# Header line, then one recommendation per line
+_NDJSON_LIFECYCLE_BYTES = b"".join(
+    fast_json.dumps(line) + b"\n"
+    for line in (
+        {"scan_metadata": {"timestamp": "2025-11-15T20:00:00Z"}, "summary": {}},
+        {"path": "digital_me/utils/helpers.py", "recommendation": "review"},
+        {"path": "scripts/deploy.sh", "recommendation": "archive"},
+    )
+)
 
-
-@pytest.fixture
-def mock_repo_index(tmp_path: Path) -> Path:
-    """Creates a mock repo_index.json for testing."""
-    index_path = tmp_path / "repo_index.json"
-    now = time.time()
-    seconds_per_day = 86400
-
-    payload = {
-        "scan_metadata": {
-            "timestamp": "2025-11-15T20:00:00Z",
-            "git_commit": "abc1234567890",
-            "files_scanned": 10,
-            "duration_seconds": 0.02,
-        },
-        "files": [
-            # Python files
-            {
-                "path": "digital_me/core/main.py",
-                "kind": "python",
-                "size_bytes": 1024,
-                "mtime": now - 10 * seconds_per_day,
-            },
-            {
-                "path": "digital_me/agents/test_agent.py",
-                "kind": "python",
-                "size_bytes": 2048,
-                "mtime": now - 20 * seconds_per_day,
-            },
-            {
-                "path": "scripts/helper.py",
-                "kind": "script",
-                "size_bytes": 512,
-                "mtime": now - 5 * seconds_per_day,
-            },
-            # Config files (should not appear in service catalog)
-            {
-                "path": "config/settings.yaml",
-                "kind": "config",
-                "size_bytes": 256,
-                "mtime": now - 15 * seconds_per_day,
-            },
-            {
-                "path": "requirements.txt",
-                "kind": "config",
-                "size_bytes": 128,
-                "mtime": now - 30 * seconds_per_day,
-            },
-            # Test files
-            {
-                "path": "tests/test_core.py",
-                "kind": "test",
-                "size_bytes": 3072,
-                "mtime": now - 7 * seconds_per_day,
-            },
-            # Doc files
-            {
-                "path": "docs/README.md",
-                "kind": "doc",
-                "size_bytes": 2048,
-                "mtime": now - 25 * seconds_per_day,
-            },
-            # More Python
-            {
-                "path": "digital_me/utils/helpers.py",
-                "kind": "python",
-                "size_bytes": 768,
-                "mtime": now - 12 * seconds_per_day,
-            },
-            {
-                "path": "scripts/deploy.sh",
-                "kind": "script",
-                "size_bytes": 640,
-                "mtime": now - 8 * seconds_per_day,
-            },
-            # Other
-            {
-                "path": "LICENSE",
-                "kind": "other",
-                "size_bytes": 1024,
-                "mtime": now - 365 * seconds_per_day,
-            },
-        ],
-    }
-    index_path.write_text(json.dumps(payload), encoding="utf-8")
-    return index_path
-
-
-@pytest.fixture
-def mock_lifecycle_recommendations(tmp_path: Path) -> Path:
-    """Creates a mock lifecycle_recommendations.json for testing."""
-    lifecycle_path = tmp_path / "lifecycle_recommendations.json"
-    payload = {
-        "scan_metadata": {"timestamp": "2025-11-15T20:00:00Z"},
-        "recommendations": [
-            {"path": "digital_me/core/main.py", "recommendation": "keep"},
-            {"path": "digital_me/agents/test_agent.py", "recommendation": "keep"},
-            {"path": "scripts/helper.py", "recommendation": "keep"},
-            {"path": "digital_me/utils/helpers.py", "recommendation": "review"},
-            {"path": "scripts/deploy.sh", "recommendation": "archive"},
-        ],
+# Index without any python/script files (empty service catalog)
+_CONFIG_ONLY_INDEX_BYTES = fast_json.dumps(
+    {
+        "scan_metadata": {"timestamp": "2025-11-15T20:00:00Z", "git_commit": "abc123"},
+        "files": [{"path": "config/settings.yaml", "kind": "config", "size_bytes": 256}],
     }
-    lifecycle_path.write_text(json.dumps(payload), encoding="utf-8")
-    return lifecycle_path
-
-
-@pytest.fixture
-def doc_generator(
-    mock_repo_index: Path,
-    mock_lifecycle_recommendations: Path,
-    tmp_path: Path,
-) -> CodeWikiDocGenerator:
-    """Creates a configured CodeWikiDocGenerator instance."""
-    generator = CodeWikiDocGenerator(
-        index_path=mock_repo_index,
-        lifecycle_path=mock_lifecycle_recommendations,
-        output_dir=tmp_path / "output",
-        readme_path=None,
-    )
-    generator.load_inputs()
-    return generator
+)
 
 
 def test_load_inputs_success(doc_generator: CodeWikiDocGenerator) -> None:
@@ -141,18 +38,24 @@ def test_load_inputs_success(doc_generator: CodeWikiDocGenerator) -> None:
     assert doc_generator._index is not None
     assert doc_generator._lifecycle is not None
     assert "files" in doc_generator._index
-    assert "recommendations" in doc_generator._lifecycle
+    assert "scan_metadata" in doc_generator._lifecycle
+    # Only non-"keep" recommendations are kept, keyed by path
+    assert doc_generator._lifecycle_map() == {
+        "digital_me/utils/helpers.py": "review",
+        "scripts/deploy.sh": "archive",
+    }
 
 
-def test_load_inputs_missing_index(tmp_path: Path) -> None:
+def test_load_inputs_missing_index() -> None:
     """Test that missing index file raises FileNotFoundError."""
-    generator = CodeWikiDocGenerator(
-        index_path=tmp_path / "nonexistent.json",
-        lifecycle_path=None,
-        output_dir=tmp_path,
-    )
-    with pytest.raises(FileNotFoundError):
-        generator.load_inputs()
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = CodeWikiDocGenerator(
+            index_path=Path(tmp) / "nonexistent.json",
+            lifecycle_path=None,
+            output_dir=Path(tmp),
+        )
+        with pytest.raises(FileNotFoundError):
+            generator.load_inputs()
 
 
 def test_load_inputs_missing_lifecycle(mock_repo_index: Path, tmp_path: Path) -> None:
@@ -163,7 +66,8 @@ def test_load_inputs_missing_lifecycle(mock_repo_index: Path, tmp_path: Path) ->
         output_dir=tmp_path,
     )
     generator.load_inputs()  # Should not raise
-    assert generator._lifecycle == {"recommendations": []}
+    assert generator._lifecycle == {}
+    assert generator._lifecycle_map() == {}
 
 
 def test_build_repo_stats(doc_generator: CodeWikiDocGenerator) -> None:
@@ -194,14 +98,77 @@ def test_build_services(doc_generator: CodeWikiDocGenerator) -> None:
     assert kinds == {"python", "script"}
 
     # Check that lifecycles are correctly joined
-    helper_service = next(s for s in services if "helper" in s.path)
-    assert helper_service.lifecycle == "keep"
+    by_path = {s.path: s for s in services}
+    assert by_path["scripts/helper.py"].lifecycle == "keep"
+    assert by_path["scripts/deploy.sh"].lifecycle == "archive"
+    assert by_path["digital_me/utils/helpers.py"].lifecycle == "review"
+
+
+def test_scan_index_matches_separate_passes(
+    doc_generator: CodeWikiDocGenerator,
+    mock_repo_index: Path,
+    mock_lifecycle_recommendations: Path,
+    tmp_path: Path,
+) -> None:
+    """Test that the fused scan (loaded or streamed) matches build_* results."""
+    expected_stats = doc_generator.build_repo_stats()
+    expected_services = doc_generator.build_services()
+
+    stats, services = doc_generator.scan_index()
+    assert stats == expected_stats
+    assert services == expected_services
+
+    streaming = CodeWikiDocGenerator(
+        index_path=mock_repo_index,
+        lifecycle_path=mock_lifecycle_recommendations,
+        output_dir=tmp_path,
+    )
+    streaming.load_inputs(stream_index=True)
+    assert streaming._index == {}
+
+    stats, services = streaming.scan_index()
+    assert stats == expected_stats
+    assert services == expected_services
+
+
+def test_streamed_scan_parses_index_once_without_ijson(
+    mock_repo_index: Path, tmp_path: Path, monkeypatch
+) -> None:
+    """Test that the stdlib fallback reads repo_index.json a single time."""
+    from codewiki import doc_generator as dg
+
+    monkeypatch.setattr(dg, "HAS_IJSON", False)
+    reads = []
+    read_json = dg._read_json
+    monkeypatch.setattr(dg, "_read_json", lambda p: reads.append(p) or read_json(p))
+
+    generator = CodeWikiDocGenerator(
+        index_path=mock_repo_index, lifecycle_path=None, output_dir=tmp_path
+    )
+    generator.load_inputs(stream_index=True)
+    stats, _ = generator.scan_index()
 
-    deploy_service = next(s for s in services if "deploy" in s.path)
-    assert deploy_service.lifecycle == "archive"
+    assert reads == [mock_repo_index]
+    assert stats.total_files == 10
+    assert stats.latest_commit == "abc1234567890"
 
-    helpers_service = next(s for s in services if "helpers" in s.path)
-    assert helpers_service.lifecycle == "review"
+
+def test_build_services_ndjson_lifecycle(mock_repo_index: Path, tmp_path: Path) -> None:
+    """Test that NDJSON lifecycle recommendations are joined like JSON ones."""
+    lifecycle_path = tmp_path / "lifecycle_recommendations.ndjson"
+    lifecycle_path.write_bytes(_NDJSON_LIFECYCLE_BYTES)
+
+    generator = CodeWikiDocGenerator(
+        index_path=mock_repo_index,
+        lifecycle_path=lifecycle_path,
+        output_dir=tmp_path,
+    )
+    generator.load_inputs()
+    services = {s.path: s for s in generator.build_services()}
+
+    assert services["digital_me/utils/helpers.py"].lifecycle == "review"
+    assert services["scripts/deploy.sh"].lifecycle == "archive"
+    assert services["scripts/helper.py"].lifecycle == "keep"
 
 
 def test_build_services_without_lifecycle(
@@ -220,77 +187,95 @@ def test_build_services_without_lifecycle(
     assert all(s.lifecycle == "keep" for s in services)
 
 
-def test_generate_overview_markdown(doc_generator: CodeWikiDocGenerator) -> None:
-    """Test that overview markdown is generated correctly."""
+@pytest.fixture(scope="module")
+def rendered(doc_generator: CodeWikiDocGenerator):
+    """(stats, services, overview_md, catalog_md) rendered once per module."""
     stats = doc_generator.build_repo_stats()
     services = doc_generator.build_services()
+    return (
+        stats,
+        services,
+        doc_generator.generate_overview_markdown(stats, services),
+        doc_generator.generate_service_catalog_markdown(services),
+    )
 
-    markdown = doc_generator.generate_overview_markdown(stats, services)
 
-    # Check for required sections
-    assert "AUTO-GENERATED by Code Wiki System" in markdown
-    assert "# Code Wiki – Architecture Overview" in markdown
-    assert "## Repository Statistics" in markdown
-    assert "**Total files**: 10" in markdown
-    assert "abc1234567890" in markdown  # Git commit
+OVERVIEW_EXPECTED = (
+    # Required sections
+    "AUTO-GENERATED by Code Wiki System",
+    "# Code Wiki – Architecture Overview",
+    "## Repository Statistics",
+    "**Total files**: 10",
+    "abc1234567890",  # Git commit
+    # File breakdown
+    "**python**: 3 files",
+    "**config**: 2 files",
+    # Mermaid diagram
+    "```mermaid",
+    "graph LR",
+    "Repo Scanner",
+    # Service summary
+    "## Service Catalog Summary",
+    "Total services/scripts indexed: **5**",
+)
 
-    # Check for file breakdown
-    assert "**python**: 3 files" in markdown
-    assert "**config**: 2 files" in markdown
+CATALOG_EXPECTED = (
+    # Header
+    "AUTO-GENERATED by Code Wiki System",
+    "# Code Wiki – Service & Script Catalog",
+    "DO NOT EDIT MANUALLY",
+    # Table structure
+    "| Name | Path | Kind | Lifecycle | Size |",
+    "|------|------|------|-----------|------|",
+    # Specific entries
+    "`main`",
+    "`digital_me/core/main.py`",
+    "python",
+    # Lifecycle indicators
+    "✅ keep",
+    "⚠️ review",
+    "📦 archive",
+    # Legend
+    "## Lifecycle Legend",
+)
 
-    # Check for Mermaid diagram
-    assert "```mermaid" in markdown
-    assert "graph LR" in markdown
-    assert "Repo Scanner" in markdown
 
-    # Check for service summary
-    assert "## Service Catalog Summary" in markdown
-    assert "Total services/scripts indexed: **5**" in markdown
+def _needle_re(needles) -> re.Pattern:
+    """One pattern finding every needle in a single pass (overlaps included)."""
+    return re.compile("(?=(" + "|".join(map(re.escape, needles)) + "))")
 
 
-def test_generate_service_catalog_markdown(
-    doc_generator: CodeWikiDocGenerator,
-) -> None:
-    """Test that service catalog markdown is generated correctly."""
-    services = doc_generator.build_services()
-
-    markdown = doc_generator.generate_service_catalog_markdown(services)
-
-    # Check for header
-    assert "AUTO-GENERATED by Code Wiki System" in markdown
-    assert "# Code Wiki – Service & Script Catalog" in markdown
-    assert "DO NOT EDIT MANUALLY" in markdown
+_OVERVIEW_RE = _needle_re(OVERVIEW_EXPECTED)
+_CATALOG_RE = _needle_re(CATALOG_EXPECTED)
 
-    # Check for table structure
-    assert "| Name | Path | Kind | Lifecycle | Size |" in markdown
-    assert "|------|------|------|-----------|------|" in markdown
 
-    # Check for specific entries
-    assert "`main`" in markdown
-    assert "`digital_me/core/main.py`" in markdown
-    assert "python" in markdown
+def test_generate_overview_markdown(rendered) -> None:
+    """Test that overview markdown is generated correctly."""
+    _, _, markdown, _ = rendered
+    missing = set(OVERVIEW_EXPECTED) - set(_OVERVIEW_RE.findall(markdown))
+    assert not missing, missing
 
-    # Check for lifecycle indicators
-    assert "✅ keep" in markdown
-    assert "⚠️ review" in markdown
-    assert "📦 archive" in markdown
 
-    # Check for legend
-    assert "## Lifecycle Legend" in markdown
+def test_generate_service_catalog_markdown(rendered) -> None:
+    """Test that service catalog markdown is generated correctly."""
+    _, _, _, markdown = rendered
+    missing = set(CATALOG_EXPECTED) - set(_CATALOG_RE.findall(markdown))
+    assert not missing, missing
 
 
-def test_generate_service_catalog_empty(tmp_path: Path) -> None:
-    """Test service catalog generation when no services exist."""
-    # Create index with only config files
+@pytest.fixture(params=["full", "config_only"])
+def repo_index_variant(request, tmp_path: Path):
+    """(variant, index_path): the mock index, or one with no services."""
+    if request.param == "full":
+        return request.param, request.getfixturevalue("mock_repo_index")
     index_path = tmp_path / "index.json"
-    payload = {
-        "scan_metadata": {"timestamp": "2025-11-15T20:00:00Z", "git_commit": "abc123"},
-        "files": [
-            {"path": "config/settings.yaml", "kind": "config", "size_bytes": 256}
-        ],
-    }
-    index_path.write_text(json.dumps(payload), encoding="utf-8")
+    index_path.write_bytes(_CONFIG_ONLY_INDEX_BYTES)
+    return request.param, index_path
+
 
+def test_generate_service_catalog_variants(repo_index_variant, tmp_path: Path) -> None:
+    """Test the service catalog with and without services in the index."""
+    variant, index_path = repo_index_variant
     generator = CodeWikiDocGenerator(
         index_path=index_path, lifecycle_path=None, output_dir=tmp_path
     )
@@ -299,11 +284,13 @@ def test_generate_service_catalog_empty(tmp_path: Path) -> None:
 
     markdown = generator.generate_service_catalog_markdown(services)
 
-    assert "*No services or scripts found.*" in markdown
+    empty = variant == "config_only"
+    assert (len(services) == 0) == empty
+    assert ("*No services or scripts found.*" in markdown) == empty
 
 
 def test_update_readme_sections(
-    tmp_path: Path, doc_generator: CodeWikiDocGenerator
+    tmp_path: Path, mutable_doc_generator: CodeWikiDocGenerator
 ) -> None:
     """Test that README sections are updated correctly."""
     readme_path = tmp_path / "README.md"
@@ -320,10 +307,10 @@ More text.
     readme_path.write_text(initial_content, encoding="utf-8")
 
     # Update generator with README path
-    doc_generator.readme_path = readme_path
+    mutable_doc_generator.readme_path = readme_path
 
-    stats = doc_generator.build_repo_stats()
-    doc_generator.update_readme_sections(stats, preview=False)
+    stats = mutable_doc_generator.build_repo_stats()
+    mutable_doc_generator.update_readme_sections(stats, preview=False)
 
     updated = readme_path.read_text(encoding="utf-8")
 
@@ -338,24 +325,24 @@ More text.
 
 
 def test_update_readme_missing_markers(
-    tmp_path: Path, doc_generator: CodeWikiDocGenerator
+    tmp_path: Path, mutable_doc_generator: CodeWikiDocGenerator
 ) -> None:
     """Test that README update is skipped when markers are missing."""
     readme_path = tmp_path / "README.md"
     initial_content = "# Test Project\n\nNo markers here.\n"
     readme_path.write_text(initial_content, encoding="utf-8")
 
-    doc_generator.readme_path = readme_path
+    mutable_doc_generator.readme_path = readme_path
 
-    stats = doc_generator.build_repo_stats()
-    doc_generator.update_readme_sections(stats, preview=False)
+    stats = mutable_doc_generator.build_repo_stats()
+    mutable_doc_generator.update_readme_sections(stats, preview=False)
 
     # Content should remain unchanged
     assert readme_path.read_text(encoding="utf-8") == initial_content
 
 
 def test_update_readme_preview_mode(
-    tmp_path: Path, doc_generator: CodeWikiDocGenerator, capsys
+    tmp_path: Path, mutable_doc_generator: CodeWikiDocGenerator, capsys
 ) -> None:
     """Test that README update in preview mode doesn't write files."""
     readme_path = tmp_path / "README.md"
@@ -366,10 +353,10 @@ Old
 """
     readme_path.write_text(initial_content, encoding="utf-8")
 
-    doc_generator.readme_path = readme_path
+    mutable_doc_generator.readme_path = readme_path
 
-    stats = doc_generator.build_repo_stats()
-    doc_generator.update_readme_sections(stats, preview=True)
+    stats = mutable_doc_generator.build_repo_stats()
+    mutable_doc_generator.update_readme_sections(stats, preview=True)
 
     # File should not be modified
     assert readme_path.read_text(encoding="utf-8") == initial_content
@@ -379,12 +366,12 @@ Old
     assert "[Preview]" in captured.out
 
 
-def test_write_file(doc_generator: CodeWikiDocGenerator, tmp_path: Path) -> None:
+def test_write_file(mutable_doc_generator: CodeWikiDocGenerator, tmp_path: Path) -> None:
     """Test that files are written correctly."""
     content = "# Test Document\n\nSome content."
-    doc_generator.output_dir = tmp_path
+    mutable_doc_generator.output_dir = tmp_path
 
-    doc_generator.write_file("test.md", content, preview=False)
+    mutable_doc_generator.write_file("test.md", content, preview=False)
 
     output_file = tmp_path / "test.md"
     assert output_file.exists()
@@ -392,13 +379,13 @@ def test_write_file(doc_generator: CodeWikiDocGenerator, tmp_path: Path) -> None
 
 
 def test_write_file_preview_mode(
-    doc_generator: CodeWikiDocGenerator, tmp_path: Path, capsys
+    mutable_doc_generator: CodeWikiDocGenerator, tmp_path: Path, capsys
 ) -> None:
     """Test that write_file in preview mode doesn't create files."""
     content = "# Test Document"
-    doc_generator.output_dir = tmp_path
+    mutable_doc_generator.output_dir = tmp_path
 
-    doc_generator.write_file("test.md", content, preview=True)
+    mutable_doc_generator.write_file("test.md", content, preview=True)
 
     # File should not exist
     output_file = tmp_path / "test.md"
@@ -410,28 +397,42 @@ def test_write_file_preview_mode(
     assert "test.md" in captured.out
 
 
-def test_run_doc_generation_end_to_end(
-    mock_repo_index: Path, mock_lifecycle_recommendations: Path, tmp_path: Path
+@pytest.mark.parametrize("preview", [False, True], ids=["write", "preview"])
+def test_run_doc_generation(
+    session_repo_index: Path,
+    session_lifecycle_recommendations: Path,
+    tmp_path: Path,
+    capsys,
+    preview: bool,
 ) -> None:
-    """Test complete documentation generation workflow."""
+    """Test the documentation workflow end to end, writing or previewing."""
     output_dir = tmp_path / "output"
 
+    # Inputs are only read, so the session files are shared directly
     run_doc_generation(
-        index_path=mock_repo_index,
-        lifecycle_path=mock_lifecycle_recommendations,
+        index_path=session_repo_index,
+        lifecycle_path=None if preview else session_lifecycle_recommendations,
         output_dir=output_dir,
         readme_path=None,
-        preview=False,
+        preview=preview,
     )
 
-    # Check that output files were created
     overview_file = output_dir / "CODE_WIKI_OVERVIEW.generated.md"
     catalog_file = output_dir / "SERVICE_CATALOG.generated.md"
 
-    assert overview_file.exists()
-    assert catalog_file.exists()
+    # Files are written only outside preview mode
+    assert overview_file.exists() != preview
+    assert catalog_file.exists() != preview
+
+    captured = capsys.readouterr()
+    if preview:
+        assert "Preview mode" in captured.out
+        return
+
+    # Reported in a fixed order, whichever write finishes first
+    generated = [line for line in captured.out.splitlines() if "Generated:" in line]
+    assert generated == [f"✅ Generated: {overview_file}", f"✅ Generated: {catalog_file}"]
 
-    # Check content
     overview_content = overview_file.read_text(encoding="utf-8")
     assert "# Code Wiki – Architecture Overview" in overview_content
 
@@ -439,24 +440,13 @@ def test_run_doc_generation_end_to_end(
     assert "# Code Wiki – Service & Script Catalog" in catalog_content
 
 
-def test_run_doc_generation_preview_mode(
-    mock_repo_index: Path, tmp_path: Path, capsys
+def test_estimate_service_catalog_size(
+    doc_generator: CodeWikiDocGenerator, rendered
 ) -> None:
-    """Test documentation generation in preview mode."""
-    output_dir = tmp_path / "output"
-
-    run_doc_generation(
-        index_path=mock_repo_index,
-        lifecycle_path=None,
-        output_dir=output_dir,
-        readme_path=None,
-        preview=True,
-    )
+    """Test that the preview size estimate tracks the rendered catalog."""
+    _, services, _, catalog = rendered
 
-    # No files should be created
-    assert not (output_dir / "CODE_WIKI_OVERVIEW.generated.md").exists()
-    assert not (output_dir / "SERVICE_CATALOG.generated.md").exists()
+    lines, chars = doc_generator.estimate_service_catalog_size(services)
 
-    # Preview messages should be printed
-    captured = capsys.readouterr()
-    assert "Preview mode" in captured.out
+    assert lines == len(catalog.split("\n"))
+    assert abs(chars - len(catalog)) <= 8 * len(services)  # size column is approximate
@@ -11,6 +11,7 @@ Tests the file lifecycle classification logic including:
 
 import json
 import time
+from collections import defaultdict
 from pathlib import Path
 
 import pytest
@@ -18,83 +19,58 @@ import pytest
 from codewiki.lifecycle_classifier import (
     FileLifecycleRecommendation,
     LifecycleClassifier,
+    _parse_llm_json_cached,
+    read_lifecycle_file,
     run_lifecycle_classification,
 )
-
-
-@pytest.fixture
-def sample_repo_index(tmp_path: Path) -> Path:
-    """Create a sample repo_index.json for testing."""
-    index_path = tmp_path / "repo_index.json"
-    now = time.time()
-    seconds_per_day = 86400
-
-    payload = {
-        "scan_metadata": {
-            "timestamp": "2025-11-15T10:00:00Z",
-            "git_commit": "abc123",
-            "files_scanned": 6,
+from tests import _json_compat as fast_json
+
+SECONDS_PER_DAY = 86400
+
+# Ages are measured against the wall clock at classify() time, so the
+# fixture base is captured once at import rather than hard-coded.
+_FROZEN_NOW = time.time()
+
+# Files of known ages around the 90-day deprecation threshold
+_AGE_INDEX = {
+    "scan_metadata": {"timestamp": "2025-11-15T10:00:00Z"},
+    "files": [
+        {
+            "path": "file_90days.py",
+            "mtime": _FROZEN_NOW - 90 * SECONDS_PER_DAY,
+            "kind": "python",
         },
-        "files": [
-            # Active file (recently modified)
-            {
-                "path": "digital_me/core/new_feature.py",
-                "mtime": now - 10 * seconds_per_day,
-                "size_bytes": 1000,
-                "kind": "python",
-            },
-            # Old file (should review)
-            {
-                "path": "scripts/old_tool.py",
-                "mtime": now - 120 * seconds_per_day,
-                "size_bytes": 500,
-                "kind": "script",
-            },
-            # Very old file (should archive)
-            {
-                "path": "legacy_code/ancient.py",
-                "mtime": now - 300 * seconds_per_day,
-                "size_bytes": 2000,
-                "kind": "python",
-            },
-            # File with legacy pattern
-            {
-                "path": "utils/helper_legacy.py",
-                "mtime": now - 50 * seconds_per_day,
-                "size_bytes": 800,
-                "kind": "python",
-            },
-            # Backup file (should delete)
-            {
-                "path": "config.py.bak",
-                "mtime": now - 20 * seconds_per_day,
-                "size_bytes": 200,
-                "kind": "other",
-            },
-            # Already archived file
-            {
-                "path": "docs/archive/old_doc.md",
-                "mtime": now - 200 * seconds_per_day,
-                "size_bytes": 1500,
-                "kind": "doc",
-            },
-        ],
-    }
-
-    index_path.write_text(json.dumps(payload), encoding="utf-8")
-    return index_path
+        {
+            "path": "file_135days.py",
+            "mtime": _FROZEN_NOW - 135 * SECONDS_PER_DAY,
+            "kind": "python",
+        },
+        {
+            "path": "file_270days.py",
+            "mtime": _FROZEN_NOW - 270 * SECONDS_PER_DAY,
+            "kind": "python",
+        },
+        {
+            "path": "file_30days.py",
+            "mtime": _FROZEN_NOW - 30 * SECONDS_PER_DAY,
+            "kind": "python",
+        },
+    ],
+}
+_AGE_INDEX_BYTES = fast_json.dumps(_AGE_INDEX)
+
+# Five files sharing one (kind, age bucket, top dir) key, plus one that doesn't
+_SIMILAR_FILES = tuple(
+    {"path": path, "mtime": _FROZEN_NOW - 5 * SECONDS_PER_DAY, "size_bytes": 100, "kind": kind}
+    for path, kind in [(f"tests/test_{i}.py", "python") for i in range(5)]
+    + [("docs/guide.md", "md")]
+)
+_SIMILAR_INDEX_BYTES = fast_json.dumps({"scan_metadata": {}, "files": _SIMILAR_FILES})
 
 
-def test_lifecycle_classifier_loads_index(sample_repo_index: Path, tmp_path: Path):
+def test_lifecycle_classifier_loads_index(sample_repo_index: Path, make_classifier):
     """Test that classifier can load repo index."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    classifier = make_classifier(sample_repo_index)
 
     index = classifier.load_repo_index()
     assert "scan_metadata" in index
@@ -102,56 +78,41 @@ def test_lifecycle_classifier_loads_index(sample_repo_index: Path, tmp_path: Pat
     assert len(index["files"]) == 6
 
 
-def test_lifecycle_classifier_missing_index(tmp_path: Path):
+def test_lifecycle_classifier_iter_files(sample_repo_index: Path, make_classifier):
+    """Test that streamed index access matches the fully loaded index."""
+    classifier = make_classifier(sample_repo_index)
+
+    index = classifier.load_repo_index()
+    assert classifier.load_scan_metadata() == index["scan_metadata"]
+    assert list(classifier.iter_files()) == index["files"]
+
+
+def test_lifecycle_classifier_missing_index(tmp_path: Path, make_classifier):
     """Test error handling when index file doesn't exist."""
     missing_path = tmp_path / "nonexistent.json"
-    output_path = tmp_path / "output.json"
-
-    classifier = LifecycleClassifier(
-        index_path=missing_path,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    classifier = make_classifier(missing_path)
 
     with pytest.raises(FileNotFoundError):
         classifier.load_repo_index()
 
 
-def test_lifecycle_classifier_creates_recommendations(
-    sample_repo_index: Path, tmp_path: Path
-):
+def test_lifecycle_classifier_creates_recommendations(classified_result):
     """Test that classifier generates recommendations for all files."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
-
-    result = classifier.classify()
+    _, result = classified_result
     assert len(result.recommendations) == 6
     assert result.scan_metadata["classification_method"] == "rule-based-v1"
 
 
-def test_lifecycle_classifier_summary(sample_repo_index: Path, tmp_path: Path):
+def test_lifecycle_classifier_summary(sample_repo_index: Path, make_classifier):
     """Test summary statistics generation."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    classifier = make_classifier(sample_repo_index)
+    output_path = classifier.output_path
 
     result = classifier.classify()
     classifier.save_result(result)
 
     assert output_path.exists()
-    data = json.loads(output_path.read_text(encoding="utf-8"))
+    data = fast_json.loads(output_path.read_bytes())
 
     assert "summary" in data
     summary = data["summary"]
@@ -160,68 +121,49 @@ def test_lifecycle_classifier_summary(sample_repo_index: Path, tmp_path: Path):
     assert "confidence_distribution" in summary
 
 
-def test_lifecycle_classifier_recommendation_types(
-    sample_repo_index: Path, tmp_path: Path
-):
-    """Test that different recommendation types are generated correctly."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
-
-    result = classifier.classify()
-
-    # Group by recommendation type
-    by_type = {}
+@pytest.fixture(scope="module")
+def by_type(classified_result) -> dict:
+    """classified_result's recommendations grouped by recommendation type."""
+    _, result = classified_result
+    grouped = defaultdict(list)
     for rec in result.recommendations:
-        by_type.setdefault(rec.recommendation, []).append(rec)
-
-    # Should have multiple types
-    assert len(by_type) >= 3
+        grouped[rec.recommendation].append(rec)
+    return grouped
 
-    # Should have "keep" recommendations (active files)
-    assert "keep" in by_type
-    assert any("new_feature.py" in r.path for r in by_type["keep"])
 
-    # Should have "archive" recommendations (very old files or already archived)
-    assert "archive" in by_type
-    assert any("ancient.py" in r.path for r in by_type["archive"])
-    assert any("archive/old_doc.md" in r.path for r in by_type["archive"])
+def test_lifecycle_classifier_recommendation_types(by_type: dict):
+    """Test that all recommendation types are generated for the sample index."""
+    assert set(by_type) == {"keep", "archive", "delete", "review"}
 
-    # Should have "delete" recommendations (backup files)
-    assert "delete" in by_type
-    assert any(".bak" in r.path for r in by_type["delete"])
 
-    # Should have "review" recommendations (old files)
-    assert "review" in by_type
-    assert any("old_tool.py" in r.path for r in by_type["review"])
+@pytest.fixture(scope="module")
+def paths_by_type(by_type: dict) -> dict:
+    """Recommendation type -> frozenset of paths, for O(1) membership checks."""
+    return {kind: frozenset(r.path for r in recs) for kind, recs in by_type.items()}
 
 
-def test_lifecycle_classifier_pattern_detection(
-    sample_repo_index: Path, tmp_path: Path
+@pytest.mark.parametrize(
+    "recommendation,path",
+    [
+        ("keep", "digital_me/core/new_feature.py"),  # active file
+        ("archive", "legacy_code/ancient.py"),  # very old file
+        ("archive", "docs/archive/old_doc.md"),  # already archived
+        ("delete", "config.py.bak"),  # backup file
+        ("review", "scripts/old_tool.py"),  # old file
+    ],
+)
+def test_lifecycle_classifier_recommendation_has(
+    paths_by_type: dict, recommendation: str, path: str
 ):
-    """Test pattern-based classification (legacy, backup, archive)."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    """Test that each sample file lands in its expected recommendation type."""
+    assert path in paths_by_type[recommendation]
 
-    result = classifier.classify()
 
-    # Find specific files
-    legacy_file = next(
-        r for r in result.recommendations if "helper_legacy.py" in r.path
-    )
-    backup_file = next(r for r in result.recommendations if ".bak" in r.path)
-    archive_file = next(r for r in result.recommendations if "archive/" in r.path)
+def test_lifecycle_classifier_pattern_detection(recs_by_path: dict):
+    """Test pattern-based classification (legacy, backup, archive)."""
+    legacy_file = recs_by_path["utils/helper_legacy.py"]
+    backup_file = recs_by_path["config.py.bak"]
+    archive_file = recs_by_path["docs/archive/old_doc.md"]
 
     # Legacy pattern should suggest archive
     assert legacy_file.recommendation == "archive"
@@ -236,87 +178,44 @@ def test_lifecycle_classifier_pattern_detection(
     assert archive_file.confidence >= 0.9
 
 
-def test_lifecycle_classifier_confidence_scores(
-    sample_repo_index: Path, tmp_path: Path
-):
+def test_lifecycle_classifier_confidence_scores(classified_result):
     """Test that confidence scores are within valid range."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
+    _, result = classified_result
 
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    # All confidence scores should be between 0 and 1
+    confidences = [r.confidence for r in result.recommendations]
+    assert 0.0 <= min(confidences) and max(confidences) <= 1.0
+    # All should have reasons
+    assert all(r.reasons for r in result.recommendations)
 
-    result = classifier.classify()
-
-    for rec in result.recommendations:
-        # All confidence scores should be between 0 and 1
-        assert 0.0 <= rec.confidence <= 1.0
-        # All should have reasons
-        assert len(rec.reasons) > 0
 
+@pytest.fixture(scope="module")
+def age_result(tmp_path_factory) -> dict:
+    """Recommendations by path for files of known ages (90-day threshold)."""
+    index_path = tmp_path_factory.mktemp("age_thresholds") / "repo_index.json"
+    index_path.write_bytes(_AGE_INDEX_BYTES)
 
-def test_lifecycle_classifier_age_thresholds(tmp_path: Path):
-    """Test age-based classification with different deprecation thresholds."""
-    # Create test index with known ages
-    index_path = tmp_path / "repo_index.json"
-    now = time.time()
-    seconds_per_day = 86400
-
-    payload = {
-        "scan_metadata": {"timestamp": "2025-11-15T10:00:00Z"},
-        "files": [
-            {
-                "path": "file_90days.py",
-                "mtime": now - 90 * seconds_per_day,
-                "kind": "python",
-            },
-            {
-                "path": "file_135days.py",
-                "mtime": now - 135 * seconds_per_day,
-                "kind": "python",
-            },
-            {
-                "path": "file_270days.py",
-                "mtime": now - 270 * seconds_per_day,
-                "kind": "python",
-            },
-            {
-                "path": "file_30days.py",
-                "mtime": now - 30 * seconds_per_day,
-                "kind": "python",
-            },
-        ],
-    }
-    index_path.write_text(json.dumps(payload), encoding="utf-8")
-
-    output_path = tmp_path / "output.json"
     classifier = LifecycleClassifier(
         index_path=index_path,
-        output_path=output_path,
+        output_path=index_path.with_name("output.json"),
         deprecation_days=90,
         confidence_threshold=0.7,
     )
+    return {r.path: r for r in classifier.classify().recommendations}
 
-    result = classifier.classify()
-
-    # 30 days: should keep (recent)
-    file_30 = next(r for r in result.recommendations if "file_30days.py" in r.path)
-    assert file_30.recommendation == "keep"
-
-    # 90 days: should review (exactly at threshold)
-    file_90 = next(r for r in result.recommendations if "file_90days.py" in r.path)
-    assert file_90.recommendation == "review"
 
-    # 135 days: should review (1.5× threshold)
-    file_135 = next(r for r in result.recommendations if "file_135days.py" in r.path)
-    assert file_135.recommendation == "review"
-
-    # 270 days: should archive (3× threshold)
-    file_270 = next(r for r in result.recommendations if "file_270days.py" in r.path)
-    assert file_270.recommendation == "archive"
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("file_30days.py", "keep"),  # recent
+        ("file_90days.py", "review"),  # exactly at threshold
+        ("file_135days.py", "review"),  # 1.5× threshold
+        ("file_270days.py", "archive"),  # 3× threshold
+    ],
+)
+def test_lifecycle_classifier_age_thresholds(age_result: dict, path: str, expected: str):
+    """Test age-based classification with different deprecation thresholds."""
+    assert age_result[path].recommendation == expected
 
 
 def test_run_lifecycle_classification_dry_run(
@@ -361,27 +260,16 @@ def test_run_lifecycle_classification_writes_file(
     assert output_path.exists()
 
     # Verify structure
-    data = json.loads(output_path.read_text(encoding="utf-8"))
+    data = fast_json.loads(output_path.read_bytes())
     assert "scan_metadata" in data
     assert "recommendations" in data
     assert "summary" in data
     assert len(data["recommendations"]) == 6
 
 
-def test_lifecycle_classifier_suggested_actions(
-    sample_repo_index: Path, tmp_path: Path
-):
+def test_lifecycle_classifier_suggested_actions(classified_result):
     """Test that suggested actions are generated for actionable items."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
-
-    result = classifier.classify()
+    _, result = classified_result
 
     # Archive recommendations should have suggested actions
     archive_recs = [r for r in result.recommendations if r.recommendation == "archive"]
@@ -398,22 +286,16 @@ def test_lifecycle_classifier_suggested_actions(
 
 
 def test_lifecycle_classifier_serialization_format(
-    sample_repo_index: Path, tmp_path: Path
+    sample_repo_index: Path, make_classifier
 ):
     """Test the JSON output format matches expected structure."""
-    output_path = tmp_path / "lifecycle_recommendations.json"
-
-    classifier = LifecycleClassifier(
-        index_path=sample_repo_index,
-        output_path=output_path,
-        deprecation_days=90,
-        confidence_threshold=0.7,
-    )
+    classifier = make_classifier(sample_repo_index)
+    output_path = classifier.output_path
 
     result = classifier.classify()
     classifier.save_result(result)
 
-    data = json.loads(output_path.read_text(encoding="utf-8"))
+    data = fast_json.loads(output_path.read_bytes())
 
     # Verify top-level structure
     assert set(data.keys()) == {"scan_metadata", "recommendations", "summary"}
@@ -444,3 +326,313 @@ def test_lifecycle_classifier_serialization_format(
     assert "by_decision" in summary
     assert "confidence_distribution" in summary
     assert summary["total_files"] == 6
+
+
+def test_lifecycle_classifier_ndjson_format(sample_repo_index: Path, make_classifier):
+    """Test NDJSON output: header line, then one recommendation per line."""
+    classifier = make_classifier(sample_repo_index, output_format="ndjson")
+    output_path = classifier.output_path
+
+    result = classifier.classify()
+    classifier.save_result(result)
+
+    lines = output_path.read_bytes().splitlines()
+    assert len(lines) == 7  # header + 6 recommendations
+
+    header = fast_json.loads(lines[0])
+    assert set(header.keys()) == {"scan_metadata", "summary"}
+    assert header["summary"]["total_files"] == 6
+
+    # Reader streams NDJSON and JSON into the same shape
+    header, recs = read_lifecycle_file(output_path)
+    recs = list(recs)
+    assert header["summary"]["total_files"] == 6
+    assert [r["path"] for r in recs] == [r.path for r in result.recommendations]
+
+    classifier.output_format = "json"
+    classifier.save_result(result)
+    json_header, json_recs = read_lifecycle_file(output_path)
+    assert json_header["summary"] == header["summary"]
+    assert list(json_recs) == recs
+
+
+def test_inspect_reports_bad_ndjson_record(tmp_path: Path, monkeypatch, capsys):
+    """Test that a malformed NDJSON record exits 1 with a message, not a traceback."""
+    from codewiki import inspect_lifecycle_result
+
+    results = tmp_path / "lifecycle_recommendations.ndjson"
+    results.write_bytes(
+        b'{"scan_metadata": {}, "summary": {"total_files": 2}}\n'
+        b'{"path": "a.py", "recommendation": "review"}\n'
+        b'{"path": "b.py", "recommendation"\n'
+    )
+    monkeypatch.setattr("sys.argv", ["inspect", "--file", str(results)])
+
+    with pytest.raises(SystemExit) as exc:
+        inspect_lifecycle_result.main()
+
+    assert exc.value.code == 1
+    assert "Invalid JSON" in capsys.readouterr().err
+
+
+def test_inspect_runs_as_script(tmp_path: Path):
+    """Test that inspect_lifecycle_result.py works when invoked by path."""
+    import subprocess
+    import sys
+
+    import codewiki.inspect_lifecycle_result as inspect_module
+
+    results = tmp_path / "lifecycle_recommendations.ndjson"
+    results.write_bytes(
+        b'{"scan_metadata": {}, "summary": {"total_files": 1}}\n'
+        b'{"path": "a.py", "recommendation": "review"}\n'
+    )
+
+    proc = subprocess.run(
+        [sys.executable, inspect_module.__file__, "--file", str(results)],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert "a.py" in proc.stdout
+
+
+class _FakeLLMClient:
+    """Minimal LLM client: records peak concurrency, fails for one path."""
+
+    def __init__(self, delay: float = 0.02):
+        import threading
+
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_usage_stats(self):
+        return {"total_requests": 0}
+
+    def generate(self, prompt, system_prompt=None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if "ancient.py" in prompt:
+                raise RuntimeError("boom")
+            return '{"recommendation": "keep", "confidence": 0.95, "reasons": ["llm"]}'
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_lifecycle_classifier_llm_full_mode_concurrent(
+    sample_repo_index: Path, make_classifier, concurrency: int
+):
+    """Test that parallel LLM requests keep input order and consistent stats."""
+    classifier = make_classifier(
+        sample_repo_index,
+        llm_mode="full",
+        llm_concurrency=concurrency,
+    )
+    client = _FakeLLMClient()
+
+    result = classifier.classify(use_llm=True, llm_client=client)
+
+    paths = [r.path for r in result.recommendations]
+    expected = [e["path"] for e in fast_json.loads(sample_repo_index.read_bytes())["files"]]
+    assert paths == expected
+
+    by_path = {r.path: r for r in result.recommendations}
+    # Failed request falls back to rules; others come from the LLM
+    assert by_path["legacy_code/ancient.py"].reasons != ["llm"]
+    assert by_path["config.py.bak"].reasons == ["llm"]
+
+    stats = result.scan_metadata["llm_stats"]
+    assert stats == {"attempts": 6, "successes": 5, "fallbacks": 1}
+    if concurrency == 1:
+        assert client.peak == 1
+    else:
+        assert client.peak > 1
+
+
+@pytest.mark.parametrize(
+    "env_value,expected", [(None, 8), ("3", 3), ("many", 8), ("0", 8)]
+)
+def test_lifecycle_classifier_llm_concurrency_from_env(
+    sample_repo_index: Path, make_classifier, monkeypatch, env_value, expected
+):
+    """Test that unset llm_concurrency reads $CODEWIKI_LLM_CONCURRENCY defensively."""
+    monkeypatch.delenv("CODEWIKI_LLM_CONCURRENCY", raising=False)
+    if env_value is not None:
+        monkeypatch.setenv("CODEWIKI_LLM_CONCURRENCY", env_value)
+
+    classifier = make_classifier(sample_repo_index)
+
+    assert classifier.llm_concurrency == expected
+
+
+def test_lifecycle_classifier_llm_batched_prompts(sample_repo_index: Path, make_classifier):
+    """Test batched prompts map results by index and retry missing files singly."""
+    prompts = []
+
+    class BatchClient(_FakeLLMClient):
+        def generate(self, prompt, system_prompt=None):
+            prompts.append(prompt)
+            if "JSON array" in prompt:
+                # Answer every file but the first of the batch, in reverse order
+                count = prompt.count(" | Kind: ")
+                return json.dumps(
+                    [
+                        {"index": i, "recommendation": "review", "confidence": 0.7, "reasons": ["batch"]}
+                        for i in reversed(range(1, count))
+                    ]
+                )
+            return '{"recommendation": "keep", "confidence": 0.9, "reasons": ["single"]}'
+
+    classifier = make_classifier(
+        sample_repo_index,
+        llm_mode="full",
+        llm_concurrency=1,
+        llm_batch_size=3,
+    )
+
+    result = classifier.classify(use_llm=True, llm_client=BatchClient())
+
+    reasons = [r.reasons for r in result.recommendations]
+    assert reasons == [["single"], ["batch"], ["batch"], ["single"], ["batch"], ["batch"]]
+    assert len(prompts) == 4  # 2 batches + 2 single-file retries
+    assert result.scan_metadata["llm_stats"] == {"attempts": 6, "successes": 6, "fallbacks": 0}
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '{"recommendation": "review", "confidence": 0.5, "reasons": ["a, }"],}',
+        "{'recommendation': 'review', 'confidence': 0.5, 'reasons': ['a, }'], 'suggested_action': None}",
+        '{recommendation: "review", confidence: 0.5, reasons: ["a, }"], suggested_action: None}',
+    ],
+)
+def test_parse_llm_json_repairs_near_json(response: str):
+    """Test that trailing commas, Python literals and bare keys are repaired."""
+    parsed = LifecycleClassifier._parse_llm_json(f"Here you go:\n{response}")
+
+    assert parsed["recommendation"] == "review"
+    assert parsed["confidence"] == 0.5
+    assert parsed["reasons"] == ["a, }"]  # string contents untouched
+    assert parsed.get("suggested_action") is None
+
+
+def test_parse_llm_json_memoizes_repeat_replies():
+    """Test that identical replies hit the parse cache but return fresh dicts."""
+    response = '{"recommendation": "keep", "confidence": 0.9, "reasons": ["memo"]}'
+    first = LifecycleClassifier._parse_llm_json(response)
+    first["recommendation"] = "delete"
+
+    hits = _parse_llm_json_cached.cache_info().hits
+    second = LifecycleClassifier._parse_llm_json(response)
+
+    assert _parse_llm_json_cached.cache_info().hits == hits + 1
+    assert second["recommendation"] == "keep"
+
+
+@pytest.mark.parametrize(
+    "path,age_days,kind,expected",
+    [
+        ("digital_me/core/engine.py", 5, "python", (True, "keep")),
+        ("digital_me/core/engine.py", 60, "python", (False, None)),
+        ("logs/Run.LOG", 5, "other", (True, "archive")),
+        ("notes.md~", 60, "md", (True, "archive")),
+        ("docs/guide.md", 400, "md", (True, "review")),
+        ("src/module.py", 400, "python", (False, None)),
+    ],
+)
+def test_lifecycle_classifier_clear_cases(
+    sample_repo_index: Path, make_classifier, path, age_days, kind, expected
+):
+    """Test hybrid-mode clear-case shortcuts."""
+    classifier = make_classifier(sample_repo_index)
+    entry = {"path": path, "kind": kind, "mtime": _FROZEN_NOW - age_days * SECONDS_PER_DAY}
+    original = dict(entry)
+
+    assert classifier._is_clear_case(entry) == expected
+    classifier._classify_by_rules(entry)
+    assert entry == original  # input entries are not annotated
+
+
+def test_lifecycle_classifier_llm_model_and_options(sample_repo_index: Path, make_classifier):
+    """Test that llm_model/llm_options reach generate() only when configured."""
+
+    class RecordingClient(_FakeLLMClient):
+        def __init__(self):
+            super().__init__(delay=0)
+            self.kwargs = []
+
+        def generate(self, prompt, system_prompt=None, **kwargs):
+            self.kwargs.append(kwargs)
+            return '{"recommendation": "keep", "confidence": 0.95, "reasons": ["llm"]}'
+
+    client = RecordingClient()
+    make_classifier(sample_repo_index).classify(use_llm=True, llm_client=client)
+    assert all(kwargs == {} for kwargs in client.kwargs)
+
+    client = RecordingClient()
+    make_classifier(
+        sample_repo_index,
+        llm_model="llama3.2:3b-instruct-q4_K_M",
+        llm_options={"num_ctx": 1024, "num_predict": 128},
+    ).classify(use_llm=True, llm_client=client)
+    assert client.kwargs[0] == {
+        "model": "llama3.2:3b-instruct-q4_K_M",
+        "options": {"num_ctx": 1024, "num_predict": 128},
+    }
+
+
+def test_lifecycle_classifier_structured_output(sample_repo_index: Path, make_classifier):
+    """Test that llm_structured_output sends the lifecycle schema as format."""
+    from codewiki.lifecycle_classifier import LIFECYCLE_SCHEMA
+
+    formats = []
+
+    class SchemaClient(_FakeLLMClient):
+        def generate(self, prompt, system_prompt=None, format=None):
+            formats.append(format)
+            return '{"recommendation": "archive", "confidence": 0.9, "reasons": ["schema"]}'
+
+    result = make_classifier(
+        sample_repo_index,
+        llm_structured_output=True,
+    ).classify(use_llm=True, llm_client=SchemaClient(delay=0))
+
+    assert formats and all(f is LIFECYCLE_SCHEMA for f in formats)
+    assert {r.recommendation for r in result.recommendations} == {"archive"}
+    assert result.scan_metadata["llm_parse"]["parse_failed"] == 0
+
+
+def test_lifecycle_classifier_llm_cache_similar(tmp_path: Path, make_classifier):
+    """Test that files of the same kind/age bucket/top dir share one LLM call."""
+    index_path = tmp_path / "repo_index.json"
+    index_path.write_bytes(_SIMILAR_INDEX_BYTES)
+
+    prompts = []
+
+    class CountingClient(_FakeLLMClient):
+        def generate(self, prompt, system_prompt=None):
+            prompts.append(prompt)
+            return '{"recommendation": "keep", "confidence": 0.9, "reasons": ["llm"]}'
+
+    result = make_classifier(
+        index_path,
+        llm_cache_similar=True,
+    ).classify(use_llm=True, llm_client=CountingClient(delay=0))
+
+    assert len(prompts) == 2
+    assert [r.path for r in result.recommendations] == [f["path"] for f in _SIMILAR_FILES]
+    stats = result.scan_metadata["llm_stats"]
+    assert stats["cache_hits"] == 4
+    assert stats["attempts"] == stats["successes"] + stats["fallbacks"] == 6
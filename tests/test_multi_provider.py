@@ -11,13 +11,137 @@ Validates:
 
 import json
 import os
-import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
 from codewiki.llm_client import LocalLLMClient, ProviderConfig
+from tests import _json_compat as fast_json
+
+
+# Config path that never exists: clients built with it start with no providers
+_NO_CONFIG = Path("nonexistent.json")
+
+# Every provider type is loaded, not just ollama/lm_studio
+_ALL_PROVIDERS_CONFIG = {
+    "providers": [
+        {
+            "provider": "ollama",
+            "base_url": "http://localhost:11434",
+            "models": ["qwen3:8b"],
+            "priority": 1,
+            "enabled": True,
+        },
+        {
+            "provider": "openai",
+            "base_url": "https://api.openai.com",
+            "api_key": "${OPENAI_API_KEY}",
+            "models": ["gpt-4"],
+            "priority": 2,
+            "enabled": True,
+        },
+        {
+            "provider": "custom_cloud",
+            "base_url": "http://localhost:8317/v1",
+            "api_key": "sk-test",
+            "models": ["gpt-5.2"],
+            "priority": 3,
+            "enabled": True,
+        },
+    ]
+}
+
+# Custom provider with an explicit api_type
+_API_TYPE_CONFIG = {
+    "providers": [
+        {
+            "provider": "custom",
+            "api_type": "openai",
+            "base_url": "http://custom.local",
+            "models": ["custom-model"],
+            "priority": 1,
+            "enabled": True,
+        },
+    ]
+}
+
+# Lower number = higher priority; listed out of order
+_PRIORITY_CONFIG = {
+    "providers": [
+        {
+            "provider": "low_priority",
+            "base_url": "http://low",
+            "models": ["model"],
+            "priority": 10,
+            "enabled": True,
+        },
+        {
+            "provider": "high_priority",
+            "base_url": "http://high",
+            "models": ["model"],
+            "priority": 1,
+            "enabled": True,
+        },
+        {
+            "provider": "medium_priority",
+            "base_url": "http://medium",
+            "models": ["model"],
+            "priority": 5,
+            "enabled": True,
+        },
+    ]
+}
+
+# Highest-priority provider is disabled
+_DISABLED_CONFIG = {
+    "providers": [
+        {
+            "provider": "disabled",
+            "base_url": "http://disabled",
+            "models": ["model"],
+            "priority": 1,
+            "enabled": False,
+        },
+        {
+            "provider": "enabled",
+            "base_url": "http://enabled",
+            "models": ["model"],
+            "priority": 2,
+            "enabled": True,
+        },
+    ]
+}
+
+
+# Serialized once at import; tests only write the bytes
+_ALL_PROVIDERS_CONFIG_BYTES = fast_json.dumps(_ALL_PROVIDERS_CONFIG)
+_API_TYPE_CONFIG_BYTES = fast_json.dumps(_API_TYPE_CONFIG)
+_PRIORITY_CONFIG_BYTES = fast_json.dumps(_PRIORITY_CONFIG)
+_DISABLED_CONFIG_BYTES = fast_json.dumps(_DISABLED_CONFIG)
+
+
+def _write_config(tmp_path: Path, data: bytes) -> Path:
+    """Write a pre-serialized provider config into the test's tmp_path."""
+    config_path = tmp_path / "llm_providers.json"
+    config_path.write_bytes(data)
+    return config_path
+
+
+@pytest.fixture(scope="module")
+def stub_client() -> LocalLLMClient:
+    """Provider-less client for tests of pure helpers (_detect_api_type etc.)."""
+    return LocalLLMClient(config_path=_NO_CONFIG)
+
+
+def _ollama_stream_response(*pieces: str) -> Mock:
+    """Mock a 200 Ollama /api/generate response (streamed NDJSON chunks)."""
+    lines = [json.dumps({"response": p, "done": False}).encode() for p in pieces]
+    lines.append(json.dumps({"response": "", "done": True}).encode())
+    response = Mock(status_code=200)
+    response.iter_lines.side_effect = lambda **kwargs: iter(lines)
+    return response
 
 
 class TestProviderConfig:
@@ -48,160 +172,89 @@ class TestProviderConfig:
 class TestProviderLoading:
     """Test loading providers from config"""
 
-    def test_load_all_provider_types(self):
+    def test_load_all_provider_types(self, tmp_path):
         """Test that all provider types are loaded (not just ollama/lm_studio)"""
-        config_data = {
-            "providers": [
-                {
-                    "provider": "ollama",
-                    "base_url": "http://localhost:11434",
-                    "models": ["qwen3:8b"],
-                    "priority": 1,
-                    "enabled": True,
-                },
-                {
-                    "provider": "openai",
-                    "base_url": "https://api.openai.com",
-                    "api_key": "${OPENAI_API_KEY}",
-                    "models": ["gpt-4"],
-                    "priority": 2,
-                    "enabled": True,
-                },
-                {
-                    "provider": "custom_cloud",
-                    "base_url": "http://localhost:8317/v1",
-                    "api_key": "sk-test",
-                    "models": ["gpt-5.2"],
-                    "priority": 3,
-                    "enabled": True,
-                },
-            ]
-        }
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(config_data, f)
-            config_path = Path(f.name)
-
-        try:
-            client = LocalLLMClient(config_path=config_path)
-            
-            # Should load all 3 providers
-            assert len(client.providers) == 3
-            
-            # Check provider names
-            provider_names = [p.provider for p in client.providers]
-            assert "ollama" in provider_names
-            assert "openai" in provider_names
-            assert "custom_cloud" in provider_names
-            
-        finally:
-            config_path.unlink()
-
-    def test_load_providers_with_api_type(self):
+        config_path = _write_config(tmp_path, _ALL_PROVIDERS_CONFIG_BYTES)
+
+        client = LocalLLMClient(config_path=config_path)
+
+        # Should load all 3 providers
+        assert len(client.providers) == 3
+
+        # Check provider names
+        provider_names = {p.provider for p in client.providers}
+        assert "ollama" in provider_names
+        assert "openai" in provider_names
+        assert "custom_cloud" in provider_names
+
+    def test_load_providers_with_api_type(self, tmp_path):
         """Test loading providers with explicit api_type field"""
-        config_data = {
-            "providers": [
-                {
-                    "provider": "custom",
-                    "api_type": "openai",
-                    "base_url": "http://custom.local",
-                    "models": ["custom-model"],
-                    "priority": 1,
-                    "enabled": True,
-                },
-            ]
-        }
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(config_data, f)
-            config_path = Path(f.name)
-
-        try:
-            client = LocalLLMClient(config_path=config_path)
-            assert len(client.providers) == 1
-            assert client.providers[0].api_type == "openai"
-        finally:
-            config_path.unlink()
+        config_path = _write_config(tmp_path, _API_TYPE_CONFIG_BYTES)
+
+        client = LocalLLMClient(config_path=config_path)
+        assert len(client.providers) == 1
+        assert client.providers[0].api_type == "openai"
 
 
 class TestAPITypeDetection:
     """Test API type detection logic"""
 
-    def test_explicit_api_type(self):
+    def test_explicit_api_type(self, stub_client):
         """Test that explicit api_type is used"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="custom",
             base_url="http://test",
             api_type="ollama",
         )
         
-        assert client._detect_api_type(provider) == "ollama"
+        assert stub_client._detect_api_type(provider) == "ollama"
 
-    def test_detect_ollama_by_name(self):
+    def test_detect_ollama_by_name(self, stub_client):
         """Test auto-detection of Ollama by provider name"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="ollama",
             base_url="http://localhost:11434",
         )
         
-        assert client._detect_api_type(provider) == "ollama"
+        assert stub_client._detect_api_type(provider) == "ollama"
 
-    def test_detect_openai_by_name(self):
+    @pytest.mark.parametrize(
+        "provider_name", ["lm_studio", "openai", "anthropic", "groq", "together"]
+    )
+    def test_detect_openai_by_name(self, stub_client, provider_name):
         """Test auto-detection of OpenAI-compatible by provider name"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
-        test_cases = [
-            "lm_studio",
-            "openai",
-            "anthropic",
-            "groq",
-            "together",
-        ]
-        
-        for provider_name in test_cases:
-            provider = ProviderConfig(
-                provider=provider_name,
-                base_url="http://test",
-            )
-            assert client._detect_api_type(provider) == "openai", \
-                f"Failed for provider: {provider_name}"
+        provider = ProviderConfig(
+            provider=provider_name,
+            base_url="http://test",
+        )
+        assert stub_client._detect_api_type(provider) == "openai"
 
-    def test_default_to_openai(self):
+    def test_default_to_openai(self, stub_client):
         """Test that unknown providers default to OpenAI format"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="unknown_custom_provider",
             base_url="http://test",
         )
         
         # Should default to openai (more common)
-        assert client._detect_api_type(provider) == "openai"
+        assert stub_client._detect_api_type(provider) == "openai"
 
 
 class TestAuthentication:
     """Test API key resolution and authentication"""
 
-    def test_resolve_direct_api_key(self):
+    def test_resolve_direct_api_key(self, stub_client):
         """Test resolving direct API key"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="openai",
             base_url="http://test",
             api_key="sk-direct-key-123",
         )
         
-        assert client._resolve_api_key(provider) == "sk-direct-key-123"
+        assert stub_client._resolve_api_key(provider) == "sk-direct-key-123"
 
-    def test_resolve_env_var_api_key(self):
+    def test_resolve_env_var_api_key(self, stub_client):
         """Test resolving API key from environment variable"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="openai",
             base_url="http://test",
@@ -209,12 +262,10 @@ class TestAuthentication:
         )
         
         with patch.dict(os.environ, {"TEST_API_KEY": "sk-from-env"}):
-            assert client._resolve_api_key(provider) == "sk-from-env"
+            assert stub_client._resolve_api_key(provider) == "sk-from-env"
 
-    def test_resolve_missing_env_var(self):
+    def test_resolve_missing_env_var(self, stub_client):
         """Test handling of missing environment variable"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="openai",
             base_url="http://test",
@@ -222,107 +273,168 @@ class TestAuthentication:
         )
         
         # Should return None and log warning
-        assert client._resolve_api_key(provider) is None
+        assert stub_client._resolve_api_key(provider) is None
 
-    def test_no_api_key(self):
+    def test_no_api_key(self, stub_client):
         """Test provider without API key"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
-        
         provider = ProviderConfig(
             provider="ollama",
             base_url="http://localhost:11434",
         )
         
-        assert client._resolve_api_key(provider) is None
+        assert stub_client._resolve_api_key(provider) is None
+
+
+class TestProviderPreparation:
+    """Test derived provider fields (URLs, auth headers, API type)"""
+
+    @pytest.mark.parametrize(
+        "provider,base_url,generate_url,health_url",
+        [
+            ("ollama", "http://localhost:11434/", "http://localhost:11434/api/generate", "http://localhost:11434/api/tags"),
+            ("lm_studio", "http://localhost:1234", "http://localhost:1234/v1/chat/completions", "http://localhost:1234/v1/models"),
+            ("openai", "https://api.openai.com/v1", "https://api.openai.com/v1/chat/completions", "https://api.openai.com/v1/models"),
+        ],
+    )
+    def test_urls_derived_once(self, provider, base_url, generate_url, health_url):
+        """Test that endpoint URLs are derived from base_url and API type"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        config = client._prepare_provider(ProviderConfig(provider=provider, base_url=base_url))
+
+        assert config.generate_url == generate_url
+        assert config.health_url == health_url
+        assert config.api_type is None  # raw config untouched
+
+    def test_auth_headers_from_api_key(self):
+        """Test that the Authorization header is built from the resolved key"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        with patch.dict(os.environ, {"TEST_API_KEY": "sk-from-env"}):
+            config = client._prepare_provider(
+                ProviderConfig(provider="openai", base_url="http://test", api_key="${TEST_API_KEY}")
+            )
+
+        assert config.auth_headers == {"Authorization": "Bearer sk-from-env"}
+        assert "sk-from-env" not in repr(config)
 
 
 class TestPrioritySelection:
     """Test priority-based provider selection"""
 
-    def test_select_by_priority(self):
+    def test_select_by_priority(self, tmp_path):
         """Test that providers are selected by priority (lower number = higher priority)"""
-        config_data = {
-            "providers": [
-                {
-                    "provider": "low_priority",
-                    "base_url": "http://low",
-                    "models": ["model"],
-                    "priority": 10,
-                    "enabled": True,
-                },
-                {
-                    "provider": "high_priority",
-                    "base_url": "http://high",
-                    "models": ["model"],
-                    "priority": 1,
-                    "enabled": True,
-                },
-                {
-                    "provider": "medium_priority",
-                    "base_url": "http://medium",
-                    "models": ["model"],
-                    "priority": 5,
-                    "enabled": True,
-                },
-            ]
-        }
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(config_data, f)
-            config_path = Path(f.name)
-
-        try:
-            with patch.object(LocalLLMClient, "_check_provider_health", return_value=True):
-                client = LocalLLMClient(config_path=config_path)
-                
-                # Should select high_priority (priority=1)
-                assert client.active is not None
-                assert client.active.provider == "high_priority"
-        finally:
-            config_path.unlink()
-
-    def test_skip_disabled_providers(self):
+        config_path = _write_config(tmp_path, _PRIORITY_CONFIG_BYTES)
+
+        with patch.object(LocalLLMClient, "_check_provider_health", return_value=True):
+            client = LocalLLMClient(config_path=config_path)
+
+            # Should select high_priority (priority=1)
+            assert client.active is not None
+            assert client.active.provider == "high_priority"
+
+    def test_skip_disabled_providers(self, tmp_path):
         """Test that disabled providers are skipped"""
-        config_data = {
-            "providers": [
-                {
-                    "provider": "disabled",
-                    "base_url": "http://disabled",
-                    "models": ["model"],
-                    "priority": 1,
-                    "enabled": False,
-                },
-                {
-                    "provider": "enabled",
-                    "base_url": "http://enabled",
-                    "models": ["model"],
-                    "priority": 2,
-                    "enabled": True,
-                },
-            ]
-        }
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(config_data, f)
-            config_path = Path(f.name)
-
-        try:
-            with patch.object(LocalLLMClient, "_check_provider_health", return_value=True):
-                client = LocalLLMClient(config_path=config_path)
-                
-                # Should select enabled provider (priority=2)
-                assert client.active is not None
-                assert client.active.provider == "enabled"
-        finally:
-            config_path.unlink()
+        config_path = _write_config(tmp_path, _DISABLED_CONFIG_BYTES)
+
+        with patch.object(LocalLLMClient, "_check_provider_health", return_value=True):
+            client = LocalLLMClient(config_path=config_path)
+
+            # Should select enabled provider (priority=2)
+            assert client.active is not None
+            assert client.active.provider == "enabled"
+
+    def test_slow_lower_priority_probe_is_not_awaited(self):
+        """Test that selection returns once the best healthy provider answers"""
+        import time
+
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        fast = ProviderConfig(provider="fast", base_url="http://fast", priority=1)
+        slow = ProviderConfig(provider="slow", base_url="http://slow", priority=2)
+
+        def check(provider):
+            if provider is slow:
+                time.sleep(1.0)
+            return True
+
+        with patch.object(client, "_check_provider_health", side_effect=check):
+            start = time.perf_counter()
+            assert client._first_healthy([fast, slow]) is fast
+            assert time.perf_counter() - start < 0.5
+
+
+class TestHealthCache:
+    """Test TTL caching of provider health checks"""
+
+    def test_healthy_probe_is_reused_across_clients(self, tmp_path, monkeypatch):
+        """Test that a healthy result is persisted and skips the next probe"""
+        monkeypatch.setenv("CODEWIKI_CACHE_DIR", str(tmp_path / "cache"))
+        config_path = tmp_path / "llm_providers.json"
+        config_path.write_text(
+            json.dumps({"providers": [{"provider": "ollama", "base_url": "http://one"}]}),
+            encoding="utf-8",
+        )
+
+        with patch("requests.Session.get", return_value=Mock(status_code=200)) as get:
+            first = LocalLLMClient(config_path=config_path)
+            second = LocalLLMClient(config_path=config_path)
+
+        assert first.active is not None and second.active is not None
+        assert get.call_count == 1
+        assert "ollama|http://one" in json.loads((tmp_path / "cache" / "health.json").read_text())
+
+    def test_failed_probe_is_not_cached(self, tmp_path, monkeypatch):
+        """Test that an unhealthy provider is probed again next time"""
+        monkeypatch.setenv("CODEWIKI_CACHE_DIR", str(tmp_path / "cache"))
+        config_path = tmp_path / "llm_providers.json"
+        config_path.write_text(
+            json.dumps({"providers": [{"provider": "ollama", "base_url": "http://down"}]}),
+            encoding="utf-8",
+        )
+
+        with patch("requests.Session.get", return_value=Mock(status_code=503)) as get:
+            LocalLLMClient(config_path=config_path)
+            client = LocalLLMClient(config_path=config_path)
+
+        assert client.active is None
+        assert get.call_count == 2
+
+    def test_late_probe_result_is_kept_and_saved(self, tmp_path, monkeypatch):
+        """Test that a probe finishing after selection writes to the shared cache"""
+        import time
+
+        monkeypatch.setenv("CODEWIKI_CACHE_DIR", str(tmp_path / "cache"))
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        fast = ProviderConfig(provider="fast", base_url="http://fast", priority=1)
+        slow = ProviderConfig(provider="slow", base_url="http://slow", priority=2)
+        slow_started = threading.Event()
+        slow_done = threading.Event()
+
+        def get(url, **kwargs):
+            if "slow" in url:
+                slow_started.set()
+                time.sleep(0.2)
+                slow_done.set()
+            else:
+                slow_started.wait(2.0)  # both probes in flight before selection
+            return Mock(status_code=200)
+
+        with patch.object(client._session, "get", side_effect=get):
+            assert client._first_healthy([fast, slow]) is fast
+            client._save_health_cache()
+            assert slow_done.wait(2.0)
+            time.sleep(0.05)  # let the probe thread record its result
+            client._save_health_cache()
+
+        saved = json.loads((tmp_path / "cache" / "health.json").read_text())
+        assert set(saved) == {"fast|http://fast", "slow|http://slow"}
+
 
 
 class TestGenerateRouting:
     """Test generate() routing based on API type"""
 
-    def test_route_to_ollama(self):
+    def test_route_to_ollama(self, monkeypatch):
         """Test that Ollama providers route to _generate_ollama()"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
+        client = LocalLLMClient(config_path=_NO_CONFIG)
         client.active = ProviderConfig(
             provider="ollama",
             base_url="http://localhost:11434",
@@ -330,14 +442,18 @@ class TestGenerateRouting:
             model="qwen3:8b",
         )
         
-        with patch.object(client, "_generate_ollama", return_value="ollama response") as mock:
-            result = client.generate("test prompt")
-            assert result == "ollama response"
-            mock.assert_called_once()
+        calls = []
+        monkeypatch.setattr(
+            client, "_generate_ollama", lambda *a, **kw: calls.append(a) or "ollama response"
+        )
 
-    def test_route_to_openai(self):
+        result = client.generate("test prompt")
+        assert result == "ollama response"
+        assert len(calls) == 1
+
+    def test_route_to_openai(self, monkeypatch):
         """Test that OpenAI-compatible providers route to _generate_openai()"""
-        client = LocalLLMClient(config_path=Path("nonexistent.json"))
+        client = LocalLLMClient(config_path=_NO_CONFIG)
         client.active = ProviderConfig(
             provider="openai",
             base_url="https://api.openai.com",
@@ -345,10 +461,292 @@ class TestGenerateRouting:
             model="gpt-4",
         )
         
-        with patch.object(client, "_generate_openai", return_value="openai response") as mock:
-            result = client.generate("test prompt")
-            assert result == "openai response"
-            mock.assert_called_once()
+        calls = []
+        monkeypatch.setattr(
+            client, "_generate_openai", lambda *a, **kw: calls.append(a) or "openai response"
+        )
+
+        result = client.generate("test prompt")
+        assert result == "openai response"
+        assert len(calls) == 1
+
+
+
+class TestResultCache:
+    """Test the in-process generate() result LRU"""
+
+    def test_repeat_request_is_served_from_cache(self):
+        """Test that identical low-temperature requests reach the server once"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        with patch.object(
+            client._session, "post", side_effect=lambda *a, **kw: _ollama_stream_response("ok")
+        ) as post:
+            assert client.generate("prompt", system_prompt="sys") == "ok"
+            assert client.generate("prompt", system_prompt="sys") == "ok"
+            assert post.call_count == 1
+
+            client.generate("prompt", system_prompt="other")
+            client.generate("prompt", system_prompt="sys", options={"temperature": 0.8})
+            client.generate("prompt", system_prompt="sys", options={"temperature": 0.8})
+            assert post.call_count == 4
+
+        assert client.get_usage_stats()["total_requests"] == 4
+
+    def test_non_numeric_temperature_is_not_cached(self):
+        """Test that options={"temperature": None} bypasses the cache"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        with patch.object(
+            client._session, "post", side_effect=lambda *a, **kw: _ollama_stream_response("ok")
+        ) as post:
+            for _ in range(2):
+                assert client.generate("prompt", options={"temperature": None}) == "ok"
+            assert post.call_count == 2
+
+
+class TestPreload:
+    """Test preload() keep_alive / prefix pinning"""
+
+    def test_preload_ollama_sets_keep_alive_and_num_keep(self):
+        """Test that preload warms Ollama and later requests reuse its settings"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama",
+            base_url="http://localhost:11434",
+            api_type="ollama",
+            model="qwen3:8b",
+        )
+
+        ok_response = _ollama_stream_response("ok")
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            assert client.preload(system_prompt="x" * 400, keep_alive="30m") is True
+            assert post.call_args.kwargs["json"]["keep_alive"] == "30m"
+
+            client.generate("prompt", system_prompt="x" * 400)
+            payload = post.call_args.kwargs["json"]
+            assert payload["keep_alive"] == "30m"
+            assert payload["options"]["num_keep"] == 100
+
+    def test_preload_openai_is_noop(self):
+        """Test that preload does nothing for OpenAI-compatible providers"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="lm_studio",
+            base_url="http://localhost:1234",
+            api_type="openai",
+        )
+
+        with patch.object(client._session, "post") as post:
+            assert client.preload(system_prompt="system") is False
+            post.assert_not_called()
+
+
+class TestGenerateOverrides:
+    """Test per-request model/options overrides"""
+
+    def test_ollama_model_and_options_override(self):
+        """Test that model and options are merged into the Ollama payload"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama",
+            base_url="http://localhost:11434",
+            api_type="ollama",
+            model="qwen3:8b",
+        )
+
+        ok_response = _ollama_stream_response("ok")
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            client.generate(
+                "prompt",
+                model="llama3.2:3b-instruct-q4_K_M",
+                options={"num_ctx": 1024, "num_predict": 128, "temperature": 0},
+            )
+            payload = post.call_args.kwargs["json"]
+
+        assert payload["model"] == "llama3.2:3b-instruct-q4_K_M"
+        assert payload["options"] == {"temperature": 0, "num_predict": 128, "num_ctx": 1024}
+
+    def test_openai_options_mapping(self):
+        """Test that num_predict maps to max_tokens and unknown options are dropped"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="lm_studio",
+            base_url="http://localhost:1234",
+            api_type="openai",
+        )
+
+        ok_response = Mock(status_code=200)
+        ok_response.content = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            client.generate("prompt", options={"num_ctx": 1024, "num_predict": 128, "temperature": 0})
+            payload = post.call_args.kwargs["json"]
+
+        assert payload["max_tokens"] == 128
+        assert payload["temperature"] == 0
+        assert "num_ctx" not in payload
+
+    def test_format_schema_passthrough(self):
+        """Test that a JSON schema reaches Ollama format and OpenAI response_format"""
+        schema = {"type": "object", "properties": {"a": {"type": "string"}}}
+        ok_response = _ollama_stream_response("{}")
+        ok_response.content = json.dumps({"choices": [{"message": {"content": "{}"}}]}).encode()
+
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            client.generate("prompt", format=schema)
+            assert post.call_args.kwargs["json"]["format"] == schema
+
+        client.active = ProviderConfig(
+            provider="lm_studio", base_url="http://localhost:1234", api_type="openai"
+        )
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            client.generate("prompt", format=schema)
+            response_format = post.call_args.kwargs["json"]["response_format"]
+            assert response_format["type"] == "json_schema"
+            assert response_format["json_schema"]["schema"] == schema
+
+
+class TestOllamaStreaming:
+    """Test streamed Ollama responses"""
+
+    def test_stream_concatenates_and_stops_early(self):
+        """Test that chunks are joined and reading stops at stop_substring"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        response = _ollama_stream_response('{"a": ', "1}", " trailing", " text")
+        with patch.object(client._session, "post", return_value=response) as post:
+            assert client.generate("prompt") == '{"a": 1} trailing text'
+            assert post.call_args.kwargs["json"]["stream"] is True
+            assert client.generate("prompt", stop_substring="}") == '{"a": 1}'
+        assert response.close.call_count == 2
+
+
+class TestGenerateBatch:
+    """Test generate_batch() prompt packing"""
+
+    def test_packs_prompts_into_one_request(self):
+        """Test that a batch is one request and the reply is split by index"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        ok_response = _ollama_stream_response("Here:\n[2] be", "ta\n[1] alpha\n")
+        with patch.object(client._session, "post", return_value=ok_response) as post:
+            answers = client.generate_batch(["a?", "b?", "c?"], batch_size=3, per_item_tokens=50)
+
+        post.assert_called_once()
+        payload = post.call_args.kwargs["json"]
+        assert "[1] a?" in payload["prompt"] and "[3] c?" in payload["prompt"]
+        assert payload["options"]["num_predict"] == 150
+        assert answers == ["alpha", "beta", None]
+        assert client.get_usage_stats()["total_requests"] == 1
+
+
+class TestGenerateMany:
+    """Test generate_many() concurrent fan-out"""
+
+    def test_fans_out_and_keeps_order(self, monkeypatch):
+        """Test that requests overlap, results keep input order and usage is exact"""
+        import threading
+        import time
+
+        monkeypatch.setenv("CODEWIKI_LLM_CONCURRENCY", "4")
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fake_post(url, json, timeout, **kwargs):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return _ollama_stream_response(json["prompt"].upper())
+
+        with client, patch.object(client._session, "post", side_effect=fake_post):
+            answers = client.generate_many([f"p{i}" for i in range(8)])
+
+        assert answers == [f"P{i}" for i in range(8)]
+        assert state["peak"] > 1
+        assert client.get_usage_stats()["total_requests"] == 8
+        assert client._executor is None  # closed on exit
+
+
+    def test_groups_requests_by_system_prompt(self, monkeypatch):
+        """Test that identical system prompts are sent back-to-back with keep_alive"""
+        monkeypatch.setenv("CODEWIKI_LLM_CONCURRENCY", "1")
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="ollama", base_url="http://localhost:11434", api_type="ollama"
+        )
+
+        sent = []
+
+        def fake_post(url, json, timeout, **kwargs):
+            sent.append((json["system"], json["keep_alive"]))
+            return _ollama_stream_response(json["prompt"].upper())
+
+        with client, patch.object(client._session, "post", side_effect=fake_post):
+            answers = client.generate_many(
+                ["a", "b", "c", "d"], system_prompts=["S1", "S2", "S1", "S2"]
+            )
+
+        assert answers == ["A", "B", "C", "D"]
+        systems = [system for system, _ in sent]
+        assert systems in (["S1", "S1", "S2", "S2"], ["S2", "S2", "S1", "S1"])
+        assert {keep_alive for _, keep_alive in sent} == {"30m"}
+
+    def test_array_prompt_provider_uses_one_request(self):
+        """Test that supports_array_prompt sends one /v1/completions request"""
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        client.active = ProviderConfig(
+            provider="vllm",
+            base_url="http://localhost:8000/v1",
+            api_type="openai",
+            supports_array_prompt=True,
+        )
+
+        ok_response = Mock(status_code=200)
+        ok_response.content = json.dumps(
+            {"choices": [{"index": 1, "text": "B"}, {"index": 0, "text": "A"}]}
+        ).encode()
+        with client, patch.object(client._session, "post", return_value=ok_response) as post:
+            answers = client.generate_many(["a", "b"], system_prompt="sys")
+
+        assert answers == ["A", "B"]
+        post.assert_called_once()
+        assert post.call_args.args[0] == "http://localhost:8000/v1/completions"
+        assert post.call_args.kwargs["json"]["prompt"] == ["sys\n\na", "sys\n\nb"]
+        assert client.get_usage_stats()["total_requests"] == 1
+
+    def test_agenerate_many_keeps_order(self):
+        """Test that the asyncio wrapper returns answers in input order"""
+        import asyncio
+
+        client = LocalLLMClient(config_path=_NO_CONFIG)
+        with patch.object(client, "generate", side_effect=lambda p, sp=None, **kw: p.upper()):
+            answers = asyncio.run(client.agenerate_many(["a", "b", "c"]))
+
+        assert answers == ["A", "B", "C"]
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ PR #1: Basic functionality tests for scanner and orchestrator.
 """
 
 import json
+import os
+import re
 import time
 from pathlib import Path
 
@@ -12,21 +14,121 @@ import pytest
 
 from codewiki import repo_scanner
 
+_HEX40 = re.compile(r"[0-9a-f]{40}")
+
+FIXTURE_INDEX_PATH = Path(__file__).parent / "fixtures" / "repo_index.json"
+
+# Small on-disk tree for scans that must not depend on the host checkout
+_TREE_FILES = (
+    "top.py",
+    "src/a/m.py",
+    "src/a/__pycache__/m.cpython-311.pyc",
+    "src/b.pyc",
+    "src/node_modules/pkg/index.js",
+    "tests/test_x.py",
+    "scripts/tool.py",
+    "docs/guide.md",
+    "config/app.yaml",
+    "data/code_wiki/o.json",
+    "sub/c.py",
+    "sub/test_d.py",
+    "sub/node_modules/x.js",
+)
+_TREE_EXCLUDES = [
+    "**/__pycache__/**",
+    "**/*.pyc",
+    "**/node_modules/**",
+    "data/code_wiki/**",
+]
+
+
+@pytest.fixture(scope="session")
+def fixture_index() -> repo_scanner.RepoIndex:
+    """RepoIndex loaded from the checked-in scan fixture (no filesystem walk).
+
+    Used for the index shape checks (to_dict, file metadata); scanner
+    behaviour is tested on tmp trees.
+    """
+    data = json.loads(FIXTURE_INDEX_PATH.read_text(encoding="utf-8"))
+    return repo_scanner.RepoIndex(
+        scan_metadata=data["scan_metadata"],
+        files=[repo_scanner.FileEntry(**f) for f in data["files"]],
+    )
+
+
+def _write_tree(root: Path) -> None:
+    for rel in _TREE_FILES:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x\n", encoding="utf-8")
+
+
+def _scan_tmp_repo(*include_paths: str) -> repo_scanner.RepoIndex:
+    return repo_scanner.scan_repository(
+        {
+            "scan_settings": {
+                "include_paths": list(include_paths),
+                "exclude_patterns": _TREE_EXCLUDES,
+            }
+        }
+    )
+
+
+@pytest.fixture
+def tmp_repo(tmp_path, monkeypatch) -> Path:
+    """_TREE_FILES written under tmp_path, which becomes the scanner's REPO_ROOT."""
+    root = tmp_path.resolve()
+    _write_tree(root)
+    monkeypatch.setattr(repo_scanner, "REPO_ROOT", root)
+    return root
+
+
+@pytest.fixture(scope="session")
+def tree_index(tmp_path_factory) -> repo_scanner.RepoIndex:
+    """scan_repository() of the whole _TREE_FILES tree, shared by read-only tests."""
+    root = tmp_path_factory.mktemp("scan_tree").resolve()
+    _write_tree(root)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(repo_scanner, "REPO_ROOT", root)
+        return _scan_tmp_repo(".")
+
+
+@pytest.fixture(scope="session")
+def file_buckets(tree_index) -> dict:
+    """tree_index's files grouped in one pass for the classification tests."""
+    buckets = {"kinds": set(), "python": [], "tests": [], "pycache": [], "pyc": []}
+    for f in tree_index.files:
+        buckets["kinds"].add(f.kind)
+        if f.kind == "python":
+            buckets["python"].append(f)
+        if f.is_test:
+            buckets["tests"].append(f)
+        if "__pycache__" in f.path:
+            buckets["pycache"].append(f)
+        if f.path.endswith(".pyc"):
+            buckets["pyc"].append(f)
+    return buckets
+
 
 class TestRepoScanner:
     """Test suite for repository scanner."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def config_path(self):
         """Get path to config file."""
         repo_root = Path(__file__).resolve().parents[2]
         return repo_root / "config" / "code_wiki_config.yaml"
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def config(self, config_path):
         """Load configuration."""
         return repo_scanner.load_code_wiki_config(config_path)
 
+    @pytest.fixture(scope="session")
+    def scanned_index(self, config):
+        """Scan the repository once; tests only read the resulting index."""
+        return repo_scanner.scan_repository(config)
+
     def test_config_loading(self, config_path):
         """Test configuration file can be loaded."""
         config = repo_scanner.load_code_wiki_config(config_path)
@@ -43,18 +145,20 @@ class TestRepoScanner:
         assert "output" in config
         assert "index_path" in config["output"]
 
-    def test_scan_repository_returns_index(self, config):
+    @pytest.mark.slow
+    def test_scan_repository_returns_index(self, scanned_index):
         """Test that scan_repository returns a valid RepoIndex."""
-        index = repo_scanner.scan_repository(config)
+        index = scanned_index
 
         assert index is not None
         assert hasattr(index, "scan_metadata")
         assert hasattr(index, "files")
         assert isinstance(index.files, list)
 
-    def test_scan_metadata_structure(self, config):
+    @pytest.mark.slow
+    def test_scan_metadata_structure(self, scanned_index):
         """Test scan metadata has required fields."""
-        index = repo_scanner.scan_repository(config)
+        index = scanned_index
         meta = index.scan_metadata
 
         assert "project_root" in meta
@@ -64,20 +168,18 @@ class TestRepoScanner:
         assert "files_scanned" in meta
         assert "config_version" in meta
 
-    def test_scan_finds_files(self, config):
+    @pytest.mark.slow
+    def test_scan_finds_files(self, scanned_index):
         """Test that scan actually finds files."""
-        index = repo_scanner.scan_repository(config)
+        index = scanned_index
 
         # Should find core codewiki files (LIR extracted to separate repo)
         assert len(index.files) > 30  # Codewiki core files only
         assert index.scan_metadata["files_scanned"] > 30
 
-    def test_file_classification(self, config):
+    def test_file_classification(self, file_buckets):
         """Test that files are classified correctly."""
-        index = repo_scanner.scan_repository(config)
-
-        # Collect file kinds
-        kinds = {f.kind for f in index.files}
+        kinds = file_buckets["kinds"]
 
         # Should have multiple file kinds
         assert len(kinds) >= 3
@@ -86,35 +188,37 @@ class TestRepoScanner:
         assert "python" in kinds
         assert "test" in kinds
 
-    def test_python_files_have_language(self, config):
+    def test_python_files_have_language(self, file_buckets):
         """Test that Python files are marked with language."""
-        index = repo_scanner.scan_repository(config)
-
-        python_files = [f for f in index.files if f.kind == "python"]
+        python_files = file_buckets["python"]
         assert len(python_files) > 0
 
         # All Python files should have language set
         for f in python_files:
             assert f.language == "python"
 
-    def test_test_files_are_marked(self, config):
+    def test_test_files_are_marked(self, file_buckets):
         """Test that test files are correctly marked."""
-        index = repo_scanner.scan_repository(config)
-
-        test_files = [f for f in index.files if f.is_test]
+        test_files = file_buckets["tests"]
         assert len(test_files) > 0
 
         # All test files should have kind="test"
         for f in test_files:
             assert f.kind == "test"
 
-    def test_scan_performance(self, config):
+    @pytest.mark.slow
+    def test_scan_performance(self, config, scanned_index):
         """Test that scan completes within performance target (<5s).
 
         Note: The 5s target is from CODE_WIKI_DESIGN.md and provides early
         warning for performance regressions. Current performance is ~0.018s
         for 661 files (277× margin), so failures indicate real issues.
+
+        scanned_index is requested only so the shared scan has already
+        touched the tree; the timed scan below measures scanner cost rather
+        than first-touch disk cache misses.
         """
+        # Explicitly not reusing scanned_index: this needs a fresh scan
         start = time.time()
         index = repo_scanner.scan_repository(config)
         duration = time.time() - start
@@ -125,9 +229,9 @@ class TestRepoScanner:
         # Also check the reported duration
         assert index.scan_metadata["duration_seconds"] < 5.0
 
-    def test_repo_index_to_dict(self, config):
+    def test_repo_index_to_dict(self, fixture_index):
         """Test conversion of RepoIndex to dictionary."""
-        index = repo_scanner.scan_repository(config)
+        index = fixture_index
         index_dict = repo_scanner.repo_index_to_dict(index)
 
         assert isinstance(index_dict, dict)
@@ -139,17 +243,31 @@ class TestRepoScanner:
         json_str = json.dumps(index_dict)
         assert len(json_str) > 0
 
-    def test_exclude_patterns_work(self, config):
+    def test_write_repo_index_matches_json_dump(self, tmp_path):
+        """Test that the streamed index file equals json.dump(indent=2) output."""
+        index = repo_scanner.RepoIndex(
+            scan_metadata={"git_commit": "unknown", "files_scanned": 2},
+            files=[
+                repo_scanner.FileEntry("tests/test_a.py", "test", 10, 1.5, "python", True),
+                repo_scanner.FileEntry("docs/ü.md", "doc", 0, 2.25, "markdown"),
+            ],
+        )
+        output_path = tmp_path / "data" / "repo_index.json"
+
+        repo_scanner.write_repo_index(index, output_path)
+
+        expected = json.dumps(
+            repo_scanner.repo_index_to_dict(index), ensure_ascii=False, indent=2
+        )
+        assert output_path.read_text(encoding="utf-8") == expected
+
+    def test_exclude_patterns_work(self, file_buckets):
         """Test that exclude patterns filter out files."""
-        index = repo_scanner.scan_repository(config)
-
         # Should not contain __pycache__ files
-        pycache_files = [f for f in index.files if "__pycache__" in f.path]
-        assert len(pycache_files) == 0
+        assert len(file_buckets["pycache"]) == 0
 
         # Should not contain .pyc files
-        pyc_files = [f for f in index.files if f.path.endswith(".pyc")]
-        assert len(pyc_files) == 0
+        assert len(file_buckets["pyc"]) == 0
 
     def test_git_commit_extraction(self):
         """Test git commit hash extraction."""
@@ -162,12 +280,12 @@ class TestRepoScanner:
         # In a git repo, should return a 40-char hash
         if commit_hash != "unknown":
             assert len(commit_hash) == 40
-            # Should be hex
-            int(commit_hash, 16)
+            # Should be (lowercase) hex
+            assert _HEX40.fullmatch(commit_hash)
 
-    def test_file_metadata(self, config):
+    def test_file_metadata(self, fixture_index):
         """Test that file metadata is correctly extracted."""
-        index = repo_scanner.scan_repository(config)
+        index = fixture_index
 
         # Pick first file
         if len(index.files) > 0:
@@ -187,3 +305,54 @@ class TestRepoScanner:
                 "typescript",
                 "javascript",
             }
+
+
+class TestScanIncludePaths:
+    """Scans of a tmp tree: stored paths, excludes and pruning per include path."""
+
+    @pytest.mark.parametrize(
+        "include,expected",
+        [
+            (
+                ".",
+                {
+                    "top.py",
+                    "src/a/m.py",
+                    "tests/test_x.py",
+                    "scripts/tool.py",
+                    "docs/guide.md",
+                    "config/app.yaml",
+                    "sub/c.py",
+                    "sub/test_d.py",
+                },
+            ),
+            ("sub/", {"sub/c.py", "sub/test_d.py"}),
+        ],
+    )
+    def test_paths_are_relative_to_repo_root(
+        self, tmp_repo, monkeypatch, include, expected
+    ):
+        """Test that paths have no "./" prefix and excluded files are dropped."""
+        listed = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed.append(Path(path).relative_to(tmp_repo).as_posix())
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", scandir)
+
+        index = _scan_tmp_repo(include)
+
+        assert {f.path for f in index.files} == expected
+        # Excluded directories are pruned, never listed
+        pruned = ("node_modules", "__pycache__", "code_wiki")
+        assert not [d for d in listed if any(name in d for name in pruned)]
+
+    def test_repo_root_include_classifies_by_relative_path(self, tmp_repo):
+        """Test that path-based classification sees "tests/..." not "./tests/..."."""
+        by_path = {f.path: f for f in _scan_tmp_repo(".").files}
+
+        assert by_path["tests/test_x.py"].is_test
+        assert by_path["tests/test_x.py"].kind == "test"
+        assert by_path["scripts/tool.py"].kind == "script"